@@ -0,0 +1,243 @@
+# python 3 headers, required if submitting to Ansible
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import glob
+import os
+import re
+import shutil
+import subprocess
+import time
+import uuid
+
+from ansible.module_utils.parsing.convert_bool import boolean
+from ansible.plugins.action import ActionBase
+from ansible.utils.display import Display
+
+display = Display()
+
+
+class DhParamPool(object):
+    """
+      pre-generated DH parameters on the ansible controller
+
+        ${directory}/${keysize}/${uuid}.pem   ready to use
+        ${directory}/${keysize}/${uuid}.tmp   generation in progress
+        ${directory}/${keysize}/*.claimed     in use by a running task
+
+      Claiming is an atomic rename, so parallel forks never get the same file.
+    """
+
+    # a generation that takes longer is considered dead
+    STALE_AFTER = 6 * 60 * 60
+
+    def __init__(self, directory, keysize, openssl):
+        """
+        """
+        self.keysize = int(keysize)
+        self.openssl = openssl
+        self.directory = os.path.join(os.path.expanduser(directory), str(self.keysize))
+
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+
+    def available(self):
+        """
+        """
+        return sorted(glob.glob(os.path.join(self.directory, "*.pem")))
+
+    def generating(self):
+        """
+          running generations, stale ones are removed
+        """
+        running = []
+
+        for f in glob.glob(os.path.join(self.directory, "*.tmp")):
+            try:
+                if time.time() - os.stat(f).st_mtime > self.STALE_AFTER:
+                    os.remove(f)
+                    continue
+            except OSError:
+                continue
+
+            running.append(f)
+
+        return running
+
+    def claim(self, reuse=False):
+        """
+          returns (filename, content) of a validated parameter set or (None, None)
+
+          with reuse the file stays in the pool and can be used by other servers.
+        """
+        for f in self.available():
+            claimed = f if reuse else f"{f}.{os.getpid()}.claimed"
+
+            if not reuse:
+                try:
+                    os.rename(f, claimed)
+                except OSError:
+                    # already taken by another fork
+                    continue
+
+            valid, message = self.validate(claimed)
+
+            if not valid:
+                display.warning(f"remove invalid DH parameters {f}: {message}")
+                os.remove(claimed)
+                continue
+
+            with open(claimed, "r") as fh:
+                return claimed, fh.read()
+
+        return None, None
+
+    def release(self, claimed, consumed):
+        """
+          remove a used parameter set or put it back into the pool
+        """
+        if claimed is None or not claimed.endswith(".claimed"):
+            return
+
+        if consumed:
+            os.remove(claimed)
+        else:
+            os.rename(claimed, re.sub(r"\.\d+\.claimed$", "", claimed))
+
+    def validate(self, filename):
+        """
+          'openssl dhparam -check' (safe prime, generator) and the keysize
+        """
+        proc = subprocess.run(
+            [self.openssl, "dhparam", "-in", filename, "-check", "-text", "-noout"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True
+        )
+
+        if proc.returncode != 0:
+            return False, proc.stdout.strip()
+
+        if f"({self.keysize} bit)" not in proc.stdout:
+            return False, f"not a {self.keysize} bit parameter set"
+
+        return True, ""
+
+    def refill(self, size):
+        """
+          start background generations until the pool holds 'size' parameter sets
+
+          The workers are detached from the ansible process and keep running
+          after the playbook has finished.
+        """
+        missing = int(size) - len(self.available()) - len(self.generating())
+        missing = min(missing, os.cpu_count() or 1)
+
+        for _ in range(max(missing, 0)):
+            name = os.path.join(self.directory, uuid.uuid4().hex)
+            tmp_file = f"{name}.tmp"
+
+            # marks the generation as running
+            open(tmp_file, "w").close()
+
+            subprocess.Popen(
+                [
+                    "sh", "-c",
+                    '"$0" dhparam -out "$1" "$2" && mv "$1" "$3" || rm -f "$1"',
+                    self.openssl, tmp_file, str(self.keysize), f"{name}.pem"
+                ],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                close_fds=True,
+                start_new_session=True
+            )
+
+        return max(missing, 0)
+
+
+class ActionModule(ActionBase):
+    """
+      easyrsa with an optional DH parameter pool for 'state: gen-dh'
+
+        dh_pool:        directory of the pool on the ansible controller
+        dh_pool_size:   number of parameter sets to keep ready (default: 2)
+        dh_pool_reuse:  use the same parameter set for several servers
+
+      Without dh_pool (or for all other states) the module is called unchanged.
+      An empty pool falls back to 'easyrsa gen-dh' on the remote host.
+    """
+
+    TRANSFERS_FILES = False
+
+    def run(self, tmp=None, task_vars=None):
+        """
+        """
+        if task_vars is None:
+            task_vars = dict()
+
+        result = super(ActionModule, self).run(tmp, task_vars)
+        del tmp
+
+        module_args = self._task.args.copy()
+
+        dh_pool = module_args.pop("dh_pool", None)
+        dh_pool_size = module_args.pop("dh_pool_size", 2)
+        dh_pool_reuse = boolean(module_args.pop("dh_pool_reuse", False), strict=False)
+
+        openssl = shutil.which("openssl")
+
+        if module_args.get("state") != "gen-dh" or not dh_pool or self._play_context.check_mode:
+            result.update(self._execute_module(module_name="easyrsa", module_args=module_args, task_vars=task_vars))
+            return result
+
+        if not openssl:
+            display.warning("the DH parameter pool needs 'openssl' on the ansible controller.")
+            result.update(self._execute_module(module_name="easyrsa", module_args=module_args, task_vars=task_vars))
+            return result
+
+        pool = DhParamPool(dh_pool, module_args.get("keysize") or 2048, openssl)
+
+        claimed = None
+
+        if not self.__created(module_args, task_vars):
+            claimed, dh_params = pool.claim(dh_pool_reuse)
+
+            if dh_params:
+                module_args["dh_params"] = dh_params
+
+        module_result = self._execute_module(module_name="easyrsa", module_args=module_args, task_vars=task_vars)
+
+        pool.release(claimed, consumed=not module_result.get("failed", False))
+
+        refill = pool.refill(1 if dh_pool_reuse else dh_pool_size)
+
+        module_result["dh_pool"] = dict(
+            used = claimed is not None,
+            available = len(pool.available()),
+            generating = len(pool.generating()),
+            started = refill
+        )
+
+        result.update(module_result)
+
+        return result
+
+    def __created(self, module_args, task_vars):
+        """
+          the 'creates' file already exists on the remote host
+        """
+        creates = module_args.get("creates")
+
+        if not creates:
+            return False
+
+        if not os.path.isabs(creates) and module_args.get("chdir"):
+            creates = os.path.join(module_args.get("chdir"), creates)
+
+        stat = self._execute_module(
+            module_name="ansible.builtin.stat",
+            module_args=dict(path=creates, get_checksum=False),
+            task_vars=task_vars
+        )
+
+        return stat.get("stat", {}).get("exists", False)
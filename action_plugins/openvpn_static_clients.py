@@ -0,0 +1,108 @@
+# python 3 headers, required if submitting to Ansible
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+from ansible.errors import AnsibleActionFail
+from ansible.plugins.action import ActionBase
+from ansible.plugins.loader import lookup_loader
+from ansible.utils.display import Display
+
+display = Display()
+
+
+class ActionModule(ActionBase):
+    """
+      reconciles all static client instances of a host in one task
+
+        clients:            the static clients (openvpn_mobile_clients)
+        issued:             {name: sha256} of the certificates on the CA hosts
+        bundles:            {name: base64 tar.gz} of the certificate bundles (see openvpn_client_bundle)
+        template:           client configuration template
+        override_template:  systemd override template (optional), rendered per client with 'instance'
+
+      The installed certificates are compared with 'issued' in one module call,
+      only the bundles of outdated clients are passed to the module.
+      The client configurations are rendered on the controller and written
+      by the module only when their content differs.
+    """
+
+    TRANSFERS_FILES = False
+
+    def run(self, tmp=None, task_vars=None):
+        """
+        """
+        if task_vars is None:
+            task_vars = dict()
+
+        result = super(ActionModule, self).run(tmp, task_vars)
+        del tmp
+
+        module_args = self._task.args.copy()
+
+        available_bundles = module_args.pop("bundles", None) or {}
+        template = module_args.pop("template", "openvpn/clients/client.conf.j2")
+        override_template = module_args.pop("override_template", None)
+
+        if module_args.get("state", "present") == "status":
+            result.update(self._execute_module(module_name="openvpn_static_clients", module_args=module_args, task_vars=task_vars))
+            return result
+
+        clients = [c for c in module_args.get("clients", []) if c.get("state", "present") != "absent"]
+
+        status = self._execute_module(
+            module_name="openvpn_static_clients",
+            module_args=dict(module_args, state="status"),
+            task_vars=task_vars
+        )
+
+        if status.get("failed"):
+            result.update(status)
+            return result
+
+        bundles = dict()
+        missing = []
+
+        for name in status.get("outdated", []):
+            bundle = available_bundles.get(name)
+
+            if bundle:
+                bundles[name] = bundle
+            else:
+                missing.append(name)
+                display.warning(f"no certificate bundle for the static client {name} found.")
+
+        module_args["bundles"] = bundles
+        module_args["configs"] = dict(
+            (c.get("name"), self.__render(template, task_vars, client=c, openvpn_client_name=c.get("name")))
+            for c in clients
+        )
+
+        if override_template:
+            # 'instance' selects the CPU cores of the client (see openvpn_cpu_affinity)
+            module_args["overrides"] = dict(
+                (c.get("name"), self.__render(override_template, task_vars, instance=dict(name=c.get("name"))))
+                for c in clients
+            )
+
+        module_args["state"] = "present"
+
+        module_result = self._execute_module(module_name="openvpn_static_clients", module_args=module_args, task_vars=task_vars)
+
+        module_result["outdated"] = status.get("outdated", [])
+        module_result["transferred"] = sorted(bundles.keys())
+        module_result["missing"] = missing
+
+        result.update(module_result)
+
+        return result
+
+    def __render(self, template, task_vars, **template_vars):
+        """
+          render a role template on the controller (like the template lookup)
+        """
+        lookup = lookup_loader.get("ansible.builtin.template", loader=self._loader, templar=self._templar)
+
+        if lookup is None:
+            raise AnsibleActionFail("the template lookup plugin is not available.")
+
+        return lookup.run([template], variables=task_vars, template_vars=template_vars)[0]
@@ -2,10 +2,18 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import ipaddress
+import math
+import os
+
+from ansible.errors import AnsibleFilterError
 from ansible.utils.display import Display
 
 display = Display()
 
+# the smallest subnet of a server instance (topology subnet)
+MAX_INSTANCE_PREFIX = 29
+
 
 class FilterModule(object):
     """
@@ -16,13 +24,18 @@ class FilterModule(object):
         return {
             'persistent_pool': self.persistent_pool,
             'clients_type': self.clients_type,
+            'server_instances': self.server_instances,
         }
 
-    def persistent_pool(self, data):
+    def persistent_pool(self, data, instances=None):
         """
           Get the type of a variable
+
+          With server instances, every entry gets the name of the
+          instance whose subnet contains the static ip.
         """
         result = []
+        instances = instances or []
 
         for i in data:
             name = i.get('name')
@@ -32,6 +45,16 @@ class FilterModule(object):
                     state=i.get('state', 'present'),
                     static_ip = i.get('static_ip')
                 )
+
+                if instances:
+                    instance = self.__instance_of(d.get('static_ip'), instances)
+
+                    if instance is None:
+                        display.warning(f"the static ip {d.get('static_ip')} of '{name}' is not in the subnet of a server instance.")
+                        continue
+
+                    d['instance'] = instance
+
                 result.append(d)
 
         display.v(f" = result : {result}")
@@ -54,3 +77,118 @@ class FilterModule(object):
 
         display.v(f" = result : {result}")
         return result
+
+    def server_instances(self, server, subnet=None, cpus=1, logging=None, service_name="openvpn-server@server", service_manager="systemd"):
+        """
+          the openvpn server instances of a host
+
+          Every instance gets its own port (port, port + 1, ...), a slice of the
+          server subnet, its own log, status and ipp file and its own service.
+          The first instance keeps the names of a single server ('server', the
+          configured log files and the service name).
+        """
+        settings = server.get("instances") or {}
+        count = 1
+
+        if settings.get("enabled", False):
+            count = settings.get("count", "auto")
+
+            if str(count) == "auto":
+                count = cpus
+
+            try:
+                count = max(int(count), 1)
+            except (TypeError, ValueError):
+                raise AnsibleFilterError(f"invalid number of server instances: '{count}'")
+
+        slices = self.__subnet_slices(subnet or {}, count)
+        logging = logging or {}
+
+        result = []
+
+        for index in range(count):
+            primary = index == 0
+            name = "server" if primary else f"server-{index}"
+
+            if primary:
+                service = service_name
+            elif service_manager == "openrc":
+                service = f"openvpn.{name}"
+            else:
+                service = f"openvpn-server@{name}"
+
+            result.append(
+                dict(
+                    name = name,
+                    primary = primary,
+                    port = int(server.get("port", 1194)) + index,
+                    proto = server.get("proto", "udp"),
+                    subnet = slices[index] if slices else None,
+                    log = self.__instance_file(logging.get("file"), name, primary),
+                    status = self.__instance_file(logging.get("status"), name, primary),
+                    ipp = self.__instance_file("ipp.txt", name, primary),
+                    service = service
+                )
+            )
+
+        display.v(f" = result : {result}")
+        return result
+
+    def __subnet_slices(self, subnet, count):
+        """
+          split the server subnet into (at least) count equal networks
+        """
+        ip = subnet.get("ip")
+        netmask = subnet.get("netmask")
+
+        if not ip or not netmask:
+            return []
+
+        try:
+            network = ipaddress.ip_network(f"{ip}/{netmask}", strict=False)
+        except ValueError as e:
+            raise AnsibleFilterError(f"invalid server subnet: {e}")
+
+        if count == 1:
+            return [dict(ip=ip, netmask=netmask)]
+
+        prefix = network.prefixlen + math.ceil(math.log2(count))
+
+        if prefix > MAX_INSTANCE_PREFIX:
+            raise AnsibleFilterError(f"the subnet {network} is too small for {count} server instances.")
+
+        return [
+            dict(ip=str(n.network_address), netmask=str(n.netmask))
+            for n in list(network.subnets(new_prefix=prefix))[:count]
+        ]
+
+    def __instance_file(self, filename, name, primary):
+        """
+          openvpn.log -> openvpn-server-1.log
+        """
+        if not filename or primary:
+            return filename
+
+        base, ext = os.path.splitext(filename)
+
+        return f"{base}-{name}{ext}"
+
+    def __instance_of(self, static_ip, instances):
+        """
+          name of the instance whose subnet contains the ip
+        """
+        try:
+            address = ipaddress.ip_address(static_ip)
+        except ValueError:
+            return None
+
+        if len(instances) == 1:
+            return instances[0].get("name")
+
+        for instance in instances:
+            subnet = instance.get("subnet")
+
+            if subnet and address in ipaddress.ip_network(f"{subnet.get('ip')}/{subnet.get('netmask')}"):
+                return instance.get("name")
+
+        return None
@@ -5,8 +5,17 @@
 
 from __future__ import absolute_import, division, print_function
 import os
+from pathlib import Path
 
-from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.basic import AnsibleModule, missing_required_lib
+from ansible.module_utils.openvpn_easyrsa_native import EasyRsaNative, HAS_CRYPTOGRAPHY
+from ansible.module_utils.openvpn_jobs import DetachedJobs
+from ansible.module_utils.openvpn_pem import PemError, iter_pem_blocks
+
+try:
+    from cryptography.hazmat.primitives import serialization
+except ImportError:
+    pass
 
 
 class EasyRsa(object):
@@ -29,6 +38,12 @@ class EasyRsa(object):
         self._keysize = module.params.get('keysize', None)
         self._chdir = module.params.get('chdir', None)
         self._creates = module.params.get('creates', None)
+        self._backend = module.params.get('backend', 'easyrsa')
+        self._dh_params = module.params.get('dh_params', None)
+        self._detach = module.params.get('detach', False)
+        self._job_id = module.params.get('job_id', None)
+
+        self.jobs = DetachedJobs(f"{Path.home()}/.ansible/cache/openvpn/jobs")
 
         self._easyrsa = module.get_bin_path('easyrsa', True)
 
@@ -45,6 +60,9 @@ class EasyRsa(object):
         if self._chdir:
             os.chdir(self._chdir)
 
+        if self.state == "status":
+            return self.__job_status()
+
         if self.force and self._creates:
             self.module.log(msg="force mode ...")
             if os.path.exists(self._creates):
@@ -74,6 +92,21 @@ class EasyRsa(object):
                     message=message
                 )
 
+        if self.state == "gen-dh" and self._dh_params:
+            return self.__install_dh_params()
+
+        if self._backend == "native" and self.state in ["gen-crl", "gen-req", "sign-req"]:
+            rc, out = self.__native()
+
+            result['result'] = f"{out.rstrip()}"
+
+            if rc == 0:
+                result['changed'] = True
+            else:
+                result['failed'] = True
+
+            return result
+
         args = []
         args.append(self._easyrsa)
 
@@ -131,6 +164,12 @@ class EasyRsa(object):
             args.append("server")
             args.append(self._req_cn_server)
 
+        if self._detach:
+            if self.state == "gen-dh":
+                args = self.__dhparam_args(args)
+
+            return self.__start_job(args)
+
         rc, out = self._exec(args)
 
         result['result'] = f"{out.rstrip()}"
@@ -142,6 +181,143 @@ class EasyRsa(object):
 
         return result
 
+    def __native(self):
+        """
+          gen-crl, gen-req and sign-req for the server certificate without the easyrsa fork chain
+        """
+        if not HAS_CRYPTOGRAPHY:
+            self.module.fail_json(msg=missing_required_lib("cryptography"))
+
+        native = EasyRsaNative(self.module, os.getcwd())
+
+        if self.state == "gen-crl":
+            return native.gen_crl()
+
+        if self.state == "gen-req":
+            return native.gen_req(self._req_cn_server)
+
+        return native.sign_req(self._req_cn_server, "server")
+
+    def __start_job(self, args):
+        """
+          run the command detached and return the job handle immediately
+        """
+        job_id, started = self.jobs.start(args)
+
+        return dict(
+            failed=False,
+            changed=started,
+            job_id=job_id,
+            started=started,
+            result=f"{self.state} {'started' if started else 'is already running'} as job {job_id}."
+        )
+
+    def __dhparam_args(self, args):
+        """
+          'easyrsa gen-dh' is only a wrapper around 'openssl dhparam', but holds the
+          PKI lock of newer easyrsa versions during the whole generation.
+          The detached job calls openssl directly, so the other PKI steps are not blocked.
+        """
+        openssl = self.module.get_bin_path('openssl', False)
+
+        if not openssl:
+            return args
+
+        dh_file = os.path.join(self._pki_dir or "pki", "dh.pem")
+
+        return [
+            "sh", "-c", '"$0" dhparam -out "$1.tmp" "$2" && mv "$1.tmp" "$1"',
+            openssl, dh_file, str(self._keysize or 2048)
+        ]
+
+    def __job_status(self):
+        """
+          elapsed time and completion of a detached job
+        """
+        if not self._job_id:
+            self.module.fail_json(msg="'job_id' is required for state 'status'.")
+
+        status = self.jobs.status(self._job_id)
+
+        if not status.get("exists"):
+            return dict(
+                failed=True,
+                changed=False,
+                finished=False,
+                result=f"job {self._job_id} not found."
+            )
+
+        finished = status.get("finished")
+        rc = status.get("rc")
+
+        return dict(
+            failed=finished and rc != 0,
+            changed=False,
+            job_id=self._job_id,
+            finished=finished,
+            rc=rc,
+            elapsed=status.get("elapsed"),
+            result=status.get("output", "").rstrip()
+        )
+
+    def __install_dh_params(self):
+        """
+          use pre-generated DH parameters (e.g. from the pool of the action plugin)
+          instead of 'easyrsa gen-dh'
+        """
+        dh_file = os.path.join(self._pki_dir or "pki", "dh.pem")
+        tmp_file = f"{dh_file}.{os.getpid()}.tmp"
+
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+
+        with os.fdopen(fd, "w") as f:
+            f.write(self._dh_params.rstrip("\n") + "\n")
+
+        valid, message = self.__validate_dh_params(tmp_file)
+
+        if not valid:
+            os.remove(tmp_file)
+
+            return dict(
+                failed=True,
+                changed=False,
+                result=message
+            )
+
+        os.replace(tmp_file, dh_file)
+
+        return dict(
+            failed=False,
+            changed=True,
+            result=f"DH parameters ({self._keysize or 'unknown'} bit) installed as {dh_file}."
+        )
+
+    def __validate_dh_params(self, dh_file):
+        """
+          exactly one 'DH PARAMETERS' block with the requested keysize
+        """
+        try:
+            blocks = list(iter_pem_blocks(dh_file))
+        except PemError as e:
+            return False, f"invalid DH parameters: {e}"
+
+        if len(blocks) != 1 or blocks[0].label != "DH PARAMETERS":
+            return False, "invalid DH parameters: expected exactly one 'DH PARAMETERS' block."
+
+        if not HAS_CRYPTOGRAPHY:
+            return True, ""
+
+        try:
+            params = serialization.load_pem_parameters(blocks[0].data)
+            key_size = params.parameter_numbers().p.bit_length()
+        except (AttributeError, ValueError) as e:
+            return False, f"invalid DH parameters: {e}"
+
+        if self._keysize and key_size != int(self._keysize):
+            return False, f"invalid DH parameters: expected {self._keysize} bit, got {key_size} bit."
+
+        return True, ""
+
     def _exec(self, commands):
         """
           execute shell program
@@ -166,7 +342,7 @@ def main():
     args = dict(
         state=dict(
             default="init-pki",
-            choices=["init-pki", "build-ca", "gen-crl", "gen-dh", "gen-req", "sign-req"]
+            choices=["init-pki", "build-ca", "gen-crl", "gen-dh", "gen-req", "sign-req", "status"]
         ),
         pki_dir=dict(
             required=False,
@@ -193,6 +369,24 @@ def main():
         creates=dict(
             required=False
         ),
+        backend=dict(
+            required=False,
+            default="easyrsa",
+            choices=["easyrsa", "native"]
+        ),
+        dh_params=dict(
+            required=False,
+            type="str"
+        ),
+        detach=dict(
+            required=False,
+            default=False,
+            type="bool"
+        ),
+        job_id=dict(
+            required=False,
+            type="str"
+        ),
     )
 
     module = AnsibleModule(
@@ -5,9 +5,11 @@
 
 from __future__ import absolute_import, division, print_function
 import os
-import sys
-from ansible.module_utils import distro
-from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.basic import AnsibleModule, missing_required_lib
+from ansible.module_utils.openvpn_pem import PemError, extract_certs_as_strings
+from ansible.module_utils.openvpn_static_key import (
+    HAS_CRYPTOGRAPHY, load_tls_crypt_v2_server_key, static_key_v1,
+    tls_crypt_v2_client_key, tls_crypt_v2_server_key, write_key_file)
 
 
 class OpenVPN(object):
@@ -25,85 +27,216 @@ class OpenVPN(object):
         self.state = module.params.get("state")
         self.force = module.params.get("force", False)
         self._secret = module.params.get('secret', None)
+        self._key_type = module.params.get('key_type', 'tls-auth')
         self._username = module.params.get('username', None)
+        self._clients = module.params.get('clients', None)
+        self._server_key = module.params.get('server_key', None)
 
         self._chdir = module.params.get('chdir', None)
         self._creates = module.params.get('creates', None)
         self._destination_directory = module.params.get('destination_directory', None)
 
-        self._openvpn = module.get_bin_path('openvpn', True)
-        self._easyrsa = module.get_bin_path('easyrsa', True)
-
-        (self.distribution, self.version, self.codename) = distro.linux_distribution(full_distribution_name=False)
+        # the static keys are created in-process, only create_user needs easyrsa
+        self._easyrsa = module.get_bin_path('easyrsa', self.state == "create_user")
 
     def run(self):
         """
           runner
         """
-        result = dict(
-            failed=False,
-            changed=False,
-            ansible_module_results="none"
-        )
-
         if self._chdir:
             os.chdir(self._chdir)
 
         if self.force and self._creates:
             self.module.log(msg="force mode ...")
-            if os.path.exists(self._creates):
+            if os.path.exists(self._creates) and not self.module.check_mode:
                 self.module.log(msg="remove {}".format(self._creates))
                 os.remove(self._creates)
 
-        if self._creates:
+        if self._creates and not (self.force and self.module.check_mode):
             if os.path.exists(self._creates):
                 message = "nothing to do."
                 if self.state == "genkey":
-                    message = "tls-auth key already created"
+                    message = f"{self._key_type} key already created"
 
                 return dict(
                     changed=False,
                     message=message
                 )
 
-        args = []
-
-        if self.state == "genkey":
-            args.append(self._openvpn)
-            args.append("--genkey")
-            if self.distribution.lower() == "ubuntu" and self.version == "20.04":
-                # OpenVPN 2.5.5
-                # ubuntu 20.04 wants `--secret`
-                args.append("--secret")
-            else:
-                # WARNING: Using --genkey --secret filename is DEPRECATED.  Use --genkey secret filename instead.
-                args.append("secret")
-            args.append(self._secret)
-
         if self.state == "create_user":
+            if self.module.check_mode:
+                return dict(
+                    failed=False,
+                    changed=not self.__vpn_user_req(),
+                    message=f"client {self._username} would be created."
+                )
+
             return self.__create_vpn_user()
-            # args.append(self._easyrsa)
-            # args.append("--batch")
-            # args.append("build-client-full")
-            # args.append(self._username)
-            # args.append("nopass")
 
-        rc, out = self._exec(args)
+        if self._key_type == "tls-crypt-v2-client":
+            return self.__genkey_tls_crypt_v2_clients()
 
-        result['result'] = "{}".format(out.rstrip())
+        if not self._secret:
+            self.module.fail_json(msg=f"'secret' is required for a {self._key_type} key.")
 
-        if rc == 0:
-            force_mode = "0600"
-            if isinstance(force_mode, str):
-                mode = int(force_mode, base=8)
+        return self.__genkey()
 
-            os.chmod(self._secret, mode)
+    def __genkey(self):
+        """
+          like 'openvpn --genkey secret ${secret}', without the openvpn binary
 
-            result['changed'] = True
+          tls-auth and tls-crypt use the same static key format,
+          tls-crypt-v2-server like 'openvpn --genkey tls-crypt-v2-server ${secret}'.
+        """
+        if self.module.check_mode:
+            return dict(
+                failed=False,
+                changed=True,
+                result=f"{self._key_type} key would be written to {self._secret}."
+            )
+
+        if self._key_type == "tls-crypt-v2-server":
+            key = tls_crypt_v2_server_key()
         else:
-            result['failed'] = True
+            key = static_key_v1()
 
-        return result
+        try:
+            write_key_file(self._secret, key)
+        except (IOError, OSError) as e:
+            return dict(
+                failed=True,
+                changed=False,
+                result=f"can not write {self._secret}: {e}"
+            )
+
+        return dict(
+            failed=False,
+            changed=True,
+            result=f"{self._key_type} key written to {self._secret}."
+        )
+
+    def __genkey_tls_crypt_v2_clients(self):
+        """
+          like 'openvpn --tls-crypt-v2 ${server_key} --genkey tls-crypt-v2-client ${secret}'
+          for one ('secret') or many clients ('clients' -> ${destination_directory}/${name}.key)
+
+          The server key is read once and every client key is wrapped in-process,
+          without an openvpn process per client.
+          Existing client keys are kept, 'force' creates new ones.
+        """
+        if not HAS_CRYPTOGRAPHY:
+            self.module.fail_json(msg=missing_required_lib("cryptography"))
+
+        if not self._server_key:
+            self.module.fail_json(msg="'server_key' is required for tls-crypt-v2-client keys.")
+
+        if self._clients is None:
+            if not self._secret:
+                self.module.fail_json(msg="'secret' or 'clients' is required for tls-crypt-v2-client keys.")
+
+            clients = [dict(name=self._secret, state="present", key_file=self._secret)]
+        else:
+            if not self._destination_directory:
+                self.module.fail_json(msg="'destination_directory' is required for 'clients'.")
+
+            clients = [
+                dict(
+                    name=c.get("name"),
+                    state=c.get("state", "present"),
+                    key_file=os.path.join(self._destination_directory, f"{c.get('name')}.key")
+                )
+                for c in self._clients
+            ]
+
+        server_key = None
+
+        if any(c.get("state") == "present" for c in clients):
+            try:
+                server_key = load_tls_crypt_v2_server_key(self._server_key)
+            except (IOError, OSError) as e:
+                self.module.fail_json(msg=f"can not read the tls-crypt-v2 server key {self._server_key}: {e}")
+            except PemError as e:
+                self.module.fail_json(msg=f"invalid tls-crypt-v2 server key: {e}", pem_error=e.as_dict())
+
+        if self._destination_directory and not self.module.check_mode and not os.path.isdir(self._destination_directory):
+            os.makedirs(self._destination_directory, mode=0o700, exist_ok=True)
+
+        results = dict()
+
+        for client in clients:
+            name = client.get("name")
+            results[name] = self.__tls_crypt_v2_client(server_key, client)
+
+        failed = [k for k, v in results.items() if v.get("failed")]
+        written = [k for k, v in results.items() if v.get("changed") and v.get("state") == "present"]
+
+        if self._clients is None:
+            return results[self._secret]
+
+        if failed:
+            message = f"{len(failed)} of {len(clients)} clients failed: {', '.join(failed)}"
+        else:
+            message = f"{len(clients)} clients processed, {len(written)} tls-crypt-v2 keys written."
+
+        return dict(
+            failed=len(failed) > 0,
+            changed=any(v.get("changed") for v in results.values()),
+            clients=results,
+            message=message
+        )
+
+    def __tls_crypt_v2_client(self, server_key, client):
+        """
+        """
+        key_file = client.get("key_file")
+        exists = os.path.exists(key_file)
+
+        if not client.get("name"):
+            return dict(failed=True, changed=False, result="client without name.")
+
+        if client.get("state") == "absent":
+            if exists and not self.module.check_mode:
+                os.remove(key_file)
+
+            return dict(
+                failed=False,
+                changed=exists,
+                state="absent",
+                result=f"{key_file} removed." if exists else "nothing to do."
+            )
+
+        if exists and not self.force:
+            return dict(
+                failed=False,
+                changed=False,
+                state="present",
+                result=f"{key_file} already created."
+            )
+
+        if self.module.check_mode:
+            return dict(
+                failed=False,
+                changed=True,
+                state="present",
+                result=f"tls-crypt-v2-client key would be written to {key_file}."
+            )
+
+        try:
+            write_key_file(key_file, tls_crypt_v2_client_key(server_key))
+        except (IOError, OSError) as e:
+            return dict(
+                failed=True,
+                changed=False,
+                state="present",
+                result=f"can not write {key_file}: {e}"
+            )
+
+        return dict(
+            failed=False,
+            changed=True,
+            state="present",
+            result=f"tls-crypt-v2-client key written to {key_file}."
+        )
 
     def __create_vpn_user(self):
         """
@@ -153,7 +286,11 @@ class OpenVPN(object):
                 with open(key_file, "r") as k_file:
                     k_data = k_file.read().rstrip('\n')
 
-                cert = self.extract_certs_as_strings(cert_file)[0].rstrip('\n')
+                try:
+                    cert = extract_certs_as_strings(cert_file)[0].rstrip('\n')
+                except (PemError, IndexError) as e:
+                    result['result'] = f"invalid certificate file {cert_file}: {e}"
+                    return result
 
                 # take openvpn client template and fill
                 from jinja2 import Template
@@ -192,37 +329,6 @@ class OpenVPN(object):
 
         return result
 
-    def extract_certs_as_strings(self, cert_file):
-        certs = []
-        with open(cert_file) as whole_cert:
-            cert_started = False
-            content = ''
-            for line in whole_cert:
-                if '-----BEGIN CERTIFICATE-----' in line:
-                    if not cert_started:
-                        content += line
-                        cert_started = True
-                    else:
-                        print('Error, start cert found but already started')
-                        sys.exit(1)
-                elif '-----END CERTIFICATE-----' in line:
-                    if cert_started:
-                        content += line
-                        certs.append(content)
-                        content = ''
-                        cert_started = False
-                    else:
-                        print('Error, cert end found without start')
-                        sys.exit(1)
-                elif cert_started:
-                    content += line
-
-            if cert_started:
-                print('The file is corrupted')
-                sys.exit(1)
-
-        return certs
-
     def __vpn_user_req(self):
         """
         """
@@ -265,9 +371,23 @@ def main():
             type="bool"
         ),
         secret=dict(
-            required=True,
+            required=False,
+            type="str"
+        ),
+        key_type=dict(
+            required=False,
+            default="tls-auth",
+            choices=["tls-auth", "tls-crypt", "tls-crypt-v2-server", "tls-crypt-v2-client"]
+        ),
+        server_key=dict(
+            required=False,
             type="str"
         ),
+        clients=dict(
+            required=False,
+            type="list",
+            elements="dict"
+        ),
         username=dict(
             required=False,
             type="str"
@@ -289,7 +409,10 @@ def main():
     )
     module = AnsibleModule(
         argument_spec=args,
-        supports_check_mode=False,
+        supports_check_mode=True,
+        mutually_exclusive=[
+            ["secret", "clients"],
+        ],
     )
 
     o = OpenVPN(module)
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+import base64
+import io
+import os
+import tarfile
+
+from ansible.module_utils.basic import AnsibleModule
+
+
+class OpenVPNClientBundle(object):
+    """
+      the certificate bundles of static clients as in-memory tar.gz streams
+
+        ${name}/ca.crt
+        ${name}/${name}.crt
+        ${name}/${name}.key
+        ${name}/ta.key
+        ${name}/tls-crypt-v2.key   (optional)
+
+      Nothing is written to disk, the bundles are returned base64 encoded
+      and reach the controller with the module result.
+    """
+    module = None
+
+    def __init__(self, module):
+        """
+        """
+        self.module = module
+
+        self.clients = module.params.get("clients")
+        self.pki_dir = module.params.get("pki_dir")
+        self.openvpn_directory = module.params.get("openvpn_directory")
+        self.tls_crypt_v2 = module.params.get("tls_crypt_v2")
+
+    def run(self):
+        """
+        """
+        bundles = dict()
+        missing = dict()
+
+        for name in self.clients:
+            files = self.__bundle_files(name)
+            not_found = [src for src in files.values() if not os.path.isfile(src)]
+
+            if not_found:
+                missing[name] = not_found
+                continue
+
+            bundles[name] = self.__bundle(name, files)
+
+        if missing:
+            message = f"{len(missing)} of {len(self.clients)} bundles are incomplete: {', '.join(missing.keys())}"
+        else:
+            message = f"{len(bundles)} bundles created."
+
+        return dict(
+            failed = len(missing) > 0,
+            changed = False,
+            bundles = bundles,
+            missing = missing,
+            message = message
+        )
+
+    def __bundle_files(self, name):
+        """
+          {name in the bundle: source file}
+        """
+        files = {
+            "ca.crt": os.path.join(self.pki_dir, "ca.crt"),
+            f"{name}.crt": os.path.join(self.pki_dir, "issued", f"{name}.crt"),
+            f"{name}.key": os.path.join(self.pki_dir, "private", f"{name}.key"),
+            "ta.key": os.path.join(self.openvpn_directory, "keys", "server", "ta.key"),
+        }
+
+        if self.tls_crypt_v2:
+            files["tls-crypt-v2.key"] = os.path.join(self.openvpn_directory, "keys", "tls-crypt-v2", f"{name}.key")
+
+        return files
+
+    def __bundle(self, name, files):
+        """
+          base64 encoded tar.gz of the files, built in memory
+        """
+        buffer = io.BytesIO()
+
+        with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+            for filename, src in sorted(files.items()):
+                with open(src, "rb") as f:
+                    data = f.read()
+
+                info = tarfile.TarInfo(name=f"{name}/{filename}")
+                info.size = len(data)
+                info.mode = 0o600
+                info.mtime = int(os.stat(src).st_mtime)
+
+                tar.addfile(info, io.BytesIO(data))
+
+        return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+# ===========================================
+# Module execution.
+#
+
+
+def main():
+
+    args = dict(
+        clients=dict(
+            required=True,
+            type="list",
+            elements="str"
+        ),
+        pki_dir=dict(
+            required=False,
+            type="str",
+            default="/etc/easy-rsa/pki"
+        ),
+        openvpn_directory=dict(
+            required=False,
+            type="str",
+            default="/etc/openvpn"
+        ),
+        tls_crypt_v2=dict(
+            required=False,
+            type="bool",
+            default=False
+        ),
+    )
+
+    module = AnsibleModule(
+        argument_spec=args,
+        supports_check_mode=True,
+    )
+
+    o = OpenVPNClientBundle(module)
+    result = o.run()
+
+    # the result contains private keys, it is not logged
+    module.exit_json(**result)
+
+
+# import module snippets
+if __name__ == '__main__':
+    main()
@@ -6,11 +6,12 @@
 from __future__ import absolute_import, division, print_function
 import os
 # import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from ansible.module_utils.basic import AnsibleModule
-from ansible_collections.bodsch.core.plugins.module_utils.directory import create_directory
-from ansible_collections.bodsch.core.plugins.module_utils.checksum import Checksum
+from ansible.module_utils.basic import AnsibleModule, missing_required_lib
+from ansible.module_utils.openvpn_easyrsa_native import EasyRsaNative, HAS_CRYPTOGRAPHY
+from ansible.module_utils.openvpn_checksum_manifest import ChecksumManifest
 
 
 class OpenVPNClientCertificate(object):
@@ -28,39 +29,75 @@ class OpenVPNClientCertificate(object):
         self.state = module.params.get("state")
         self.force = module.params.get("force", False)
         self._username = module.params.get('username', None)
+        self._clients = module.params.get('clients', None)
+        self._workers = module.params.get('workers', 4)
+        self._backend = module.params.get('backend', 'easyrsa')
+        self._paranoid = module.params.get('paranoid', False)
+        self._key_pool = module.params.get('key_pool', False)
 
         self._chdir = module.params.get('chdir', None)
 
         self._openvpn = module.get_bin_path('openvpn', True)
-        self._easyrsa = module.get_bin_path('easyrsa', True)
+        self._easyrsa = module.get_bin_path('easyrsa', self._backend == "easyrsa")
 
-        self.req_file = os.path.join("pki", "reqs", f"{self._username}.req")
-        self.key_file = os.path.join("pki", "private", f"{self._username}.key")
-        self.crt_file = os.path.join("pki", "issued", f"{self._username}.crt")
+        self.checksum_base_directory = f"{Path.home()}/.ansible/cache/openvpn"
 
-        self.checksum_directory = f"{Path.home()}/.ansible/cache/openvpn/{self._username}"
-
-        self.req_checksum_file = os.path.join(self.checksum_directory, "req.sha256")
-        self.key_checksum_file = os.path.join(self.checksum_directory, "key.sha256")
-        self.crt_checksum_file = os.path.join(self.checksum_directory, "crt.sha256")
+        # revocations are collected and committed with one CRL signing per run
+        self._revocations = []
 
     def run(self):
         """
           runner
         """
-        create_directory(self.checksum_directory)
-
-        self.checksum = Checksum(self.module)
-
         if self._chdir:
             os.chdir(self._chdir)
 
+        self.manifest = ChecksumManifest(self.checksum_base_directory, "pki", self._paranoid).load()
+
+        # the per-user checksum files of former versions
+        migrated = self.manifest.migrate(self.checksum_base_directory)
+
+        if len(migrated) > 0:
+            self.module.log(msg=f"the checksums of {len(migrated)} clients were imported into {self.manifest.manifest_file}")
+
+        if self._backend == "native" or self._key_pool:
+            if not HAS_CRYPTOGRAPHY:
+                self.module.fail_json(msg=missing_required_lib("cryptography"))
+
+            self.native = EasyRsaNative(self.module, os.getcwd(), self.checksum_base_directory, key_pool=self._key_pool)
+
+        if self._clients is not None:
+            result = self.__run_bulk()
+        else:
+            result = self.__run_client(self._username, self.state)
+
+        self.manifest.save()
+
+        return result
+
+    def __run_client(self, username, state):
+        """
+          handle exactly one client
+        """
+        files = self.__client_files(username)
+
         if self.force:
             self.module.log(msg="force mode ...")
-            if os.path.exists(self.checksum_directory):
-                os.remove(self.checksum_directory)
+            self.manifest.remove(username)
+
+        if state == "absent":
+            results = {username: self.__revoke_vpn_user(username, files)}
+            crl = self.__commit_revocations(results)
+
+            result = results.get(username)
+            if crl:
+                result["crl"] = crl
+                if crl.get("failed"):
+                    result["failed"] = True
+
+            return result
 
-        checksums_valid, msg = self.__validate_checksums()
+        checksums_valid, msg = self.__validate_checksums(files)
 
         if checksums_valid:
             return dict(
@@ -68,27 +105,227 @@ class OpenVPNClientCertificate(object):
                 message = msg
             )
 
-        if self.state == "present":
-            return self.__create_vpn_user()
-        if self.state == "absent":
-            return self.__revoke_vpn_user()
+        return self.__create_vpn_user(username, files)
+
+    def __run_bulk(self):
+        """
+          handle a whole list of clients in one module call
+
+          Checksums and certificate requests are validated for every client first.
+          With the native backend the key generation for all missing clients runs
+          in a worker pool, the signing is done sequentially afterwards.
+          easyrsa (3.2+) locks the PKI for every call, so it always runs with one worker.
+          All revocations are committed at the end with one CRL regeneration.
+        """
+        results = {}
+        pending = []
+
+        unnamed = [
+            str(index)
+            for index, c in enumerate(self._clients)
+            if not c.get("name")
+        ]
+
+        if len(unnamed) > 0:
+            self.module.fail_json(
+                msg=f"the clients at the positions {', '.join(unnamed)} have no name."
+            )
+
+        invalid = [
+            f"{c.get('name')} ({c.get('state')})"
+            for c in self._clients
+            if c.get("state", "present") not in ["present", "absent"]
+        ]
+
+        if len(invalid) > 0:
+            self.module.fail_json(
+                msg=f"invalid state for the clients {', '.join(invalid)}, valid states are 'present' and 'absent'."
+            )
+
+        for client in self._clients:
+            username = client.get("name")
+            state = client.get("state", "present")
+
+            files = self.__client_files(username)
+
+            if self.force:
+                self.manifest.remove(username)
+
+            if state == "absent":
+                results[username] = self.__revoke_vpn_user(username, files)
+                results[username]["state"] = state
+                continue
+
+            checksums_valid, msg = self.__validate_checksums(files)
+
+            if checksums_valid:
+                results[username] = dict(
+                    state = state,
+                    failed = False,
+                    changed = False,
+                    message = msg
+                )
+                continue
+
+            if not self.__vpn_user_req(files):
+                pending.append((username, files))
+                continue
+
+            result = self.__create_vpn_user(username, files)
+            result["state"] = state
+            results[username] = result
+
+        if len(pending) > 0:
+            results.update(self.__create_vpn_users(pending))
+
+        crl = self.__commit_revocations(results)
+
+        changed = any(r.get("changed", False) for r in results.values())
+        failed = [k for k, v in results.items() if v.get("failed", False)]
+
+        if len(failed) > 0:
+            message = f"{len(failed)} of {len(results)} clients failed: {', '.join(failed)}"
+        else:
+            message = f"{len(results)} clients processed, {len(pending)} certificates created."
+
+        result = dict(
+            failed = len(failed) > 0,
+            changed = changed,
+            message = message,
+            clients = results
+        )
+
+        if crl:
+            result["crl"] = crl
+            if crl.get("failed"):
+                result["failed"] = True
+
+        return result
+
+    def __create_vpn_users(self, pending):
+        """
+          create the certificates for a list of clients
+
+          the keypairs and requests (gen-req) are created in parallel,
+          the requests are signed one after the other (sign-req)
+        """
+        results = {}
+
+        workers = max(1, min(self._workers, len(pending)))
+
+        if self._backend != "native" and workers > 1:
+            self.module.log(msg=f"the easyrsa backend locks the PKI, {workers} workers are reduced to one.")
+            workers = 1
+
+        if workers == 1:
+            for username, files in pending:
+                result = self.__create_vpn_user(username, files, check_rc=False)
+                result["state"] = "present"
+                results[username] = result
+
+            return results
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            requests = list(executor.map(lambda p: self.__gen_req(p[0]), pending))
+
+        for (username, files), (rc, out) in zip(pending, requests):
+            if rc != 0:
+                results[username] = dict(
+                    state = "present",
+                    failed = True,
+                    changed = False,
+                    message = f"{out.rstrip()}"
+                )
+                continue
+
+            rc, out = self.__sign_req(username)
+
+            if rc != 0:
+                results[username] = dict(
+                    state = "present",
+                    failed = True,
+                    changed = False,
+                    message = f"{out.rstrip()}"
+                )
+                continue
+
+            self.__write_checksums(files)
+
+            results[username] = dict(
+                state = "present",
+                failed = False,
+                changed = True,
+                message = "The client certificate has been successfully created."
+            )
+
+        return results
+
+    def __gen_req(self, username):
+        """
+            easyrsa --batch --req-cn=${username} gen-req ${username} nopass
+        """
+        if self._backend == "native":
+            return self.native.gen_req(username)
+
+        if self._key_pool:
+            # the request is created from a pooled key, signed by easyrsa
+            private_key = self.native.pooled_private_key()
 
-    def __create_vpn_user(self):
+            if private_key is not None:
+                return self.native.gen_req(username, private_key=private_key)
+
+        args = []
+        args.append(self._easyrsa)
+        args.append("--batch")
+        args.append(f"--req-cn={username}")
+        args.append("gen-req")
+        args.append(username)
+        args.append("nopass")
+
+        return self._exec(args, check_rc=False)
+
+    def __sign_req(self, username):
+        """
+            easyrsa --batch sign-req client ${username}
+        """
+        if self._backend == "native":
+            return self.native.sign_req(username, "client")
+
+        args = []
+        args.append(self._easyrsa)
+        args.append("--batch")
+        args.append("sign-req")
+        args.append("client")
+        args.append(username)
+
+        return self._exec(args, check_rc=False)
+
+    def __create_vpn_user(self, username, files, check_rc=True):
         """
         """
-        if not self.__vpn_user_req():
+        if not self.__vpn_user_req(files):
             """
             """
-            args = []
+            if self._key_pool:
+                # only a signature per client, when the pool holds a key
+                rc, out = self.__gen_req(username)
 
-            # rc = 0
-            args.append(self._easyrsa)
-            args.append("--batch")
-            args.append("build-client-full")
-            args.append(self._username)
-            args.append("nopass")
+                if rc == 0:
+                    rc, out = self.__sign_req(username)
 
-            rc, out = self._exec(args)
+            elif self._backend == "native":
+                rc, out = self.native.build_full(username, "client")
+            else:
+                args = []
+
+                # rc = 0
+                args.append(self._easyrsa)
+                args.append("--batch")
+                args.append("build-client-full")
+                args.append(username)
+                args.append("nopass")
+
+                rc, out = self._exec(args, check_rc=check_rc)
 
             if rc != 0:
                 """
@@ -99,14 +336,7 @@ class OpenVPNClientCertificate(object):
                     message=f"{out.rstrip()}"
                 )
             else:
-                req_checksum = self.checksum.checksum_from_file(self.req_file)
-                self.checksum.write_checksum(self.req_checksum_file, req_checksum)
-
-                key_checksum = self.checksum.checksum_from_file(self.key_file)
-                self.checksum.write_checksum(self.key_checksum_file, key_checksum)
-
-                crt_checksum = self.checksum.checksum_from_file(self.crt_file)
-                self.checksum.write_checksum(self.crt_checksum_file, crt_checksum)
+                self.__write_checksums(files)
 
                 return dict(
                     failed=False,
@@ -114,7 +344,7 @@ class OpenVPNClientCertificate(object):
                     message = "The client certificate has been successfully created."
                 )
         else:
-            valid, msg = self.__validate_checksums()
+            valid, msg = self.__validate_checksums(files)
 
             if valid:
                 return dict(
@@ -129,92 +359,130 @@ class OpenVPNClientCertificate(object):
                     message = msg
                 )
 
-    def __revoke_vpn_user(self):
+    def __revoke_vpn_user(self, username, files):
         """
+          queue the revocation, see __commit_revocations()
         """
-        if not self.__vpn_user_req():
+        if not self.__vpn_user_req(files):
             return dict(
                 failed=False,
                 changed=False,
-                message=f"There is no certificate request for the user {self._username}."
+                message=f"There is no certificate request for the user {username}."
             )
 
-        args = []
-
-        # rc = 0
-        args.append(self._easyrsa)
-        args.append("--batch")
-        args.append("revoke")
-        args.append(self._username)
-
-        rc, out = self._exec(args)
-
-        if rc == 0:
-            # remove checksums
-            os.remove(self.checksum_directory)
-            # recreate CRL
-            args = []
-            args.append(self._easyrsa)
-            args.append("gen-crl")
+        self._revocations.append((username, files))
 
         return dict(
             changed=True,
             failed=False,
-            message=f"The certificate for the user {self._username} has been revoked successfully."
+            message=f"The certificate for the user {username} has been revoked successfully."
         )
 
-    def __vpn_user_req(self):
+    def __commit_revocations(self, results):
         """
+          revoke all queued certificates and sign the CRL exactly once
         """
-        if os.path.exists(self.req_file):
-            return True
+        if len(self._revocations) == 0:
+            return None
+
+        serials_added = 0
+        failed = {}
+
+        if self._backend == "native":
+            rc, out, serials = self.native.revoke([u for u, _ in self._revocations])
+
+            for username, _ in self._revocations:
+                if rc != 0:
+                    failed[username] = out
+                elif len(serials.get(username, [])) == 0:
+                    failed[username] = f"There is no valid certificate for the user {username}."
+                else:
+                    serials_added += len(serials.get(username))
+        else:
+            for username, _ in self._revocations:
+                args = []
+                args.append(self._easyrsa)
+                args.append("--batch")
+                args.append("revoke")
+                args.append(username)
+
+                rc, out = self._exec(args, check_rc=False)
+
+                if rc != 0:
+                    failed[username] = out
+                else:
+                    serials_added += 1
+
+        for username, files in self._revocations:
+            if username in failed:
+                results[username].update(
+                    failed=True,
+                    changed=False,
+                    message=f"{failed.get(username).rstrip()}"
+                )
+            else:
+                # remove checksums
+                self.manifest.remove(username)
 
-        return False
+        self._revocations = []
 
-    def __validate_checksums(self):
-        """
-        """
-        msg = ""
+        crl = dict(
+            regenerated=False,
+            serials_added=serials_added
+        )
 
-        req_checksum = None
-        req_old_checksum = None
+        if serials_added > 0:
+            if self._backend == "native":
+                rc, out = self.native.gen_crl()
+            else:
+                rc, out = self._exec([self._easyrsa, "--batch", "gen-crl"], check_rc=False)
 
-        key_checksum = None
-        key_old_checksum = None
+            crl["regenerated"] = (rc == 0)
 
-        crt_checksum = None
-        crt_old_checksum = None
+            if rc != 0:
+                crl["failed"] = True
+                crl["message"] = f"{out.rstrip()}"
 
-        req_changed, req_checksum, req_old_checksum = self.checksum.validate_from_file(self.req_checksum_file, self.req_file)
-        key_changed, key_checksum, key_old_checksum = self.checksum.validate_from_file(self.key_checksum_file, self.key_file)
-        crt_changed, crt_checksum, crt_old_checksum = self.checksum.validate_from_file(self.crt_checksum_file, self.crt_file)
+        return crl
 
-        if os.path.exists(self.req_file) and not os.path.exists(self.req_checksum_file):
-            req_checksum = self.checksum.checksum_from_file(self.req_file)
-            self.checksum.write_checksum(self.req_checksum_file, req_checksum)
-            req_changed = False
+    def __client_files(self, username):
+        """
+          all files belonging to a client
+        """
+        return dict(
+            name = username,
+            req_file = os.path.join("pki", "reqs", f"{username}.req"),
+            key_file = os.path.join("pki", "private", f"{username}.key"),
+            crt_file = os.path.join("pki", "issued", f"{username}.crt"),
+        )
 
-        if os.path.exists(self.key_file) and not os.path.exists(self.key_checksum_file):
-            key_checksum = self.checksum.checksum_from_file(self.key_file)
-            self.checksum.write_checksum(self.key_checksum_file, key_checksum)
-            key_changed = False
+    def __vpn_user_req(self, files):
+        """
+        """
+        if os.path.exists(files.get("req_file")):
+            return True
+
+        return False
 
-        if os.path.exists(self.crt_file) and not os.path.exists(self.crt_checksum_file):
-            crt_checksum = self.checksum.checksum_from_file(self.crt_file)
-            self.checksum.write_checksum(self.crt_checksum_file, crt_checksum)
-            crt_changed = False
+    def __write_checksums(self, files):
+        """
+        """
+        for f in ["req", "key", "crt"]:
+            self.manifest.set(files.get("name"), f, files.get(f"{f}_file"))
 
-        if req_changed or key_changed or crt_changed:
-            _msg = []
+    def __validate_checksums(self, files):
+        """
+          compare the req, key and crt files with the checksum manifest
+        """
+        msg = ""
+        changed = []
 
-            if req_changed:
-                _msg.append(f"{self.req_checksum_file} are changed")
-            if key_changed:
-                _msg.append(f"{self.key_checksum_file} are changed")
-            if crt_changed:
-                _msg.append(f"{self.crt_checksum_file} are changed")
+        for f in ["req", "key", "crt"]:
+            if self.manifest.validate(files.get("name"), f, files.get(f"{f}_file")):
+                changed.append(f)
 
-            msg = ", ".join(_msg)
+        if len(changed) > 0:
+            msg = ", ".join([f"{files.get(f'{f}_file')} are changed" for f in changed])
             valid = False
         else:
             valid = True
@@ -222,15 +490,19 @@ class OpenVPNClientCertificate(object):
 
         return valid, msg
 
-    def _exec(self, commands):
+    def _exec(self, commands, check_rc=True):
         """
           execute shell program
         """
         self.module.log(msg=f"  commands: '{commands}'")
-        rc, out, err = self.module.run_command(commands, check_rc=True)
+        rc, out, err = self.module.run_command(commands, check_rc=check_rc)
         # self.module.log(msg="  rc : '{}'".format(rc))
         # self.module.log(msg="  out: '{}'".format(out))
         # self.module.log(msg="  err: '{}'".format(err))
+
+        if int(rc) != 0 and not check_rc:
+            out = f"{out}{err}"
+
         return rc, out
 
 
@@ -253,9 +525,34 @@ def main():
             type="bool"
         ),
         username=dict(
-            required=True,
+            required=False,
             type="str"
         ),
+        clients=dict(
+            required=False,
+            type="list",
+            elements="dict"
+        ),
+        workers=dict(
+            required=False,
+            default=4,
+            type="int"
+        ),
+        paranoid=dict(
+            required=False,
+            default=False,
+            type="bool"
+        ),
+        key_pool=dict(
+            required=False,
+            default=False,
+            type="bool"
+        ),
+        backend=dict(
+            required=False,
+            default="easyrsa",
+            choices=["easyrsa", "native"]
+        ),
         chdir=dict(
             required=False
         ),
@@ -263,6 +560,12 @@ def main():
 
     module = AnsibleModule(
         argument_spec=args,
+        mutually_exclusive=[
+            ["username", "clients"],
+        ],
+        required_one_of=[
+            ["username", "clients"],
+        ],
         supports_check_mode=False,
     )
 
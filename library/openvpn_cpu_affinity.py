@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+import os
+import re
+
+from ansible.module_utils.basic import AnsibleModule
+
+
+PROC_INTERRUPTS = "/proc/interrupts"
+
+# eth0-TxRx-3, eth0-rx-3, mlx5_comp3@pci:..., virtio0-input.3
+QUEUE_PATTERN = r"^(?:{names}).*?(?P<queue>\d+)(?:@\S*)?$"
+
+
+def parse_cpu_list(value):
+    """
+      '0-3,8' -> [0, 1, 2, 3, 8]
+    """
+    cpus = []
+
+    for part in value.strip().split(","):
+        if not part:
+            continue
+
+        first, _, last = part.partition("-")
+        cpus += list(range(int(first), int(last or first) + 1))
+
+    return cpus
+
+
+class OpenVPNCpuAffinity(object):
+    """
+      one CPU core per openvpn server instance
+
+        auto: the available cores, round robin
+        rss : the cores handling the receive queues of the network interface (the IRQ affinity),
+              the packets of an instance are processed on the core of its process
+
+      Falls back to 'auto', when no receive queues of the interface are found.
+    """
+    module = None
+
+    def __init__(self, module):
+        """
+        """
+        self.module = module
+
+        self.interface = module.params.get("interface")
+        self.instances = module.params.get("instances")
+        self.mode = module.params.get("mode")
+
+    def run(self):
+        """
+        """
+        available = sorted(os.sched_getaffinity(0))
+        queues = dict()
+        mode = self.mode
+
+        if mode == "rss":
+            queues = self.__rss_queues()
+
+            if not queues:
+                self.module.warn(f"no receive queues of '{self.interface}' found in {PROC_INTERRUPTS}, the cores are assigned round robin.")
+                mode = "auto"
+
+        if mode == "rss":
+            cpus = [queues.get(q)[0] for q in sorted(queues) if queues.get(q)]
+        else:
+            cpus = available
+
+        instances = dict(
+            (name, [cpus[index % len(cpus)]])
+            for index, name in enumerate(self.instances)
+        )
+
+        return dict(
+            failed = False,
+            changed = False,
+            mode = mode,
+            cpus = available,
+            rss = queues,
+            instances = instances,
+            message = f"{len(self.instances)} instances pinned to the cores {', '.join(str(v[0]) for v in instances.values())} ({mode})."
+        )
+
+    def __rss_queues(self):
+        """
+          {queue: [cpus]} of the receive queue interrupts of the interface
+        """
+        names = [re.escape(self.interface) + "[-_.@]"]
+        device = os.path.join("/sys/class/net", self.interface, "device")
+
+        # virtio and mlx5 name their interrupts after the device, not the interface
+        if os.path.exists(device):
+            names.append(re.escape(os.path.basename(os.path.realpath(device))) + "[-_.@]")
+
+            driver = os.path.join(device, "driver")
+
+            if os.path.exists(driver) and os.path.basename(os.path.realpath(driver)) == "mlx5_core":
+                names.append("mlx5_comp")
+
+        pattern = re.compile(QUEUE_PATTERN.format(names="|".join(names)))
+
+        try:
+            with open(PROC_INTERRUPTS, "r") as f:
+                lines = f.readlines()
+        except (IOError, OSError) as e:
+            self.module.log(msg=f"can not read {PROC_INTERRUPTS}: {e}")
+            return dict()
+
+        queues = dict()
+
+        for line in lines:
+            irq, _, rest = line.partition(":")
+            fields = rest.split()
+
+            if not irq.strip().isdigit() or not fields:
+                continue
+
+            found = pattern.match(fields[-1])
+
+            if not found:
+                continue
+
+            # transmit only queues
+            name = fields[-1].lower()
+
+            if ("tx" in name and "rx" not in name) or "output" in name:
+                continue
+
+            cpus = self.__irq_affinity(irq.strip())
+
+            if cpus:
+                queues.setdefault(int(found.group("queue")), cpus)
+
+        return queues
+
+    def __irq_affinity(self, irq):
+        """
+        """
+        for name in ["effective_affinity_list", "smp_affinity_list"]:
+            filename = os.path.join("/proc/irq", irq, name)
+
+            try:
+                with open(filename, "r") as f:
+                    cpus = parse_cpu_list(f.read())
+            except (IOError, OSError, ValueError):
+                continue
+
+            if cpus:
+                return cpus
+
+        return []
+
+
+# ===========================================
+# Module execution.
+#
+
+
+def main():
+
+    args = dict(
+        interface=dict(
+            required=False,
+            type="str",
+            default="eth0"
+        ),
+        instances=dict(
+            required=True,
+            type="list",
+            elements="str"
+        ),
+        mode=dict(
+            required=False,
+            type="str",
+            choices=["auto", "rss"],
+            default="auto"
+        ),
+    )
+
+    module = AnsibleModule(
+        argument_spec=args,
+        supports_check_mode=True,
+    )
+
+    o = OpenVPNCpuAffinity(module)
+    result = o.run()
+
+    module.log(msg=f"= result: {result}")
+
+    module.exit_json(**result)
+
+
+# import module snippets
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+import os
+from pathlib import Path
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.openvpn_version import OpenVPNVersion
+
+
+CPUINFO = "/proc/cpuinfo"
+
+# preferred order with and without AES instructions in the CPU
+AES_HARDWARE_CIPHERS = ["AES-256-GCM", "AES-128-GCM", "CHACHA20-POLY1305"]
+AES_SOFTWARE_CIPHERS = ["CHACHA20-POLY1305", "AES-256-GCM", "AES-128-GCM"]
+
+# x86: aes (AES-NI), pclmulqdq (GHASH), vaes (vector AES)
+# arm: aes and pmull (ARMv8 crypto extensions)
+AES_FEATURES = ["aes", "vaes", "pclmulqdq", "pmull"]
+
+
+def parse_cpuinfo(out):
+    """
+      the AES related cpu features of /proc/cpuinfo ('flags' on x86, 'Features' on arm)
+    """
+    features = set()
+
+    for line in out.splitlines():
+        key, _, value = line.partition(":")
+
+        if key.strip().lower() in ["flags", "features"]:
+            features.update(value.split())
+
+    return sorted(f for f in features if f in AES_FEATURES)
+
+
+class OpenVPNDataCiphers(object):
+    """
+      an ordered list of data ciphers for 'data-ciphers'
+
+      With AES instructions in the CPU (AES-NI, ARMv8 crypto extensions) AES-GCM is
+      preferred, otherwise CHACHA20-POLY1305, which is 2-3x faster in software.
+      Only AEAD ciphers supported by the openvpn binary ('openvpn --show-ciphers') are returned.
+    """
+    module = None
+
+    def __init__(self, module):
+        """
+        """
+        self.module = module
+
+        self.data_ciphers = module.params.get("data_ciphers")
+
+        self.cache_directory = f"{Path.home()}/.ansible/cache/openvpn"
+
+        self._openvpn = module.get_bin_path("openvpn", True)
+
+    def run(self):
+        """
+        """
+        info, _ = OpenVPNVersion(self.module, self._openvpn, self.cache_directory).info()
+
+        available = info.get("capabilities", {}).get("data_ciphers") or []
+
+        features = self.__cpu_features()
+        aes_hardware = self.__aes_hardware(features)
+
+        if self.data_ciphers:
+            ciphers = self.data_ciphers
+        elif aes_hardware:
+            ciphers = AES_HARDWARE_CIPHERS
+        else:
+            ciphers = AES_SOFTWARE_CIPHERS
+
+        if available:
+            unsupported = [c for c in ciphers if c not in available]
+            ciphers = [c for c in ciphers if c in available]
+        else:
+            unsupported = []
+
+        return dict(
+            failed = False,
+            changed = False,
+            version = info.get("version"),
+            aes_hardware = aes_hardware,
+            cpu_features = features,
+            data_ciphers = ciphers,
+            unsupported = unsupported
+        )
+
+    def __aes_hardware(self, features):
+        """
+          AES-GCM in hardware needs the AES instructions and a carry-less multiplication (GHASH)
+        """
+        if os.uname().machine.startswith(("arm", "aarch")):
+            return "aes" in features and "pmull" in features
+
+        return "aes" in features and "pclmulqdq" in features
+
+    def __cpu_features(self):
+        """
+        """
+        try:
+            with open(CPUINFO, "r") as f:
+                return parse_cpuinfo(f.read())
+        except (IOError, OSError) as e:
+            self.module.log(msg=f"can not read {CPUINFO}: {e}")
+            return []
+
+
+# ===========================================
+# Module execution.
+#
+
+
+def main():
+
+    args = dict(
+        data_ciphers=dict(
+            required=False,
+            type="list",
+            elements="str"
+        ),
+    )
+
+    module = AnsibleModule(
+        argument_spec=args,
+        supports_check_mode=True,
+    )
+
+    o = OpenVPNDataCiphers(module)
+    result = o.run()
+
+    module.log(msg=f"= result: {result}")
+
+    module.exit_json(**result)
+
+
+# import module snippets
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+import os
+from pathlib import Path
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.openvpn_version import OpenVPNVersion
+
+
+# out-of-tree ovpn-dco (OpenVPN 2.6) and the mainline module (Linux 6.16, OpenVPN 2.7)
+KERNEL_MODULES = [
+    ("ovpn_dco_v2", "ovpn-dco-v2", "2.6.0"),
+    ("ovpn", "ovpn", "2.7.0"),
+]
+
+# ciphers supported by the data channel offload
+DCO_CIPHERS = ["AES-256-GCM", "AES-192-GCM", "AES-128-GCM", "CHACHA20-POLY1305"]
+
+
+def version_tuple(version):
+    """
+    """
+    try:
+        return tuple(int(x) for x in version.split(".")[:3])
+    except (AttributeError, ValueError):
+        return (0, 0, 0)
+
+
+class OpenVPNDco(object):
+    """
+      decides, if the data channel offload (ovpn-dco) can be used
+
+      DCO needs OpenVPN >= 2.6 built with DCO support, the kernel module
+      and a compatible configuration (tun device, topology subnet, AEAD data ciphers
+      and fallback cipher, no compression, no fragment).
+    """
+    module = None
+
+    def __init__(self, module):
+        """
+        """
+        self.module = module
+
+        self.enabled = module.params.get("enabled")
+        self.device = module.params.get("device")
+        self.topology = module.params.get("topology")
+        self.cipher = module.params.get("cipher")
+        self.data_ciphers = module.params.get("data_ciphers") or []
+        self.compression = module.params.get("compression")
+        self.fragment = module.params.get("fragment")
+        self.load_module = module.params.get("load_module")
+
+        self.cache_directory = f"{Path.home()}/.ansible/cache/openvpn"
+
+        self._openvpn = module.get_bin_path("openvpn", True)
+        self._modprobe = module.get_bin_path("modprobe", False)
+
+    def run(self):
+        """
+        """
+        info, _ = OpenVPNVersion(self.module, self._openvpn, self.cache_directory).info()
+
+        version = info.get("version", "0.0.0")
+        capabilities = info.get("capabilities", {})
+
+        changed = False
+        reasons = []
+
+        data_ciphers = self.__data_ciphers(version, capabilities)
+
+        if not self.enabled:
+            reasons.append("disabled by configuration.")
+
+        if version_tuple(version) < (2, 6, 0):
+            reasons.append(f"OpenVPN {version} has no DCO support (2.6.0 or newer is required).")
+        elif not capabilities.get("dco"):
+            reasons.append(f"OpenVPN {version} was built without DCO support.")
+
+        reasons += self.__incompatible_options(data_ciphers)
+
+        kernel_module, loaded = self.__kernel_module(version)
+
+        # the module is only loaded for a configuration that can use it
+        if self.enabled and kernel_module and not loaded and self.load_module and not reasons and not self.module.check_mode:
+            loaded = self.__modprobe(kernel_module)
+            changed = loaded
+
+        if kernel_module is None:
+            reasons.append("no DCO kernel module (ovpn-dco-v2 / ovpn) is available.")
+        elif not loaded:
+            reasons.append(f"the kernel module {kernel_module} is not loaded.")
+
+        enabled = len(reasons) == 0
+
+        if enabled:
+            message = f"DCO enabled (kernel module {kernel_module})."
+        else:
+            message = f"DCO not enabled: {' '.join(reasons)}"
+
+        return dict(
+            failed = False,
+            changed = changed,
+            enabled = enabled,
+            version = version,
+            kernel_module = kernel_module,
+            kernel_module_loaded = loaded,
+            data_ciphers = data_ciphers,
+            reasons = reasons,
+            message = message
+        )
+
+    def __data_ciphers(self, version, capabilities):
+        """
+          the configured data ciphers, restricted to the ciphers of the openvpn binary
+
+          'data-ciphers' exists since OpenVPN 2.5, older versions only know 'cipher'.
+        """
+        if version_tuple(version) < (2, 5, 0):
+            return []
+
+        available = capabilities.get("ciphers")
+        ciphers = self.data_ciphers or ([self.cipher] if self.cipher else [])
+
+        if available:
+            ciphers = [c for c in ciphers if c in available]
+
+        return ciphers
+
+    def __incompatible_options(self, data_ciphers):
+        """
+          configuration options, which disable DCO
+        """
+        reasons = []
+
+        if self.device != "tun":
+            reasons.append(f"device '{self.device}' is not supported, DCO needs 'tun'.")
+
+        if self.topology != "subnet":
+            reasons.append(f"topology '{self.topology}' is not supported, DCO needs 'subnet'.")
+
+        if self.compression:
+            reasons.append("compression is not supported.")
+
+        if self.fragment:
+            reasons.append("'fragment' is not supported.")
+
+        if not data_ciphers:
+            reasons.append("no data ciphers configured.")
+
+        unsupported = [c for c in data_ciphers if c not in DCO_CIPHERS]
+
+        if unsupported:
+            reasons.append(f"the data ciphers {', '.join(unsupported)} are not supported (AEAD only).")
+
+        if self.cipher and self.cipher not in DCO_CIPHERS:
+            reasons.append(f"the fallback cipher {self.cipher} is not supported (AEAD only).")
+
+        return reasons
+
+    def __kernel_module(self, version):
+        """
+          (name, loaded) of the kernel module for this openvpn version or (None, False)
+        """
+        release = os.uname().release
+
+        for name, package, min_version in KERNEL_MODULES:
+            if version_tuple(version) < version_tuple(min_version):
+                continue
+
+            if os.path.isdir(os.path.join("/sys/module", name)):
+                return name, True
+
+            if self.__module_exists(release, name, package):
+                return name, False
+
+        return None, False
+
+    def __module_exists(self, release, name, package):
+        """
+        """
+        if not self._modprobe:
+            return False
+
+        rc, _, _ = self.module.run_command([self._modprobe, "--dry-run", "--set-version", release, package], check_rc=False)
+
+        return rc == 0
+
+    def __modprobe(self, name):
+        """
+        """
+        if self.module.check_mode:
+            return True
+
+        rc, out, err = self.module.run_command([self._modprobe, name], check_rc=False)
+
+        if rc != 0:
+            self.module.log(msg=f"  modprobe {name}: '{err.strip()}'")
+
+        return rc == 0
+
+
+# ===========================================
+# Module execution.
+#
+
+
+def main():
+
+    args = dict(
+        enabled=dict(
+            required=False,
+            type="bool",
+            default=False
+        ),
+        device=dict(
+            required=False,
+            type="str",
+            default="tun"
+        ),
+        topology=dict(
+            required=False,
+            type="str",
+            default="subnet"
+        ),
+        cipher=dict(
+            required=False,
+            type="str"
+        ),
+        data_ciphers=dict(
+            required=False,
+            type="list",
+            elements="str"
+        ),
+        compression=dict(
+            required=False,
+            type="bool",
+            default=False
+        ),
+        fragment=dict(
+            required=False,
+            type="bool",
+            default=False
+        ),
+        load_module=dict(
+            required=False,
+            type="bool",
+            default=True
+        ),
+    )
+
+    module = AnsibleModule(
+        argument_spec=args,
+        supports_check_mode=True,
+    )
+
+    o = OpenVPNDco(module)
+    result = o.run()
+
+    module.log(msg=f"= result: {result}")
+
+    module.exit_json(**result)
+
+
+# import module snippets
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+import glob
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.openvpn_checksum_manifest import ChecksumManifest
+from ansible.module_utils.openvpn_pki_index import EasyRsaIndex
+from ansible.module_utils.openvpn_version import OpenVPNVersion
+
+try:
+    from cryptography import x509
+except ImportError:
+    HAS_CRYPTOGRAPHY = False
+else:
+    HAS_CRYPTOGRAPHY = True
+
+
+class OpenVPNFacts(object):
+    """
+      the state of an openvpn server, gathered in one module call
+
+      The module never changes the PKI state: the checksums are kept in a manifest of
+      its own ('facts'), the checksum manifest of openvpn_client_certificate is not touched.
+      In check mode nothing is written at all, neither the manifests nor the version
+      and index.txt caches.
+    """
+    module = None
+
+    def __init__(self, module):
+        """
+        """
+        self.module = module
+
+        self.pki_dir = module.params.get("pki_dir")
+        self.openvpn_directory = module.params.get("openvpn_directory")
+        self.server_name = module.params.get("server_name")
+        self.dh_keysize = module.params.get("dh_keysize")
+        self.export_directory = module.params.get("export_directory")
+        self.clients = module.params.get("clients") or []
+        self.expire_in_days = module.params.get("expire_in_days")
+
+        self.cache_directory = f"{Path.home()}/.ansible/cache/openvpn"
+
+        # the version and index.txt caches are written while reading
+        self.read_cache_directory = None if module.check_mode else self.cache_directory
+
+        self._openvpn = module.get_bin_path("openvpn", False)
+
+    def run(self):
+        """
+        """
+        version, capabilities = self.__binary()
+
+        return dict(
+            failed = False,
+            changed = False,
+            version = version,
+            capabilities = capabilities,
+            pki = self.__pki(),
+            server = self.__server(),
+            crl = self.__crl(),
+            certificates = self.__certificates(),
+            exports = self.__exports()
+        )
+
+    def __binary(self):
+        """
+          version and capabilities of the (cached) openvpn binary
+        """
+        if not self._openvpn:
+            return None, None
+
+        info, _ = OpenVPNVersion(self.module, self._openvpn, self.read_cache_directory).info()
+
+        return info.get("version"), info.get("capabilities")
+
+    def __pki(self):
+        """
+          existence of the easyrsa files and the checksums of the requested client certificates
+        """
+        pki = dict(
+            exists = os.path.isdir(self.pki_dir),
+            ca = os.path.isfile(os.path.join(self.pki_dir, "ca.crt")),
+            crl = os.path.isfile(os.path.join(self.pki_dir, "crl.pem")),
+            dh = os.path.isfile(os.path.join(self.pki_dir, "dh.pem")),
+            index = os.path.isfile(os.path.join(self.pki_dir, "index.txt")),
+        )
+
+        if self.server_name:
+            pki["server_req"] = os.path.isfile(os.path.join(self.pki_dir, "reqs", f"{self.server_name}.req"))
+            pki["server_cert"] = os.path.isfile(os.path.join(self.pki_dir, "issued", f"{self.server_name}.crt"))
+            pki["server_key"] = os.path.isfile(os.path.join(self.pki_dir, "private", f"{self.server_name}.key"))
+
+        if self.clients:
+            manifest = ChecksumManifest(self.cache_directory, self.pki_dir, namespace="facts").load()
+
+            pki["issued"] = dict(
+                (name, self.__checksum(manifest, name, "crt", os.path.join(self.pki_dir, "issued", f"{name}.crt")))
+                for name in self.clients
+            )
+
+            self.__save(manifest)
+
+        return pki
+
+    def __server(self):
+        """
+          the files in ${openvpn_directory}/keys/server
+        """
+        key_directory = os.path.join(self.openvpn_directory, "keys", "server")
+
+        server = dict(
+            ca = os.path.isfile(os.path.join(key_directory, "ca.crt")),
+            dh = os.path.isfile(os.path.join(key_directory, f"dh{self.dh_keysize}.pem")),
+            ta = os.path.isfile(os.path.join(key_directory, "ta.key")),
+            tls_crypt_v2 = os.path.isfile(os.path.join(key_directory, "tls-crypt-v2.key")),
+            config = os.path.isfile(os.path.join(self.openvpn_directory, "server", "server.conf")),
+        )
+
+        if self.server_name:
+            server["cert"] = os.path.isfile(os.path.join(key_directory, f"{self.server_name}.crt"))
+            server["key"] = os.path.isfile(os.path.join(key_directory, f"{self.server_name}.key"))
+
+        return server
+
+    def __crl(self):
+        """
+          validity window of pki/crl.pem
+
+          expired is true, when the next update is within expire_in_days.
+        """
+        crl_file = os.path.join(self.pki_dir, "crl.pem")
+
+        if not os.path.isfile(crl_file):
+            return dict(exists = False, expired = True)
+
+        if not HAS_CRYPTOGRAPHY:
+            return dict(exists = True, expired = None, msg = "python cryptography is not installed.")
+
+        try:
+            with open(crl_file, "rb") as f:
+                crl = x509.load_pem_x509_crl(f.read())
+        except (IOError, OSError, ValueError) as e:
+            return dict(exists = True, expired = True, msg = f"invalid CRL: {e}")
+
+        last_update = self.__utc(getattr(crl, "last_update_utc", None) or crl.last_update)
+        next_update = getattr(crl, "next_update_utc", None) or crl.next_update
+        next_update = self.__utc(next_update) if next_update else None
+
+        expired = False
+
+        if next_update is not None:
+            expired = (next_update - datetime.now(timezone.utc)).days <= self.expire_in_days
+
+        return dict(
+            exists = True,
+            last_update = last_update.isoformat(),
+            next_update = next_update.isoformat() if next_update else None,
+            expired = expired,
+            revoked = len(crl)
+        )
+
+    def __certificates(self):
+        """
+          counts of the certificate database (pki/index.txt)
+        """
+        index = EasyRsaIndex(self.pki_dir, self.read_cache_directory)
+
+        if not os.path.exists(index.index_file):
+            return dict(issued = 0, valid = 0, revoked = 0, expired = 0)
+
+        index.load()
+
+        valid = len(index.valid())
+        revoked = len(index.revoked())
+        expired = len(index.expired())
+
+        return dict(
+            issued = valid + revoked + expired,
+            valid = valid,
+            revoked = revoked,
+            expired = expired
+        )
+
+    def __exports(self):
+        """
+          sha256 of the exported client profiles and archives
+        """
+        if not os.path.isdir(self.export_directory):
+            return dict()
+
+        manifest = ChecksumManifest(self.cache_directory, self.export_directory, namespace="facts").load()
+        exports = dict()
+
+        for pattern in ["*.ovpn", "*.tar.gz"]:
+            for filename in sorted(glob.glob(os.path.join(self.export_directory, pattern))):
+                name = os.path.basename(filename)
+                exports[name] = self.__checksum(manifest, name, "export", filename)
+
+        self.__save(manifest)
+
+        return exports
+
+    def __save(self, manifest):
+        """
+        """
+        if not self.module.check_mode:
+            manifest.save()
+
+    def __checksum(self, manifest, name, kind, filename):
+        """
+          checksum of a file (or None), the file is only hashed when its stat has changed
+        """
+        if not os.path.isfile(filename):
+            return None
+
+        if manifest.validate(name, kind, filename):
+            manifest.set(name, kind, filename)
+
+        return manifest.get(name, kind).get("checksum")
+
+    def __utc(self, value):
+        """
+        """
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+
+        return value
+
+
+# ===========================================
+# Module execution.
+#
+
+
+def main():
+
+    args = dict(
+        pki_dir=dict(
+            required=False,
+            type="str",
+            default="/etc/easy-rsa/pki"
+        ),
+        openvpn_directory=dict(
+            required=False,
+            type="str",
+            default="/etc/openvpn"
+        ),
+        server_name=dict(
+            required=False,
+            type="str"
+        ),
+        dh_keysize=dict(
+            required=False,
+            type="int",
+            default=2048
+        ),
+        export_directory=dict(
+            required=False,
+            type="str",
+            default="/root/vpn-configs"
+        ),
+        clients=dict(
+            required=False,
+            type="list",
+            elements="str"
+        ),
+        expire_in_days=dict(
+            required=False,
+            type="int",
+            default=10
+        ),
+    )
+
+    module = AnsibleModule(
+        argument_spec=args,
+        supports_check_mode=True,
+    )
+
+    o = OpenVPNFacts(module)
+    result = o.run()
+
+    module.log(msg=f"= result: {result}")
+
+    module.exit_json(**result)
+
+
+# import module snippets
+if __name__ == '__main__':
+    main()
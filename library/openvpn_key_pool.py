@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+import os
+
+from ansible.module_utils.basic import AnsibleModule, missing_required_lib
+from ansible.module_utils.openvpn_easyrsa_native import EasyRsaNative, HAS_CRYPTOGRAPHY
+
+
+class OpenVPNKeyPool(object):
+    """
+      keeps pki/keypool filled with pre-generated client keys
+    """
+    module = None
+
+    def __init__(self, module):
+        """
+        """
+        self.module = module
+
+        self.state = module.params.get("state")
+        self.depth = module.params.get("depth")
+        self.workers = module.params.get("workers")
+        self._chdir = module.params.get("chdir")
+
+    def run(self):
+        """
+        """
+        if self._chdir:
+            os.chdir(self._chdir)
+
+        if not os.path.isdir("pki"):
+            self.module.fail_json(msg=f"The PKI directory {os.path.join(os.getcwd(), 'pki')} does not exist.")
+
+        native = EasyRsaNative(self.module, os.getcwd(), key_pool=True)
+        pool = native.key_pool
+
+        before = pool.available()
+
+        if self.state == "absent":
+            removed = 0 if self.module.check_mode else pool.purge()
+
+            return dict(
+                failed = False,
+                changed = before > 0,
+                pool = pool.directory,
+                removed = removed if not self.module.check_mode else before,
+                available = pool.available()
+            )
+
+        if self.module.check_mode:
+            return dict(
+                failed = False,
+                changed = before < self.depth,
+                pool = pool.directory,
+                created = max(self.depth - before, 0),
+                available = before
+            )
+
+        created = pool.fill(self.depth, native.private_key_pem, self.workers)
+
+        return dict(
+            failed = False,
+            changed = created > 0,
+            pool = pool.directory,
+            created = created,
+            available = pool.available()
+        )
+
+
+# ===========================================
+# Module execution.
+#
+
+
+def main():
+
+    args = dict(
+        state=dict(
+            default="present",
+            choices=["present", "absent"]
+        ),
+        depth=dict(
+            required=False,
+            type="int",
+            default=10
+        ),
+        workers=dict(
+            required=False,
+            type="int",
+            default=4
+        ),
+        chdir=dict(
+            required=False
+        ),
+    )
+
+    module = AnsibleModule(
+        argument_spec=args,
+        supports_check_mode=True,
+    )
+
+    if not HAS_CRYPTOGRAPHY:
+        module.fail_json(msg=missing_required_lib("cryptography"))
+
+    o = OpenVPNKeyPool(module)
+    result = o.run()
+
+    module.log(msg=f"= result: {result}")
+
+    module.exit_json(**result)
+
+
+# import module snippets
+if __name__ == '__main__':
+    main()
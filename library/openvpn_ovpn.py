@@ -5,10 +5,10 @@
 
 from __future__ import absolute_import, division, print_function
 import os
-import sys
 import hashlib
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.openvpn_pem import PemError, extract_certs_as_strings
 
 
 class OpenVPNOvpn(object):
@@ -25,42 +25,32 @@ class OpenVPNOvpn(object):
 
         self.state = module.params.get("state")
         self.force = module.params.get("force", False)
+        self.paranoid = module.params.get("paranoid", False)
         self._username = module.params.get('username', None)
+        self._clients = module.params.get('clients', None)
+        self._template = module.params.get('template')
+        self._tls_crypt_v2_directory = module.params.get('tls_crypt_v2_directory', None)
         self._destination_directory = module.params.get('destination_directory', None)
 
         self._chdir = module.params.get('chdir', None)
         self._creates = module.params.get('creates', None)
 
         self._openvpn = module.get_bin_path('openvpn', True)
-        self._easyrsa = module.get_bin_path('easyrsa', True)
 
-        self.key_file = os.path.join("pki", "private", f"{self._username}.key")
-        self.crt_file = os.path.join("pki", "issued", f"{self._username}.crt")
-        self.dst_file = os.path.join(self._destination_directory, f"{self._username}.ovpn")
-
-        self.dst_checksum_file = os.path.join(self._destination_directory, f".{self._username}.ovpn.sha256")
+        # compiled once per module call, see __compiled_template()
+        self._compiled_template = None
 
     def run(self):
         """
           runner
         """
-        result = dict(
-            failed=False,
-            changed=False,
-            ansible_module_results="none"
-        )
-
         if self._chdir:
             os.chdir(self._chdir)
 
-        self.__validate_checksums()
+        if self._clients is not None:
+            return self.__run_bulk()
 
-        if self.force:
-            self.module.log(msg="force mode ...")
-            if os.path.exists(self.dst_file):
-                self.module.log(msg=f"remove {self.dst_file}")
-                os.remove(self.dst_file)
-                os.remove(self.dst_checksum_file)
+        files = self.__client_files(self._username)
 
         if self._creates:
             if os.path.exists(self._creates):
@@ -74,155 +64,323 @@ class OpenVPNOvpn(object):
                 )
 
         if self.state == "present":
-            return self.__create_ovpn_config()
-        if self.state == "absent":
-            return self.__remove_ovpn_config()
+            return self.__update_ovpn_config(files)
 
-        return result
+        return self.__remove_ovpn_config(files)
 
-    def __create_ovpn_config(self):
+    def __run_bulk(self):
         """
+          render the ovpn files for a whole list of clients
+
+          The template is compiled once. Every profile is rendered in memory and
+          only written, if its checksum differs from the stored one.
         """
-        if os.path.exists(self.dst_file):
-            return dict(
-                failed=False,
-                changed=False,
-                message=f"ovpn file {self.dst_file} exists."
-            )
+        results = {}
+        written = 0
 
-        if os.path.exists(self.key_file) and os.path.exists(self.crt_file):
-            """
-            """
-            from jinja2 import Template
+        for client in self._clients:
+            username = client.get("name")
+            state = client.get("state", "present")
 
-            with open(self.key_file, "r") as k_file:
-                k_data = k_file.read().rstrip('\n')
+            if not username:
+                continue
 
-            cert = self.__extract_certs_as_strings(self.crt_file)[0].rstrip('\n')
+            files = self.__client_files(username)
 
-            tpl = "/etc/openvpn/client.ovpn.template"
+            if state == "absent":
+                result = self.__remove_ovpn_config(files)
+            else:
+                result = self.__update_ovpn_config(files)
 
-            with open(tpl) as file_:
-                tm = Template(file_.read())
+            if state == "present" and result.get("changed"):
+                written += 1
 
-            d = tm.render(
-                key=k_data,
-                cert=cert
-            )
+            result["state"] = state
+            results[username] = result
 
-            with open(self.dst_file, "w") as fp:
-                fp.write(d)
+        changed = any(r.get("changed", False) for r in results.values())
+        failed = [k for k, v in results.items() if v.get("failed", False)]
 
-            self.__create_checksum_file(self.dst_file, self.dst_checksum_file)
+        if len(failed) > 0:
+            message = f"{len(failed)} of {len(results)} clients failed: {', '.join(failed)}"
+        else:
+            message = f"{len(results)} clients processed, {written} ovpn files written."
 
-            force_mode = "0600"
-            if isinstance(force_mode, str):
-                mode = int(force_mode, base=8)
+        return dict(
+            failed = len(failed) > 0,
+            changed = changed,
+            message = message,
+            clients = results
+        )
 
-            os.chmod(self.dst_file, mode)
+    def __client_files(self, username):
+        """
+          all files belonging to a client
+        """
+        files = dict(
+            name = username,
+            key_file = os.path.join("pki", "private", f"{username}.key"),
+            crt_file = os.path.join("pki", "issued", f"{username}.crt"),
+            dst_file = os.path.join(self._destination_directory, f"{username}.ovpn"),
+            dst_checksum_file = os.path.join(self._destination_directory, f".{username}.ovpn.sha256"),
+        )
+
+        if self._tls_crypt_v2_directory:
+            files["tls_crypt_v2_file"] = os.path.join(self._tls_crypt_v2_directory, f"{username}.key")
+
+        return files
+
+    def __update_ovpn_config(self, files):
+        """
+          render the ovpn file in memory and write it only when its content differs
+
+          The rendered profile is compared with the checksum in .${username}.ovpn.sha256,
+          a changed template therefore only rewrites the profiles whose bytes differ.
+          As long as the template, key, certificate and tls-crypt-v2 key are unchanged
+          (size, mtime and inode), nothing is read or rendered at all.
+          force rewrites the profile unconditionally.
+        """
+        dst_file = files.get("dst_file")
 
+        if not os.path.exists(files.get("key_file")) or not os.path.exists(files.get("crt_file")):
             return dict(
-                failed=False,
-                changed= True,
-                message = f"ovpn file successful written as {self.dst_file}."
+                failed=True,
+                changed= False,
+                message = f"can not find key or certfile for user {files.get('name')}."
             )
 
-        else:
+        if files.get("tls_crypt_v2_file") and not os.path.exists(files.get("tls_crypt_v2_file")):
             return dict(
                 failed=True,
                 changed= False,
-                message = f"can not find key or certfile for user {self._username}."
+                message = f"can not find the tls-crypt-v2 key for user {files.get('name')}."
+            )
+
+        inputs = self.__input_stats(files)
+
+        if not self.force and self.__inputs_unchanged(files, inputs):
+            return dict(
+                failed=False,
+                changed=False,
+                message=f"ovpn file {dst_file} is up to date."
+            )
+
+        try:
+            data = self.__render_ovpn_config(files)
+        except PemError as e:
+            return dict(
+                failed=True,
+                changed=False,
+                message=f"{e}",
+                pem_error=e.as_dict()
+            )
+
+        checksum = self.__checksum(data.rstrip('\n'))
+
+        if not self.force and self.__stored_checksum(files) == checksum:
+            # same profile, remember the inputs for the next run
+            self.__write_checksum_file(files.get("dst_checksum_file"), checksum, self.__stat(dst_file), inputs)
+
+            return dict(
+                failed=False,
+                changed=False,
+                message=f"ovpn file {dst_file} is up to date."
             )
 
-    def __remove_ovpn_config(self):
+        self.__write_ovpn_config(files, data, inputs)
+
+        return dict(
+            failed=False,
+            changed= True,
+            message = f"ovpn file successful written as {dst_file}."
+        )
+
+    def __compiled_template(self):
         """
         """
-        if os.path.exists(self.dst_file):
-            os.remove(self.dst_file)
+        if self._compiled_template is None:
+            from jinja2 import Template
 
-        if os.path.exists(self.dst_checksum_file):
-            os.remove(self.dst_checksum_file)
+            with open(self._template) as file_:
+                self._compiled_template = Template(file_.read())
+
+        return self._compiled_template
+
+    def __render_ovpn_config(self, files):
+        """
+        """
+        with open(files.get("key_file"), "r") as k_file:
+            k_data = k_file.read().rstrip('\n')
+
+        certs = extract_certs_as_strings(files.get("crt_file"))
+
+        if len(certs) == 0:
+            raise PemError(files.get("crt_file"), 0, "no certificate found")
+
+        cert = certs[0].rstrip('\n')
+
+        tls_crypt_v2 = None
+
+        if files.get("tls_crypt_v2_file"):
+            with open(files.get("tls_crypt_v2_file"), "r") as t_file:
+                tls_crypt_v2 = t_file.read().rstrip('\n')
+
+        return self.__compiled_template().render(
+            name=files.get("name"),
+            key=k_data,
+            cert=cert,
+            tls_crypt_v2=tls_crypt_v2
+        )
+
+    def __write_ovpn_config(self, files, data, inputs=None):
+        """
+          atomically replace the ovpn file (mode 0600) and its checksum file
+        """
+        dst_file = files.get("dst_file")
+        tmp_file = f"{dst_file}.{os.getpid()}.tmp"
+
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+
+        with os.fdopen(fd, "w") as fp:
+            fp.write(data)
+
+        os.chmod(tmp_file, 0o600)
+        os.replace(tmp_file, dst_file)
+
+        self.__write_checksum_file(
+            files.get("dst_checksum_file"),
+            self.__checksum(data.rstrip('\n')),
+            self.__stat(dst_file),
+            inputs
+        )
+
+    def __remove_ovpn_config(self, files):
+        """
+        """
+        dst_file = files.get("dst_file")
+        changed = False
+
+        for f in [dst_file, files.get("dst_checksum_file")]:
+            if os.path.exists(f):
+                os.remove(f)
+                changed = True
 
         if self._creates and os.path.exists(self._creates):
             os.remove(self._creates)
+            changed = True
 
         return dict(
             failed=False,
-            changed=True,
-            message=f"ovpn file {self.dst_file} successful removed."
+            changed=changed,
+            message=f"ovpn file {dst_file} successful removed."
         )
 
-    def __extract_certs_as_strings(self, cert_file):
-        """
-        """
-        certs = []
-        with open(cert_file) as whole_cert:
-            cert_started = False
-            content = ''
-            for line in whole_cert:
-                if '-----BEGIN CERTIFICATE-----' in line:
-                    if not cert_started:
-                        content += line
-                        cert_started = True
-                    else:
-                        print('Error, start cert found but already started')
-                        sys.exit(1)
-                elif '-----END CERTIFICATE-----' in line:
-                    if cert_started:
-                        content += line
-                        certs.append(content)
-                        content = ''
-                        cert_started = False
-                    else:
-                        print('Error, cert end found without start')
-                        sys.exit(1)
-                elif cert_started:
-                    content += line
-
-            if cert_started:
-                print('The file is corrupted')
-                sys.exit(1)
-
-        return certs
-
-    def __validate_checksums(self):
-        """
-        """
-        dst_checksum = None
-        dst_old_checksum = None
-
-        if os.path.exists(self.dst_file):
-            with open(self.dst_file, "r") as d:
-                dst_data = d.read().rstrip('\n')
-                dst_checksum = self.__checksum(dst_data)
-
-        if os.path.exists(self.dst_checksum_file):
-            with open(self.dst_checksum_file, "r") as f:
-                dst_old_checksum = f.readlines()[0]
-        else:
-            if dst_checksum is not None:
-                dst_old_checksum = self.__create_checksum_file(self.dst_file, self.dst_checksum_file)
+    def __inputs_unchanged(self, files, inputs):
+        """
+          the ovpn file and all files it is rendered from are unchanged
 
-        if dst_checksum is None or dst_old_checksum is None:
-            valid = False
-        else:
-            valid = (dst_checksum == dst_old_checksum)
+          the third line of the checksum file holds size, mtime_ns and inode of
+          the template, key, certificate and tls-crypt-v2 key of the last rendering.
+        """
+        dst_file = files.get("dst_file")
+        dst_checksum_file = files.get("dst_checksum_file")
+
+        if self.paranoid or not os.path.exists(dst_file) or not os.path.exists(dst_checksum_file):
+            return False
+
+        with open(dst_checksum_file, "r") as f:
+            lines = f.read().splitlines()
+
+        if len(lines) < 3:
+            return False
+
+        return lines[1].strip() == self.__stat(dst_file) and lines[2].strip() == inputs
+
+    def __input_stats(self, files):
+        """
+          size, mtime_ns and inode of all files the ovpn file is rendered from, as one line
+        """
+        inputs = [self._template, files.get("key_file"), files.get("crt_file"), files.get("tls_crypt_v2_file")]
+
+        return ";".join(f"{f}:{self.__stat(f)}" for f in inputs if f)
+
+    def __stored_checksum(self, files):
+        """
+          the stored checksum of the ovpn file, if the file still matches it
+
+          the checksum file contains the checksum of the ovpn file and
+          (in a second line) its size, mtime_ns and inode.
+          as long as these match, the ovpn file is not read again.
+        """
+        dst_file = files.get("dst_file")
+        dst_checksum_file = files.get("dst_checksum_file")
+
+        if not os.path.exists(dst_file):
+            return None
+
+        if not os.path.exists(dst_checksum_file):
+            return self.__create_checksum_file(dst_file, dst_checksum_file)
+
+        with open(dst_checksum_file, "r") as f:
+            lines = f.read().splitlines()
 
-        return valid
+        dst_old_checksum = lines[0].strip() if len(lines) > 0 else None
+        dst_old_stat = lines[1].strip() if len(lines) > 1 else None
+
+        if not self.paranoid and dst_old_stat == self.__stat(dst_file):
+            return dst_old_checksum
+
+        with open(dst_file, "r") as d:
+            dst_checksum = self.__checksum(d.read().rstrip('\n'))
+
+        if dst_checksum != dst_old_checksum:
+            return None
+
+        # same content, refresh the stored file attributes
+        self.__write_checksum_file(dst_checksum_file, dst_checksum, self.__stat(dst_file))
+
+        return dst_checksum
 
     def __create_checksum_file(self, filename, checksumfile):
         """
         """
+        _checksum = None
+
         if os.path.exists(filename):
             with open(filename, "r") as d:
                 _data = d.read().rstrip('\n')
                 _checksum = self.__checksum(_data)
 
-            with open(checksumfile, "w") as f:
-                f.write(_checksum)
+            self.__write_checksum_file(checksumfile, _checksum, self.__stat(filename))
 
         return _checksum
 
+    def __write_checksum_file(self, checksumfile, checksum, stat, inputs=None):
+        """
+          atomically replace the checksum file (tmp file + rename)
+        """
+        tmp_file = f"{checksumfile}.{os.getpid()}.tmp"
+
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+
+        with os.fdopen(fd, "w") as f:
+            f.write(f"{checksum}\n{stat}\n")
+
+            if inputs:
+                f.write(f"{inputs}\n")
+
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_file, checksumfile)
+
+    def __stat(self, filename):
+        """
+          size, mtime_ns and inode of a file as one line
+        """
+        st = os.stat(filename)
+        return f"{st.st_size} {st.st_mtime_ns} {st.st_ino}"
+
     def __checksum(self, plaintext):
         """
         """
@@ -250,8 +408,27 @@ def main():
                 default=False,
                 type="bool"
             ),
+            paranoid=dict(
+                required=False,
+                default=False,
+                type="bool"
+            ),
             username=dict(
-                required=True,
+                required=False,
+                type="str"
+            ),
+            clients=dict(
+                required=False,
+                type="list",
+                elements="dict"
+            ),
+            template=dict(
+                required=False,
+                type="str",
+                default="/etc/openvpn/client.ovpn.template"
+            ),
+            tls_crypt_v2_directory=dict(
+                required=False,
                 type="str"
             ),
             destination_directory=dict(
@@ -265,6 +442,12 @@ def main():
                 required=False
             ),
         ),
+        mutually_exclusive=[
+            ["username", "clients"],
+        ],
+        required_one_of=[
+            ["username", "clients"],
+        ],
         supports_check_mode=False,
     )
 
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+import os
+from pathlib import Path
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.openvpn_pki_index import EasyRsaIndex, parse_asn1_time
+
+
+class OpenVPNPkiInfo(object):
+    """
+      answers bulk queries against the easyrsa certificate database (pki/index.txt)
+    """
+    module = None
+
+    def __init__(self, module):
+        """
+        """
+        self.module = module
+
+        self.pki_dir = module.params.get('pki_dir')
+        self.names = module.params.get('names')
+        self.expire_in_days = module.params.get('expire_in_days')
+        self.list_valid = module.params.get('list_valid')
+        self.list_revoked = module.params.get('list_revoked')
+        self.cache = module.params.get('cache')
+
+        self.cache_directory = f"{Path.home()}/.ansible/cache/openvpn"
+
+    def run(self):
+        """
+        """
+        index = EasyRsaIndex(self.pki_dir, self.cache_directory if self.cache else None)
+
+        if not os.path.exists(index.index_file):
+            self.module.fail_json(msg=f"The certificate database {index.index_file} does not exist.")
+
+        index.load()
+
+        valid = index.valid()
+        revoked = index.revoked()
+        expired = index.expired()
+
+        self._expired_serials = set(e.get("serial") for e in expired)
+
+        result = dict(
+            failed = False,
+            changed = False,
+            summary = dict(
+                valid = len(valid),
+                revoked = len(revoked),
+                expired = len(expired),
+            ),
+            index = index.parse_stats
+        )
+
+        if self.list_valid:
+            result["valid"] = [self.__entry(e) for e in valid]
+
+        if self.list_revoked:
+            result["revoked"] = [self.__entry(e) for e in revoked]
+
+        if self.expire_in_days is not None:
+            result["expiring"] = [self.__entry(e) for e in index.expiring(self.expire_in_days)]
+
+        if self.names:
+            certificates = dict(
+                (name, self.__entry(e) if e else None) for name, e in index.lookup(self.names).items()
+            )
+
+            result["certificates"] = certificates
+            result["missing"] = [
+                name for name, e in certificates.items()
+                if e is None or e.get("status") != "valid"
+            ]
+
+        return result
+
+    def __entry(self, entry):
+        """
+          translate an index entry into a readable result
+        """
+        status = dict(V="valid", R="revoked", E="expired").get(entry.get("status"), "unknown")
+        expires = parse_asn1_time(entry.get("expires"))
+        revoked = parse_asn1_time(entry.get("revoked"))
+
+        if status == "valid" and entry.get("serial") in self._expired_serials:
+            status = "expired"
+
+        return dict(
+            name = entry.get("name"),
+            serial = entry.get("serial"),
+            status = status,
+            expires = expires.isoformat() if expires else None,
+            revoked = revoked.isoformat() if revoked else None,
+            reason = entry.get("reason"),
+            subject = entry.get("subject"),
+        )
+
+
+# ===========================================
+# Module execution.
+#
+
+
+def main():
+
+    args = dict(
+        pki_dir=dict(
+            required=False,
+            type="str",
+            default="/etc/easy-rsa/pki"
+        ),
+        names=dict(
+            required=False,
+            type="list",
+            elements="str",
+            default=[]
+        ),
+        expire_in_days=dict(
+            required=False,
+            type="int"
+        ),
+        list_valid=dict(
+            required=False,
+            type="bool",
+            default=False
+        ),
+        list_revoked=dict(
+            required=False,
+            type="bool",
+            default=False
+        ),
+        cache=dict(
+            required=False,
+            type="bool",
+            default=True
+        ),
+    )
+
+    module = AnsibleModule(
+        argument_spec=args,
+        supports_check_mode=True,
+    )
+
+    o = OpenVPNPkiInfo(module)
+    result = o.run()
+
+    module.log(msg=f"= result: {result}")
+
+    module.exit_json(**result)
+
+
+# import module snippets
+if __name__ == '__main__':
+    main()
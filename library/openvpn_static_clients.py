@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+import base64
+import glob
+import grp
+import hashlib
+import io
+import os
+import pwd
+import shutil
+import tarfile
+
+from ansible.module_utils.basic import AnsibleModule
+
+
+class OpenVPNStaticClients(object):
+    """
+      installs the certificate bundles and configurations of all static clients of a host
+
+      state: status   returns the clients whose installed certificate differs from 'issued'
+      state: present  installs the given bundles and configurations
+
+      clients with 'state: absent' are stopped, disabled and removed together with their systemd override.
+    """
+    module = None
+
+    def __init__(self, module):
+        """
+        """
+        self.module = module
+
+        self.state = module.params.get("state")
+        self.clients = module.params.get("clients")
+        self.issued = module.params.get("issued") or {}
+        self.bundles = module.params.get("bundles") or {}
+        self.configs = module.params.get("configs") or {}
+        self.overrides = module.params.get("overrides") or {}
+        self.openvpn_directory = module.params.get("openvpn_directory")
+        self.owner = module.params.get("owner")
+        self.group = module.params.get("group")
+        self.service_manager = module.params.get("service_manager")
+        self.openrc_links = module.params.get("openrc_links")
+        self.systemd_directory = module.params.get("systemd_directory")
+        self.tls_crypt_v2 = module.params.get("tls_crypt_v2")
+
+    def run(self):
+        """
+        """
+        if self.state == "status":
+            return self.__status()
+
+        results = dict()
+
+        for client in self.clients:
+            name = client.get("name")
+
+            if client.get("state", "present") == "absent":
+                results[name] = self.__remove_client(name)
+            else:
+                results[name] = self.__install_client(name)
+
+        failed = [k for k, v in results.items() if v.get("failed")]
+        restart = [v.get("service") for v in results.values() if v.get("restart")]
+
+        if failed:
+            message = f"{len(failed)} of {len(results)} clients failed: {', '.join(failed)}"
+        else:
+            message = f"{len(results)} clients processed, {len(restart)} changed."
+
+        return dict(
+            failed = len(failed) > 0,
+            changed = any(v.get("changed") for v in results.values()),
+            clients = results,
+            restart = restart,
+            daemon_reload = any(v.get("override") for v in results.values()),
+            services = [v.get("service") for v in results.values() if v.get("state") == "present"],
+            message = message
+        )
+
+    def __status(self):
+        """
+          installed certificate checksums and the list of outdated clients
+        """
+        status = dict()
+        outdated = []
+
+        for client in self.clients:
+            name = client.get("name")
+
+            if client.get("state", "present") == "absent":
+                continue
+
+            checksum = self.__checksum(os.path.join(self.__key_directory(name), f"{name}.crt"))
+            tls_crypt_v2 = os.path.isfile(os.path.join(self.__key_directory(name), "tls-crypt-v2.key"))
+
+            status[name] = dict(
+                checksum = checksum,
+                tls_crypt_v2 = tls_crypt_v2
+            )
+
+            if checksum is None or checksum != self.issued.get(name) or (self.tls_crypt_v2 and not tls_crypt_v2):
+                outdated.append(name)
+
+        return dict(
+            failed = False,
+            changed = False,
+            status = status,
+            outdated = outdated
+        )
+
+    def __install_client(self, name):
+        """
+        """
+        result = dict(
+            failed = False,
+            changed = False,
+            state = "present",
+            service = self.__service_name(name),
+            bundle = "unchanged",
+            config = False,
+            override = False,
+            restart = False
+        )
+
+        key_directory = self.__key_directory(name)
+
+        if not os.path.isdir(key_directory):
+            os.makedirs(key_directory, mode=0o755)
+            self.__chown(key_directory)
+            result["changed"] = True
+
+        bundle = self.bundles.get(name)
+
+        if bundle:
+            try:
+                self.__extract_bundle(name, bundle)
+            except (tarfile.TarError, ValueError, IOError, OSError) as e:
+                result.update(failed=True, msg=f"can not install the certificate bundle: {e}")
+                return result
+
+            result.update(changed=True, bundle="installed", restart=True)
+
+        config = self.configs.get(name)
+
+        if config is not None:
+            config_file = os.path.join(self.openvpn_directory, "client", f"{name}.conf")
+
+            if self.__write_file(config_file, config, 0o640):
+                result.update(changed=True, config=True, restart=True)
+
+        override = self.overrides.get(name)
+
+        if override is not None and self.service_manager == "systemd":
+            override_file = os.path.join(self.systemd_directory, f"{result['service']}.service.d", "override.conf")
+
+            if self.__write_file(override_file, override, 0o444, owner=False):
+                result.update(changed=True, override=True, restart=True)
+
+        if self.openrc_links and self.service_manager == "openrc":
+            links = [
+                ("/etc/init.d/openvpn", f"/etc/init.d/openvpn.{name}"),
+                (os.path.join(self.openvpn_directory, "client", f"{name}.conf"), os.path.join(self.openvpn_directory, f"{name}.conf")),
+            ]
+
+            for src, dest in links:
+                if self.__link(src, dest):
+                    result.update(changed=True)
+
+        return result
+
+    def __remove_client(self, name):
+        """
+          stop and disable the service of a client, remove its certificates, configuration and systemd override
+        """
+        result = dict(
+            failed = False,
+            changed = False,
+            state = "absent",
+            service = self.__service_name(name),
+            stopped = False,
+            disabled = False,
+            override = False
+        )
+
+        try:
+            stopped, disabled = self.__disable_service(result["service"])
+        except RuntimeError as e:
+            result.update(failed=True, msg=f"can not stop the service: {e}")
+            return result
+
+        result.update(stopped=stopped, disabled=disabled, changed=stopped or disabled)
+
+        override_directory = os.path.join(self.systemd_directory, f"{result['service']}.service.d")
+
+        if self.service_manager == "systemd" and os.path.isdir(override_directory):
+            shutil.rmtree(override_directory)
+            result.update(changed=True, override=True)
+
+        key_directory = self.__key_directory(name)
+
+        if os.path.isdir(key_directory):
+            shutil.rmtree(key_directory)
+            result.update(changed=True)
+
+        for f in [
+            os.path.join(self.openvpn_directory, "client", f"{name}.conf"),
+            os.path.join(self.openvpn_directory, f"{name}.conf"),
+            f"/etc/init.d/openvpn.{name}",
+        ]:
+            if os.path.lexists(f):
+                os.remove(f)
+                result.update(changed=True)
+
+        return result
+
+    def __disable_service(self, service):
+        """
+          stop and disable a service, before its init script or configuration is removed
+
+          returns (stopped, disabled)
+        """
+        stopped = False
+        disabled = False
+
+        if self.service_manager == "systemd":
+            systemctl = self.module.get_bin_path("systemctl", False)
+
+            if not systemctl:
+                return stopped, disabled
+
+            rc, _, _ = self.module.run_command([systemctl, "is-active", "--quiet", service])
+            stopped = rc == 0
+
+            rc, _, _ = self.module.run_command([systemctl, "is-enabled", "--quiet", service])
+            disabled = rc == 0
+
+            if stopped or disabled:
+                self.__run([systemctl, "disable", "--now", service])
+
+        elif self.service_manager == "openrc":
+            if not os.path.exists(f"/etc/init.d/{service}"):
+                return stopped, disabled
+
+            rc, _, _ = self.module.run_command(["rc-service", service, "status"])
+
+            if rc == 0:
+                self.__run(["rc-service", service, "stop"])
+                stopped = True
+
+            for runlevel in sorted(glob.glob(f"/etc/runlevels/*/{service}")):
+                self.__run(["rc-update", "del", service, os.path.basename(os.path.dirname(runlevel))])
+                disabled = True
+
+        return stopped, disabled
+
+    def __run(self, commands):
+        """
+        """
+        rc, out, err = self.module.run_command(commands)
+
+        if rc != 0:
+            raise RuntimeError(f"'{' '.join(commands)}' failed: {(err or out).strip()}")
+
+    def __extract_bundle(self, name, bundle):
+        """
+          install the files of a bundle (tar.gz, base64 encoded) into keys/${name}
+
+          only regular files of the directory '${name}/' are used, private keys get mode 0600.
+        """
+        key_directory = self.__key_directory(name)
+
+        with tarfile.open(fileobj=io.BytesIO(base64.b64decode(bundle)), mode="r:*") as tar:
+            members = [m for m in tar.getmembers() if m.isfile()]
+
+            for member in members:
+                parts = os.path.normpath(member.name).split(os.sep)
+
+                if len(parts) != 2 or parts[0] != name or parts[1] in ["", ".", ".."]:
+                    raise ValueError(f"unexpected file '{member.name}' in the bundle of {name}")
+
+            for member in members:
+                filename = os.path.basename(member.name)
+                mode = 0o600 if filename.endswith(".key") else 0o644
+
+                data = tar.extractfile(member).read()
+
+                self.__write_file(os.path.join(key_directory, filename), data, mode)
+
+    def __write_file(self, filename, data, mode, owner=True):
+        """
+          atomically replace a file, when its content differs
+
+          returns True, when the file was written
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+
+        try:
+            with open(filename, "rb") as f:
+                if f.read() == data:
+                    os.chmod(filename, mode)
+                    return False
+        except (IOError, OSError):
+            pass
+
+        directory = os.path.dirname(filename)
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory, mode=0o755)
+
+        tmp_file = os.path.join(directory, f".{os.path.basename(filename)}.{os.getpid()}.tmp")
+
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.chmod(tmp_file, mode)
+
+        if owner:
+            self.__chown(tmp_file)
+
+        os.replace(tmp_file, filename)
+
+        return True
+
+    def __link(self, src, dest):
+        """
+          returns True, when the link was (re)created
+        """
+        if os.path.islink(dest) and os.readlink(dest) == src:
+            return False
+
+        if os.path.lexists(dest):
+            os.remove(dest)
+
+        os.symlink(src, dest)
+
+        return True
+
+    def __chown(self, filename):
+        """
+        """
+        uid = pwd.getpwnam(self.owner).pw_uid if self.owner else -1
+        gid = grp.getgrnam(self.group).gr_gid if self.group else -1
+
+        os.chown(filename, uid, gid)
+
+    def __key_directory(self, name):
+        """
+        """
+        return os.path.join(self.openvpn_directory, "keys", name)
+
+    def __service_name(self, name):
+        """
+        """
+        if self.service_manager == "openrc":
+            return f"openvpn.{name}"
+
+        return f"openvpn-client@{name}"
+
+    def __checksum(self, filename):
+        """
+        """
+        try:
+            with open(filename, "rb") as f:
+                return hashlib.sha256(f.read()).hexdigest()
+        except (IOError, OSError):
+            return None
+
+
+# ===========================================
+# Module execution.
+#
+
+
+def main():
+
+    args = dict(
+        state=dict(
+            default="present",
+            choices=["present", "status"]
+        ),
+        clients=dict(
+            required=True,
+            type="list",
+            elements="dict"
+        ),
+        issued=dict(
+            required=False,
+            type="dict"
+        ),
+        bundles=dict(
+            required=False,
+            type="dict",
+            no_log=True
+        ),
+        configs=dict(
+            required=False,
+            type="dict"
+        ),
+        overrides=dict(
+            required=False,
+            type="dict"
+        ),
+        openvpn_directory=dict(
+            required=False,
+            type="str",
+            default="/etc/openvpn"
+        ),
+        owner=dict(
+            required=False,
+            type="str"
+        ),
+        group=dict(
+            required=False,
+            type="str"
+        ),
+        service_manager=dict(
+            required=False,
+            type="str",
+            default="systemd"
+        ),
+        systemd_directory=dict(
+            required=False,
+            type="str",
+            default="/etc/systemd/system"
+        ),
+        openrc_links=dict(
+            required=False,
+            type="bool",
+            default=False
+        ),
+        tls_crypt_v2=dict(
+            required=False,
+            type="bool",
+            default=False
+        ),
+    )
+
+    module = AnsibleModule(
+        argument_spec=args,
+        supports_check_mode=False,
+    )
+
+    o = OpenVPNStaticClients(module)
+    result = o.run()
+
+    module.log(msg=f"= result: {result}")
+
+    module.exit_json(**result)
+
+
+# import module snippets
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+import os
+
+from ansible.module_utils.basic import AnsibleModule
+
+
+PROC_SYS = "/proc/sys"
+PROC_SNMP = "/proc/net/snmp"
+
+# the former hard-coded buffer size is the lower limit
+MIN_BUFFER = 393216
+MAX_BUFFER = 64 * 1024 * 1024
+
+MIN_BACKLOG = 1000
+MIN_TXQUEUELEN = 500
+MAX_TXQUEUELEN = 10000
+
+# average size of a data channel packet
+PACKET_SIZE = 1400
+
+
+def round_up(value, step):
+    """
+    """
+    return int((value + step - 1) // step * step)
+
+
+def next_power_of_2(value):
+    """
+    """
+    return 1 << max(int(value) - 1, 0).bit_length()
+
+
+class OpenVPNTuning(object):
+    """
+      socket buffers and kernel network settings for the configured link
+
+        buffer             = 2 * bandwidth * rtt (bandwidth-delay product), 384 KiB .. 64 MiB
+        net.core.[rw]mem_max >= buffer (otherwise the kernel silently caps sndbuf/rcvbuf)
+        netdev_max_backlog >= packets of 10 ms at link speed
+        net.ipv4.udp_mem   >= the buffers of all openvpn sockets
+        txqueuelen         = packets of 2 ms at link speed
+
+      Kernel settings are only raised, never lowered.
+      The effective values are read back from /proc/sys together with the UDP error counters.
+    """
+    module = None
+
+    def __init__(self, module):
+        """
+        """
+        self.module = module
+
+        self.bandwidth = module.params.get("bandwidth")
+        self.rtt = module.params.get("rtt")
+        self.sockets = module.params.get("sockets")
+        self.txqueuelen = module.params.get("txqueuelen")
+
+    def run(self):
+        """
+        """
+        pps = self.bandwidth * 1000 * 1000 / 8 / PACKET_SIZE
+
+        bdp = self.bandwidth * 1000 * 1000 / 8 * self.rtt / 1000
+        buffer = min(max(round_up(2 * bdp, 4096), MIN_BUFFER), MAX_BUFFER)
+
+        if str(self.txqueuelen) == "auto":
+            txqueuelen = min(max(next_power_of_2(pps * 0.002), MIN_TXQUEUELEN), MAX_TXQUEUELEN)
+        else:
+            txqueuelen = int(self.txqueuelen)
+
+        current = dict(
+            (key, self.__read_sysctl(key))
+            for key in ["net.core.rmem_max", "net.core.wmem_max", "net.core.netdev_max_backlog", "net.ipv4.udp_mem"]
+        )
+
+        targets = dict()
+        targets["net.core.rmem_max"] = buffer
+        targets["net.core.wmem_max"] = buffer
+        targets["net.core.netdev_max_backlog"] = max(MIN_BACKLOG, next_power_of_2(pps / 100))
+
+        sysctl = dict()
+
+        for key, value in targets.items():
+            if current.get(key) is None or int(current.get(key)) < value:
+                sysctl[key] = str(value)
+
+        udp_mem = self.__udp_mem(current.get("net.ipv4.udp_mem"), buffer)
+
+        if udp_mem:
+            sysctl["net.ipv4.udp_mem"] = udp_mem
+
+        effective = dict(
+            sndbuf = min(buffer, int(current.get("net.core.wmem_max") or 0)),
+            rcvbuf = min(buffer, int(current.get("net.core.rmem_max") or 0)),
+        )
+
+        udp = self.__udp_counters()
+
+        if sysctl:
+            message = f"the kernel limits the socket buffers to {effective.get('sndbuf')} / {effective.get('rcvbuf')} bytes, {len(sysctl)} settings must be raised."
+        else:
+            message = f"socket buffers of {buffer} bytes are effective."
+
+        if udp.get("RcvbufErrors") or udp.get("SndbufErrors"):
+            message += f" dropped UDP packets: receive buffer {udp.get('RcvbufErrors')}, send buffer {udp.get('SndbufErrors')}."
+
+        return dict(
+            failed = False,
+            changed = False,
+            buffers = dict(sndbuf = buffer, rcvbuf = buffer),
+            txqueuelen = txqueuelen,
+            sysctl = sysctl,
+            current = current,
+            effective = effective,
+            verified = len(sysctl) == 0,
+            udp = udp,
+            message = message
+        )
+
+    def __udp_mem(self, current, buffer):
+        """
+          'min pressure max' in pages, pressure and max are raised for the buffers of all sockets
+          (send and receive buffer, the kernel doubles the requested size)
+        """
+        required = int(self.sockets * 2 * 2 * buffer / os.sysconf("SC_PAGESIZE"))
+
+        try:
+            low, pressure, high = [int(x) for x in current.split()]
+        except (AttributeError, ValueError):
+            return None
+
+        if pressure >= required and high >= 2 * required:
+            return None
+
+        return f"{low} {max(pressure, required)} {max(high, 2 * required)}"
+
+    def __read_sysctl(self, key):
+        """
+        """
+        filename = os.path.join(PROC_SYS, key.replace(".", "/"))
+
+        try:
+            with open(filename, "r") as f:
+                return " ".join(f.read().split())
+        except (IOError, OSError) as e:
+            self.module.log(msg=f"can not read {filename}: {e}")
+            return None
+
+    def __udp_counters(self):
+        """
+          the 'Udp:' counters of /proc/net/snmp (InErrors, RcvbufErrors, SndbufErrors, ...)
+        """
+        try:
+            with open(PROC_SNMP, "r") as f:
+                lines = [line.split() for line in f if line.startswith("Udp:")]
+        except (IOError, OSError) as e:
+            self.module.log(msg=f"can not read {PROC_SNMP}: {e}")
+            return dict()
+
+        if len(lines) < 2:
+            return dict()
+
+        return dict((k, int(v)) for k, v in zip(lines[0][1:], lines[1][1:]))
+
+
+# ===========================================
+# Module execution.
+#
+
+
+def main():
+
+    args = dict(
+        bandwidth=dict(
+            required=False,
+            type="int",
+            default=1000
+        ),
+        rtt=dict(
+            required=False,
+            type="int",
+            default=50
+        ),
+        sockets=dict(
+            required=False,
+            type="int",
+            default=1
+        ),
+        txqueuelen=dict(
+            required=False,
+            type="str",
+            default="auto"
+        ),
+    )
+
+    module = AnsibleModule(
+        argument_spec=args,
+        supports_check_mode=True,
+    )
+
+    o = OpenVPNTuning(module)
+    result = o.run()
+
+    module.log(msg=f"= result: {result}")
+
+    module.exit_json(**result)
+
+
+# import module snippets
+if __name__ == '__main__':
+    main()
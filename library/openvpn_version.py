@@ -4,9 +4,10 @@
 # (c) 2023, Bodo Schulz <bodo@boone-schulz.de>
 
 from __future__ import absolute_import, division, print_function
-import re
+from pathlib import Path
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.openvpn_version import OpenVPNVersion
 
 
 class OpenVPN(object):
@@ -19,56 +20,31 @@ class OpenVPN(object):
         """
         self.module = module
 
+        self.force = module.params.get("force")
+        self.cache_directory = f"{Path.home()}/.ansible/cache/openvpn"
+
         self._openvpn = module.get_bin_path('openvpn', True)
 
     def run(self):
         """
           runner
-        """
-        _failed = True
-        _version = "unknown"
-        _stdout = ""
-        _stdout_lines = []
-
-        args = []
-
-        args.append(self._openvpn)
-        args.append("--version")
 
-        rc, out = self._exec(args)
-
-        if "OpenVPN" in out:
-            pattern = re.compile(r"OpenVPN (?P<version>[0-9]+\.[0-9]+\.[0-9]+).*", re.MULTILINE)
-            found = re.search(pattern, out.rstrip())
-
-            if found:
-                _version = found.group('version')
-                _failed = False
-        else:
-            _failed = True
+          'openvpn --version' and 'openvpn --show-ciphers' are only executed,
+          when the binary has changed since the last run (or with force).
+        """
+        info, cached = OpenVPNVersion(self.module, self._openvpn, self.cache_directory).info(self.force)
 
-        _stdout = f"{out.rstrip()}"
-        _stdout_lines = _stdout.split("\n")
+        _stdout = info.get("stdout", "")
 
         return dict(
             stdout = _stdout,
-            stdout_lines = _stdout_lines,
-            failed = _failed,
-            version = _version
+            stdout_lines = _stdout.split("\n"),
+            failed = "version" not in info,
+            cached = cached,
+            version = info.get("version", "unknown"),
+            capabilities = info.get("capabilities", {})
         )
 
-    def _exec(self, commands):
-        """
-        """
-        rc, out, err = self.module.run_command(commands, check_rc=False)
-
-        if int(rc) != 0:
-            self.module.log(msg=f"  rc : '{rc}'")
-            self.module.log(msg=f"  out: '{out}'")
-            self.module.log(msg=f"  err: '{err}'")
-
-        return rc, out
-
 
 # ===========================================
 # Module execution.
@@ -77,7 +53,13 @@ class OpenVPN(object):
 
 def main():
 
-    args = dict()
+    args = dict(
+        force=dict(
+            required=False,
+            default=False,
+            type="bool"
+        ),
+    )
 
     module = AnsibleModule(
         argument_spec=args,
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+import hashlib
+import json
+import os
+
+
+class ChecksumManifest(object):
+    """
+      all checksums of a PKI in one file
+
+        {
+          "version": 1,
+          "pki_dir": "/etc/easy-rsa/pki",
+          "migrated": true,
+          "entries": {
+            "${username}": {
+              "req": {"checksum": "...", "size": 0, "mtime_ns": 0, "inode": 0},
+              "key": {...},
+              "crt": {...}
+            }
+          }
+        }
+
+      The manifest is loaded once and written back (atomically) with save(),
+      only if an entry was changed.
+
+      Besides the checksum every record stores size, mtime_ns and inode of the file.
+      As long as they match, the file is not read again.
+      With paranoid=True every file is hashed.
+
+      The former checksum files (${cache_directory}/${username}/{req,key,crt}.sha256)
+      are imported once with migrate().
+    """
+
+    def __init__(self, cache_directory, pki_dir, paranoid=False, namespace="manifest"):
+        """
+          namespace separates the manifests of different consumers of the same directory,
+          e.g. the read-only checksums of openvpn_facts from the change detection of the
+          client certificates.
+        """
+        self.pki_dir = os.path.realpath(pki_dir)
+        self.paranoid = paranoid
+
+        _id = hashlib.sha256(self.pki_dir.encode()).hexdigest()[:16]
+        self.manifest_file = os.path.join(cache_directory, namespace, f"{_id}.json")
+
+        self.entries = {}
+        self.migrated = False
+        self._dirty = False
+
+    def load(self):
+        """
+        """
+        try:
+            with open(self.manifest_file, "r") as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            data = {}
+
+        self.entries = data.get("entries", {})
+        self.migrated = data.get("migrated", False)
+        self._dirty = False
+
+        return self
+
+    def migrate(self, legacy_directory, kinds=("req", "key", "crt")):
+        """
+          import the per-user checksum files of former versions
+
+          An imported record has no size, mtime_ns and inode, so the next validate()
+          hashes the file and compares it with the former checksum.
+          Users which already have a record keep it.
+          The manifest is saved before the checksum files are removed.
+          Returns the names of the imported users.
+        """
+        if self.migrated:
+            return []
+
+        imported = []
+        legacy = []
+
+        try:
+            names = sorted(os.listdir(legacy_directory))
+        except OSError:
+            names = []
+
+        for name in names:
+            directory = os.path.join(legacy_directory, name)
+
+            for kind in kinds:
+                checksum_file = os.path.join(directory, f"{kind}.sha256")
+
+                if not os.path.isfile(checksum_file):
+                    continue
+
+                legacy.append(checksum_file)
+                checksum = self.__read_checksum_file(checksum_file)
+
+                if checksum and self.get(name, kind) is None:
+                    self.entries.setdefault(name, {})[kind] = dict(checksum = checksum)
+
+                    if name not in imported:
+                        imported.append(name)
+
+        self.migrated = True
+        self._dirty = True
+        self.save()
+
+        for checksum_file in legacy:
+            os.remove(checksum_file)
+
+            try:
+                os.rmdir(os.path.dirname(checksum_file))
+            except OSError:
+                pass
+
+        return imported
+
+    def get(self, name, kind):
+        """
+          the stored record of a file or None
+        """
+        return self.entries.get(name, {}).get(kind)
+
+    def set(self, name, kind, filename):
+        """
+          (re)calculate and store the checksum of a file
+        """
+        record = dict(
+            checksum = self.checksum_from_file(filename),
+            **self.__stat(os.stat(filename))
+        )
+
+        self.entries.setdefault(name, {})[kind] = record
+        self._dirty = True
+
+        return record
+
+    def remove(self, name):
+        """
+        """
+        if name in self.entries:
+            del self.entries[name]
+            self._dirty = True
+
+    def validate(self, name, kind, filename):
+        """
+          returns True, when the file differs from the stored checksum
+
+          a file without a stored checksum is recorded and counts as unchanged,
+          a missing file counts as changed
+        """
+        try:
+            st = os.stat(filename)
+        except OSError:
+            return True
+
+        record = self.get(name, kind)
+
+        if record is None:
+            self.set(name, kind, filename)
+            return False
+
+        stat = self.__stat(st)
+
+        if not self.paranoid and all(record.get(k) == v for k, v in stat.items()):
+            return False
+
+        if record.get("checksum") != self.checksum_from_file(filename):
+            return True
+
+        # same content, only the metadata has changed (touch, copy, restore ...)
+        record.update(stat)
+        self._dirty = True
+
+        return False
+
+    def save(self):
+        """
+          atomically replace the manifest file
+        """
+        if not self._dirty:
+            return False
+
+        directory = os.path.dirname(self.manifest_file)
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory, mode=0o700)
+
+        tmp_file = f"{self.manifest_file}.{os.getpid()}.tmp"
+
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+
+        with os.fdopen(fd, "w") as f:
+            json.dump(
+                dict(
+                    version = 1,
+                    pki_dir = self.pki_dir,
+                    migrated = self.migrated,
+                    entries = self.entries
+                ),
+                f,
+                separators=(",", ":")
+            )
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_file, self.manifest_file)
+        self._dirty = False
+
+        return True
+
+    def __read_checksum_file(self, filename):
+        """
+          the sha256 checksum in the first line of a checksum file or None
+        """
+        try:
+            with open(filename, "r") as f:
+                value = (f.readline().split() or [""])[0].lower()
+        except (IOError, OSError, UnicodeDecodeError):
+            return None
+
+        if len(value) != 64 or any(c not in "0123456789abcdef" for c in value):
+            return None
+
+        return value
+
+    def __stat(self, st):
+        """
+        """
+        return dict(
+            size = st.st_size,
+            mtime_ns = st.st_mtime_ns,
+            inode = st.st_ino
+        )
+
+    @staticmethod
+    def checksum_from_file(filename):
+        """
+        """
+        _hash = hashlib.sha256()
+
+        with open(filename, "rb") as f:
+            for chunk in iter(lambda: f.read(65536), b""):
+                _hash.update(chunk)
+
+        return _hash.hexdigest()
@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+import os
+import re
+import secrets
+import threading
+from datetime import datetime, timedelta, timezone
+
+from ansible.module_utils.openvpn_key_pool import KeyPool
+from ansible.module_utils.openvpn_pem import PemError, load_certificates
+from ansible.module_utils.openvpn_pki_index import (
+    EasyRsaIndex, format_asn1_time, format_serial, parse_asn1_time
+)
+
+try:
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, ed448, ed25519, rsa
+    from cryptography.x509.oid import ExtendedKeyUsageOID, NameOID
+except ImportError:
+    HAS_CRYPTOGRAPHY = False
+else:
+    HAS_CRYPTOGRAPHY = True
+
+
+EASYRSA_DEFAULTS = dict(
+    EASYRSA_ALGO = "rsa",
+    EASYRSA_KEY_SIZE = "2048",
+    EASYRSA_CURVE = "secp384r1",
+    EASYRSA_DIGEST = "sha256",
+    EASYRSA_CERT_EXPIRE = "825",
+    EASYRSA_CRL_DAYS = "180",
+    EASYRSA_DN = "cn_only",
+)
+
+
+class EasyRsaNative(object):
+    """
+      in-process replacement for the easyrsa commands gen-req, sign-req, build-*-full,
+      revoke and gen-crl
+
+      All files are written into the easyrsa pki layout (index.txt, serial,
+      private/, reqs/, issued/, certs_by_serial/), so that the pki can still
+      be used with the easyrsa script.
+
+      Every public method returns a tuple (rc, message) like a call of easyrsa.
+    """
+
+    def __init__(self, module, easyrsa_directory=None, cache_directory=None, key_pool=False):
+        """
+          cache_directory is passed to EasyRsaIndex for the incremental index.txt parser,
+          with key_pool gen_req() takes the private keys from pki/keypool (see KeyPool)
+        """
+        self.module = module
+        self.easyrsa_directory = easyrsa_directory or os.getcwd()
+        self.pki_dir = os.path.join(self.easyrsa_directory, "pki")
+
+        self.settings = self.read_vars()
+        self.index = EasyRsaIndex(self.pki_dir, cache_directory)
+        self.key_pool = KeyPool(self.pki_dir, KeyPool.algo_id(self.settings)) if key_pool else None
+
+        self._ca_cert = None
+        self._ca_key = None
+        self._lock = threading.Lock()
+
+        # serials of index.txt, loaded with the first signature and extended in memory
+        self._serials = None
+
+    def read_vars(self):
+        """
+          read the 'set_var' definitions from the easyrsa vars file
+        """
+        settings = dict(EASYRSA_DEFAULTS)
+        vars_file = os.path.join(self.easyrsa_directory, "vars")
+
+        if os.path.exists(vars_file):
+            pattern = re.compile(r'^\s*set_var\s+(?P<key>EASYRSA_\w+)\s+"?(?P<value>[^"]*?)"?\s*$')
+
+            with open(vars_file, "r") as f:
+                for line in f:
+                    found = pattern.match(line)
+                    if found:
+                        settings[found.group("key")] = found.group("value")
+
+        return settings
+
+    def generate_private_key(self):
+        """
+          create a private key according to EASYRSA_ALGO
+        """
+        algo = self.settings.get("EASYRSA_ALGO")
+        curve = self.settings.get("EASYRSA_CURVE")
+
+        if algo == "ec":
+            curves = dict(
+                prime256v1 = ec.SECP256R1,
+                secp256r1 = ec.SECP256R1,
+                secp384r1 = ec.SECP384R1,
+                secp521r1 = ec.SECP521R1,
+                secp256k1 = ec.SECP256K1,
+            )
+            return ec.generate_private_key(curves.get(curve, ec.SECP384R1)())
+
+        if algo == "ed":
+            if curve == "ed448":
+                return ed448.Ed448PrivateKey.generate()
+            return ed25519.Ed25519PrivateKey.generate()
+
+        return rsa.generate_private_key(
+            public_exponent=65537,
+            key_size=int(self.settings.get("EASYRSA_KEY_SIZE"))
+        )
+
+    def private_key_pem(self, private_key=None):
+        """
+          a (new) private key as unencrypted PKCS8 PEM
+        """
+        if private_key is None:
+            private_key = self.generate_private_key()
+
+        return private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption()
+        )
+
+    def pooled_private_key(self):
+        """
+          a private key from the key pool or None, if the pool is disabled or empty
+        """
+        if self.key_pool is None:
+            return None
+
+        data = self.key_pool.take()
+
+        if data is None:
+            return None
+
+        return serialization.load_pem_private_key(data, password=None)
+
+    def gen_req(self, name, common_name=None, private_key=None):
+        """
+          easyrsa --batch gen-req ${name} nopass
+        """
+        key_file = os.path.join(self.pki_dir, "private", f"{name}.key")
+        req_file = os.path.join(self.pki_dir, "reqs", f"{name}.req")
+
+        for f in [key_file, req_file]:
+            if os.path.exists(f):
+                return 1, f"Request file already exists: {f}"
+
+        if private_key is None:
+            private_key = self.pooled_private_key() or self.generate_private_key()
+
+        csr = x509.CertificateSigningRequestBuilder().subject_name(
+            self.__subject(common_name or name)
+        ).sign(private_key, self.__digest(private_key))
+
+        self.__write_file(key_file, self.private_key_pem(private_key), 0o600)
+        self.__write_file(req_file, csr.public_bytes(serialization.Encoding.PEM), 0o600)
+
+        return 0, f"Keypair and certificate request completed: {req_file}"
+
+    def sign_req(self, name, cert_type="client"):
+        """
+          easyrsa --batch sign-req ${cert_type} ${name}
+        """
+        req_file = os.path.join(self.pki_dir, "reqs", f"{name}.req")
+        crt_file = os.path.join(self.pki_dir, "issued", f"{name}.crt")
+
+        if not os.path.exists(req_file):
+            return 1, f"No request found for the input: '{name}'"
+
+        if os.path.exists(crt_file):
+            return 1, f"Certificate already exists: {crt_file}"
+
+        rc, msg = self.__load_ca()
+
+        if rc != 0:
+            return rc, msg
+
+        with open(req_file, "rb") as f:
+            csr = x509.load_pem_x509_csr(f.read())
+
+        if not csr.is_signature_valid:
+            return 1, f"The certificate request {req_file} has an invalid signature."
+
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        not_after = now + timedelta(days=int(self.settings.get("EASYRSA_CERT_EXPIRE")))
+
+        with self._lock:
+            serial = self.__next_serial()
+
+            builder = x509.CertificateBuilder().subject_name(
+                csr.subject
+            ).issuer_name(
+                self._ca_cert.subject
+            ).public_key(
+                csr.public_key()
+            ).serial_number(
+                serial
+            ).not_valid_before(
+                now
+            ).not_valid_after(
+                not_after
+            )
+
+            for extension, critical in self.__extensions(csr, cert_type):
+                builder = builder.add_extension(extension, critical=critical)
+
+            certificate = builder.sign(self._ca_key, self.__digest(self._ca_key))
+            pem = certificate.public_bytes(serialization.Encoding.PEM)
+
+            self.__write_file(os.path.join(self.pki_dir, "certs_by_serial", f"{format_serial(serial)}.pem"), pem, 0o644)
+            self.__write_file(crt_file, pem, 0o644)
+
+            self.index.append(dict(
+                status = "V",
+                expires = format_asn1_time(not_after),
+                serial = format_serial(serial),
+                filename = "unknown",
+                subject = self.__oneline(csr.subject),
+            ))
+
+        return 0, f"Certificate created at: {crt_file}"
+
+    def build_full(self, name, cert_type="client", private_key=None):
+        """
+          easyrsa --batch build-${cert_type}-full ${name} nopass
+        """
+        rc, msg = self.gen_req(name, private_key=private_key)
+
+        if rc != 0:
+            return rc, msg
+
+        return self.sign_req(name, cert_type)
+
+    def revoke(self, names):
+        """
+          easyrsa --batch revoke ${name} (for a list of names)
+
+          All valid certificates of the given names are marked as revoked with one
+          rewrite of index.txt. Like easyrsa, the certificate, key and request are
+          moved into pki/revoked/*_by_serial/.
+          The CRL is not touched, call gen_crl() once after all revocations.
+
+          returns (rc, message, {name: [serial, ...]})
+        """
+        revoked = dict((name, []) for name in names)
+
+        with self._lock:
+            entries = self.index.entries()
+            now = format_asn1_time(datetime.now(timezone.utc))
+
+            for entry in entries:
+                name = entry.get("name")
+
+                if entry.get("status") != "V" or name not in revoked:
+                    continue
+
+                entry["status"] = "R"
+                entry["revoked"] = now
+                revoked[name].append(entry.get("serial"))
+
+            if not any(revoked.values()):
+                return 0, "No valid certificates to revoke.", revoked
+
+            self.index.write(entries)
+
+        for name, serials in revoked.items():
+            for serial in serials:
+                for source, destination in [
+                    (os.path.join("issued", f"{name}.crt"), os.path.join("revoked", "certs_by_serial", f"{serial}.crt")),
+                    (os.path.join("private", f"{name}.key"), os.path.join("revoked", "private_by_serial", f"{serial}.key")),
+                    (os.path.join("reqs", f"{name}.req"), os.path.join("revoked", "reqs_by_serial", f"{serial}.req")),
+                ]:
+                    source = os.path.join(self.pki_dir, source)
+                    destination = os.path.join(self.pki_dir, destination)
+
+                    if os.path.exists(source):
+                        if not os.path.isdir(os.path.dirname(destination)):
+                            os.makedirs(os.path.dirname(destination), mode=0o700)
+                        os.replace(source, destination)
+
+        count = sum(len(s) for s in revoked.values())
+
+        return 0, f"{count} certificates revoked.", revoked
+
+    def gen_crl(self):
+        """
+          easyrsa gen-crl
+
+          one signature for all revoked entries of index.txt
+        """
+        rc, msg = self.__load_ca()
+
+        if rc != 0:
+            return rc, msg
+
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        next_update = now + timedelta(days=int(self.settings.get("EASYRSA_CRL_DAYS")))
+
+        builder = x509.CertificateRevocationListBuilder().issuer_name(
+            self._ca_cert.subject
+        ).last_update(
+            now
+        ).next_update(
+            next_update
+        ).add_extension(
+            x509.AuthorityKeyIdentifier.from_issuer_public_key(self._ca_key.public_key()),
+            critical=False
+        )
+
+        count = 0
+
+        for entry in self.index.entries():
+            if entry.get("status") != "R":
+                continue
+
+            revoked = x509.RevokedCertificateBuilder().serial_number(
+                int(entry.get("serial"), 16)
+            ).revocation_date(
+                parse_asn1_time(entry.get("revoked"))
+            )
+
+            if entry.get("reason"):
+                try:
+                    revoked = revoked.add_extension(x509.CRLReason(x509.ReasonFlags(entry.get("reason"))), critical=False)
+                except ValueError:
+                    pass
+
+            builder = builder.add_revoked_certificate(revoked.build())
+            count += 1
+
+        crl = builder.sign(self._ca_key, self.__digest(self._ca_key))
+
+        crl_file = os.path.join(self.pki_dir, "crl.pem")
+        mode = 0o644
+
+        if os.path.exists(crl_file):
+            mode = os.stat(crl_file).st_mode & 0o777
+
+        self.__write_file(crl_file, crl.public_bytes(serialization.Encoding.PEM), mode)
+
+        return 0, f"An updated CRL with {count} revoked certificates has been created: {crl_file}"
+
+    def __load_ca(self):
+        """
+        """
+        if self._ca_cert is not None and self._ca_key is not None:
+            return 0, ""
+
+        ca_crt = os.path.join(self.pki_dir, "ca.crt")
+        ca_key = os.path.join(self.pki_dir, "private", "ca.key")
+
+        if not os.path.exists(ca_crt) or not os.path.exists(ca_key):
+            return 1, "Missing CA certificate or CA key. Run 'build-ca' first."
+
+        try:
+            self._ca_cert = load_certificates(ca_crt)[0]
+
+            with open(ca_key, "rb") as f:
+                self._ca_key = serialization.load_pem_private_key(f.read(), password=None)
+        except (IndexError, PemError, TypeError, ValueError) as e:
+            self._ca_cert = None
+            self._ca_key = None
+            return 1, f"Can not load the CA (a passphrase protected CA key is not supported): {e}"
+
+        return 0, ""
+
+    def __next_serial(self):
+        """
+          random serial like easyrsa (EASYRSA_RAND_SN), the serial file gets the
+          next serial number like openssl ca writes it
+
+          index.txt is read only once per instance, a bulk signing keeps the
+          known serials in memory.
+        """
+        if self._serials is None:
+            self._serials = self.index.serials()
+
+        while True:
+            serial = int.from_bytes(secrets.token_bytes(16), "big") >> 1
+            if serial > 0 and format_serial(serial) not in self._serials:
+                break
+
+        self._serials.add(format_serial(serial))
+
+        self.__write_file(os.path.join(self.pki_dir, "serial"), f"{format_serial(serial + 1)}\n".encode(), 0o600)
+
+        return serial
+
+    def __subject(self, common_name):
+        """
+        """
+        attributes = []
+
+        if self.settings.get("EASYRSA_DN") == "org":
+            for oid, key in [
+                (NameOID.COUNTRY_NAME, "EASYRSA_REQ_COUNTRY"),
+                (NameOID.STATE_OR_PROVINCE_NAME, "EASYRSA_REQ_PROVINCE"),
+                (NameOID.LOCALITY_NAME, "EASYRSA_REQ_CITY"),
+                (NameOID.ORGANIZATION_NAME, "EASYRSA_REQ_ORG"),
+                (NameOID.ORGANIZATIONAL_UNIT_NAME, "EASYRSA_REQ_OU"),
+            ]:
+                value = self.settings.get(key)
+                if value:
+                    attributes.append(x509.NameAttribute(oid, value))
+
+        attributes.append(x509.NameAttribute(NameOID.COMMON_NAME, common_name))
+
+        if self.settings.get("EASYRSA_DN") == "org" and self.settings.get("EASYRSA_REQ_EMAIL"):
+            attributes.append(x509.NameAttribute(NameOID.EMAIL_ADDRESS, self.settings.get("EASYRSA_REQ_EMAIL")))
+
+        return x509.Name(attributes)
+
+    def __extensions(self, csr, cert_type):
+        """
+          the extensions of the easyrsa x509-types 'client' and 'server'
+        """
+        ski = x509.SubjectKeyIdentifier.from_public_key(csr.public_key())
+        ca_ski = x509.SubjectKeyIdentifier.from_public_key(self._ca_key.public_key())
+
+        extensions = [
+            (x509.BasicConstraints(ca=False, path_length=None), False),
+            (ski, False),
+            (x509.AuthorityKeyIdentifier(
+                key_identifier=ca_ski.digest,
+                authority_cert_issuer=[x509.DirectoryName(self._ca_cert.issuer)],
+                authority_cert_serial_number=self._ca_cert.serial_number), False),
+        ]
+
+        if cert_type == "server":
+            common_name = csr.subject.get_attributes_for_oid(NameOID.COMMON_NAME)[0].value
+
+            extensions.append((x509.ExtendedKeyUsage([ExtendedKeyUsageOID.SERVER_AUTH]), False))
+            extensions.append((self.__key_usage(key_encipherment=True), False))
+            extensions.append((x509.SubjectAlternativeName([x509.DNSName(common_name)]), False))
+        else:
+            extensions.append((x509.ExtendedKeyUsage([ExtendedKeyUsageOID.CLIENT_AUTH]), False))
+            extensions.append((self.__key_usage(key_encipherment=False), False))
+
+        return extensions
+
+    def __key_usage(self, key_encipherment):
+        """
+        """
+        return x509.KeyUsage(
+            digital_signature=True,
+            content_commitment=False,
+            key_encipherment=key_encipherment,
+            data_encipherment=False,
+            key_agreement=False,
+            key_cert_sign=False,
+            crl_sign=False,
+            encipher_only=False,
+            decipher_only=False
+        )
+
+    def __digest(self, private_key):
+        """
+          Ed25519 and Ed448 keys sign without a separate digest
+        """
+        if isinstance(private_key, (ed25519.Ed25519PrivateKey, ed448.Ed448PrivateKey)):
+            return None
+
+        digests = dict(
+            sha224 = hashes.SHA224,
+            sha256 = hashes.SHA256,
+            sha384 = hashes.SHA384,
+            sha512 = hashes.SHA512,
+        )
+
+        return digests.get(self.settings.get("EASYRSA_DIGEST"), hashes.SHA256)()
+
+    def __oneline(self, name):
+        """
+          subject in the openssl 'oneline' format, as used in index.txt
+        """
+        short_names = {
+            NameOID.COUNTRY_NAME: "C",
+            NameOID.STATE_OR_PROVINCE_NAME: "ST",
+            NameOID.LOCALITY_NAME: "L",
+            NameOID.ORGANIZATION_NAME: "O",
+            NameOID.ORGANIZATIONAL_UNIT_NAME: "OU",
+            NameOID.COMMON_NAME: "CN",
+            NameOID.EMAIL_ADDRESS: "emailAddress",
+        }
+
+        return "".join(
+            f"/{short_names.get(a.oid, a.oid.dotted_string)}={a.value}" for a in name
+        )
+
+    def __write_file(self, filename, data, mode):
+        """
+          write a file atomically with the given permissions
+        """
+        directory = os.path.dirname(filename)
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory, mode=0o700)
+
+        tmp_file = f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.chmod(tmp_file, mode)
+        os.replace(tmp_file, filename)
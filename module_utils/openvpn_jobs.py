@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+import hashlib
+import json
+import os
+import shutil
+import signal
+import subprocess
+import time
+
+
+class DetachedJobs(object):
+    """
+      long running commands, detached from the ansible module
+
+        ${job_directory}/${job_id}/job.json   command, working directory, pid, process identity, start time
+        ${job_directory}/${job_id}/output     stdout and stderr
+        ${job_directory}/${job_id}/rc         exit code, written when the command has finished
+
+      The job id is derived from the command and the working directory.
+      Starting the same command again returns the running job instead of a second process.
+    """
+
+    # only the end of the output is returned
+    OUTPUT_TAIL = 4096
+
+    def __init__(self, job_directory):
+        """
+        """
+        self.job_directory = job_directory
+
+    def job_id(self, commands, cwd):
+        """
+        """
+        data = json.dumps(dict(commands=commands, cwd=cwd), sort_keys=True)
+        return hashlib.sha256(data.encode()).hexdigest()[:16]
+
+    def start(self, commands, cwd=None):
+        """
+          returns (job_id, started)
+        """
+        cwd = cwd or os.getcwd()
+        job_id = self.job_id(commands, cwd)
+        job_dir = os.path.join(self.job_directory, job_id)
+
+        status = self.status(job_id)
+
+        if status.get("exists") and not status.get("finished"):
+            return job_id, False
+
+        shutil.rmtree(job_dir, ignore_errors=True)
+        os.makedirs(job_dir, mode=0o700)
+
+        output = os.path.join(job_dir, "output")
+        rc_file = os.path.join(job_dir, "rc")
+
+        proc = subprocess.Popen(
+            [
+                "sh", "-c",
+                'rc_file="$1"; shift; "$@" > "$0" 2>&1; echo $? > "$rc_file.tmp" && mv "$rc_file.tmp" "$rc_file"',
+                output, rc_file
+            ] + [str(c) for c in commands],
+            cwd=cwd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+            start_new_session=True
+        )
+
+        with open(os.path.join(job_dir, "job.json"), "w") as f:
+            json.dump(
+                dict(
+                    commands = [str(c) for c in commands],
+                    cwd = cwd,
+                    pid = proc.pid,
+                    process = self.__process_identity(proc.pid),
+                    started = time.time()
+                ),
+                f
+            )
+
+        return job_id, True
+
+    def status(self, job_id):
+        """
+          exists, finished, rc, elapsed and the output of a job
+        """
+        job_dir = os.path.join(self.job_directory, os.path.basename(job_id))
+        job_file = os.path.join(job_dir, "job.json")
+
+        try:
+            with open(job_file, "r") as f:
+                job = json.load(f)
+        except (IOError, OSError, ValueError):
+            return dict(
+                exists = False,
+                finished = False
+            )
+
+        rc, finished_at = self.__exit_code(job_dir)
+
+        if rc is None and not self.__alive(job.get("pid"), job.get("process")):
+            rc, finished_at = self.__exit_code(job_dir)
+
+            if rc is None:
+                # killed (e.g. reboot) before the exit code was written
+                rc = -int(signal.SIGKILL)
+                finished_at = time.time()
+
+        output = ""
+        try:
+            with open(os.path.join(job_dir, "output"), "rb") as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(f.tell() - self.OUTPUT_TAIL, 0))
+                output = f.read().decode("utf-8", errors="replace")
+        except (IOError, OSError):
+            pass
+
+        return dict(
+            exists = True,
+            finished = rc is not None,
+            rc = rc,
+            commands = job.get("commands"),
+            elapsed = round((finished_at or time.time()) - job.get("started", 0), 1),
+            output = output
+        )
+
+    def __exit_code(self, job_dir):
+        """
+          (rc, finished_at) or (None, None) for a running job
+        """
+        rc_file = os.path.join(job_dir, "rc")
+
+        try:
+            with open(rc_file, "r") as f:
+                rc = int(f.read().strip() or 1)
+            return rc, os.stat(rc_file).st_mtime
+        except (IOError, OSError, ValueError):
+            return None, None
+
+    def __alive(self, pid, identity=None):
+        """
+          the job is running, when its pid exists and still belongs to the same process
+
+          after a reboot or with a reused pid the identity (boot id and start time) differs
+        """
+        if not pid:
+            return False
+
+        try:
+            # reap the process, if it is our own child
+            os.waitpid(pid, os.WNOHANG)
+        except (ChildProcessError, OSError):
+            pass
+
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+
+        if identity and self.__process_identity(pid) != identity:
+            return False
+
+        return True
+
+    def __process_identity(self, pid):
+        """
+          boot id and start time of a process (field 22 of /proc/${pid}/stat, clock ticks since boot)
+
+          None without /proc
+        """
+        try:
+            with open("/proc/sys/kernel/random/boot_id", "r") as f:
+                boot_id = f.read().strip()
+
+            with open(f"/proc/{pid}/stat", "r") as f:
+                stat = f.read()
+        except (IOError, OSError):
+            return None
+
+        # the process name (field 2) may contain spaces and parentheses
+        fields = stat[stat.rfind(")") + 1:].split()
+
+        try:
+            # fields[0] is field 3 (state)
+            start_time = int(fields[19])
+        except (IndexError, ValueError):
+            return None
+
+        return f"{boot_id}:{start_time}"
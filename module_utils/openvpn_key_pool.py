@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+class KeyPool(object):
+    """
+      pre-generated private keys for new client certificates
+
+        pki/keypool/${algo}/${uuid}.key
+
+      The directories are created with 0700 and the keys with 0600, the same
+      permissions easyrsa uses for pki/private.
+      ${algo} (e.g. 'rsa-4096', 'ec-secp384r1') keeps keys of different
+      settings apart, after a change of the vars file the old keys are not used.
+
+      take() claims a key with an atomic rename, so a key is never handed out twice.
+    """
+
+    def __init__(self, pki_dir, algo):
+        """
+        """
+        self.directory = os.path.join(pki_dir, "keypool", algo)
+
+    @staticmethod
+    def algo_id(settings):
+        """
+          pool name for the EASYRSA_ALGO / EASYRSA_KEY_SIZE / EASYRSA_CURVE settings
+        """
+        algo = settings.get("EASYRSA_ALGO", "rsa")
+
+        if algo == "rsa":
+            return f"rsa-{settings.get('EASYRSA_KEY_SIZE')}"
+
+        if algo == "ed":
+            curve = settings.get("EASYRSA_CURVE")
+            return f"ed-{curve if curve == 'ed448' else 'ed25519'}"
+
+        return f"ec-{settings.get('EASYRSA_CURVE')}"
+
+    def keys(self):
+        """
+        """
+        try:
+            return sorted(f for f in os.listdir(self.directory) if f.endswith(".key"))
+        except OSError:
+            return []
+
+    def available(self):
+        """
+        """
+        return len(self.keys())
+
+    def take(self):
+        """
+          returns the PEM data of a pooled key (and removes it from the pool) or None
+        """
+        for f in self.keys():
+            key_file = os.path.join(self.directory, f)
+            claimed = f"{key_file}.{os.getpid()}.{threading.get_ident()}.claimed"
+
+            try:
+                os.rename(key_file, claimed)
+            except OSError:
+                # already taken
+                continue
+
+            try:
+                with open(claimed, "rb") as fh:
+                    return fh.read()
+            finally:
+                os.remove(claimed)
+
+        return None
+
+    def put(self, data):
+        """
+          add the PEM data of a private key to the pool
+        """
+        self.__ensure_directory()
+
+        key_file = os.path.join(self.directory, f"{uuid.uuid4().hex}.key")
+        tmp_file = f"{key_file}.tmp"
+
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.chmod(tmp_file, 0o600)
+        os.rename(tmp_file, key_file)
+
+        return key_file
+
+    def fill(self, depth, generate, workers=4):
+        """
+          create keys until the pool holds 'depth' keys
+
+          generate() returns the PEM data of a new key.
+          returns the number of created keys.
+        """
+        missing = int(depth) - self.available()
+
+        if missing <= 0:
+            return 0
+
+        self.__ensure_directory()
+
+        with ThreadPoolExecutor(max_workers=max(1, min(int(workers), missing))) as executor:
+            list(executor.map(lambda _: self.put(generate()), range(missing)))
+
+        return missing
+
+    def purge(self):
+        """
+          remove all keys of this pool
+        """
+        removed = 0
+
+        for f in self.keys():
+            try:
+                os.remove(os.path.join(self.directory, f))
+                removed += 1
+            except OSError:
+                pass
+
+        return removed
+
+    def __ensure_directory(self):
+        """
+        """
+        for d in [os.path.dirname(self.directory), self.directory]:
+            if not os.path.isdir(d):
+                os.makedirs(d, mode=0o700, exist_ok=True)
+            os.chmod(d, 0o700)
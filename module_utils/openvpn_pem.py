@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+import base64
+import binascii
+import hashlib
+import mmap
+import os
+import re
+
+try:
+    from cryptography import x509
+except ImportError:
+    HAS_CRYPTOGRAPHY = False
+else:
+    HAS_CRYPTOGRAPHY = True
+
+
+PEM_MARKER = re.compile(rb"-----(BEGIN|END) ([A-Za-z0-9 #-]+?)-----")
+
+# parsed certificates, keyed by the sha256 of their PEM block
+_X509_CACHE = {}
+# parsed certificate files, keyed by path and (size, mtime_ns, inode)
+_FILE_CACHE = {}
+
+
+class PemError(Exception):
+    """
+      a malformed PEM file
+
+      filename, line (1-based) and reason describe the problem,
+      as_dict() returns them for a module result.
+    """
+
+    def __init__(self, filename, line, reason):
+        self.filename = filename
+        self.line = line
+        self.reason = reason
+
+        super(PemError, self).__init__(f"{filename}, line {line}: {reason}")
+
+    def as_dict(self):
+        """
+        """
+        return dict(
+            filename = self.filename,
+            line = self.line,
+            reason = self.reason
+        )
+
+
+class PemBlock(object):
+    """
+      one '-----BEGIN ...----- / -----END ...-----' block of a PEM file
+    """
+
+    def __init__(self, label, data, line):
+        """
+          data contains the complete block (both marker lines included) as bytes
+        """
+        self.label = label
+        self.data = data
+        self.line = line
+
+    @property
+    def text(self):
+        """
+          the block as string, terminated with a newline
+        """
+        return self.data.decode("ascii") + "\n"
+
+    def der(self):
+        """
+          the base64 decoded body of the block
+        """
+        lines = self.data.splitlines()[1:-1]
+        # RFC 1421 encapsulated headers (e.g. 'Proc-Type: ...') are not part of the body
+        body = b"".join(line.strip() for line in lines if b":" not in line)
+
+        return base64.b64decode(body, validate=True)
+
+    def x509(self):
+        """
+          the parsed certificate (requires cryptography)
+
+          every certificate is decoded only once per process.
+        """
+        key = hashlib.sha256(self.data).digest()
+
+        if key not in _X509_CACHE:
+            _X509_CACHE[key] = x509.load_der_x509_certificate(self.der())
+
+        return _X509_CACHE[key]
+
+
+def iter_pem_blocks(filename, label=None):
+    """
+      stream all PEM blocks of a file
+
+      The file is memory-mapped and scanned for marker lines, so even bundles
+      with thousands of certificates are never held in memory as a whole.
+      Text outside of the blocks (e.g. the 'Certificate:' dump of openssl) is ignored.
+      With label (e.g. 'CERTIFICATE') only blocks of this type are returned.
+
+      raises PemError on nested, unterminated or mismatched blocks.
+    """
+    if os.path.getsize(filename) == 0:
+        return
+
+    with open(filename, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = None
+            start_label = None
+            line_of = _LineCounter(mm)
+
+            for match in PEM_MARKER.finditer(mm):
+                kind = match.group(1)
+                _label = match.group(2).decode("ascii")
+
+                if kind == b"BEGIN":
+                    if start is not None:
+                        raise PemError(filename, line_of(match.start()), f"BEGIN {_label} found inside of {start_label} block")
+
+                    start = match.start()
+                    start_label = _label
+                    continue
+
+                if start is None:
+                    raise PemError(filename, line_of(match.start()), f"END {_label} found without BEGIN")
+
+                if _label != start_label:
+                    raise PemError(filename, line_of(match.start()), f"END {_label} does not match BEGIN {start_label}")
+
+                if label is None or label == _label:
+                    yield PemBlock(_label, mm[start:match.end()], line_of(start))
+
+                start = None
+                start_label = None
+
+            if start is not None:
+                raise PemError(filename, line_of(start), f"{start_label} block is not terminated")
+
+
+def extract_certs_as_strings(filename):
+    """
+      all certificates of a file as PEM strings
+    """
+    return [block.text for block in iter_pem_blocks(filename, "CERTIFICATE")]
+
+
+def load_certificates(filename):
+    """
+      all certificates of a file as cryptography objects (requires cryptography)
+
+      an unchanged file (size, mtime_ns, inode) is not read again.
+    """
+    st = os.stat(filename)
+    path = os.path.realpath(filename)
+    stat = (st.st_size, st.st_mtime_ns, st.st_ino)
+
+    cached = _FILE_CACHE.get(path)
+
+    if cached is not None and cached[0] == stat:
+        return list(cached[1])
+
+    try:
+        certs = [block.x509() for block in iter_pem_blocks(filename, "CERTIFICATE")]
+    except (binascii.Error, ValueError) as e:
+        raise PemError(filename, 0, f"invalid certificate: {e}")
+
+    _FILE_CACHE[path] = (stat, certs)
+
+    return list(certs)
+
+
+class _LineCounter(object):
+    """
+      line numbers for ascending offsets, without rescanning the file
+    """
+
+    def __init__(self, mm):
+        self.mm = mm
+        self.offset = 0
+        self.line = 1
+
+    def __call__(self, offset):
+        if offset < self.offset:
+            self.offset = 0
+            self.line = 1
+
+        self.line += self.mm[self.offset:offset].count(b"\n")
+        self.offset = offset
+
+        return self.line
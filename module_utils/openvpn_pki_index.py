@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime, timedelta, timezone
+
+
+def parse_asn1_time(value):
+    """
+      convert an index.txt timestamp (YYMMDDHHMMSSZ or YYYYMMDDHHMMSSZ)
+      into a datetime object
+    """
+    if not value:
+        return None
+
+    value = value.split(",")[0]
+
+    if len(value) == 13:
+        _format = "%y%m%d%H%M%SZ"
+    else:
+        _format = "%Y%m%d%H%M%SZ"
+
+    return datetime.strptime(value, _format).replace(tzinfo=timezone.utc)
+
+
+def format_asn1_time(value):
+    """
+      openssl writes UTCTime up to 2049 and GeneralizedTime afterwards
+    """
+    if value.year < 2050:
+        return value.strftime("%y%m%d%H%M%SZ")
+
+    return value.strftime("%Y%m%d%H%M%SZ")
+
+
+def format_serial(serial):
+    """
+      openssl writes the serial as uppercase hex string with an even length
+    """
+    _serial = format(serial, "X")
+
+    if len(_serial) % 2:
+        _serial = f"0{_serial}"
+
+    return _serial
+
+
+def parse_index_line(line):
+    """
+      parse one line of the easyrsa (openssl ca) database
+
+        V	330101000000Z		0A1B2C	unknown	/CN=client
+        R	330101000000Z	240101000000Z,keyCompromise	0A1B2C	unknown	/CN=client
+    """
+    fields = line.rstrip("\n").split("\t")
+
+    if len(fields) < 6:
+        return None
+
+    status, expires, revoked, serial, filename = fields[:5]
+    subject = "\t".join(fields[5:])
+
+    reason = None
+
+    if revoked and "," in revoked:
+        revoked, reason = revoked.split(",", 1)
+
+    common_name = None
+
+    for rdn in subject.split("/"):
+        if rdn.startswith("CN="):
+            common_name = rdn[3:]
+
+    return dict(
+        status = status,
+        expires = expires,
+        revoked = revoked or None,
+        reason = reason,
+        serial = serial.upper(),
+        filename = filename,
+        subject = subject,
+        name = common_name,
+    )
+
+
+def format_index_line(entry):
+    """
+      the reverse of parse_index_line()
+    """
+    revoked = entry.get("revoked") or ""
+
+    if revoked and entry.get("reason"):
+        revoked = f"{revoked},{entry.get('reason')}"
+
+    return "\t".join([
+        entry.get("status"),
+        entry.get("expires"),
+        revoked,
+        entry.get("serial"),
+        entry.get("filename", "unknown"),
+        entry.get("subject"),
+    ]) + "\n"
+
+
+class EasyRsaIndex(object):
+    """
+      read and write access to the easyrsa certificate database (pki/index.txt)
+    """
+
+    # number of bytes in front of the last parsed offset, which have to be unchanged
+    # to continue parsing from the cached offset
+    TAIL_SIZE = 4096
+
+    def __init__(self, pki_dir, cache_directory=None):
+        """
+          with a cache_directory, the parsed entries are stored together with the
+          parsed offset, the inode and a hash over the tail of the parsed data.
+          The next run only parses the lines appended since then.
+        """
+        self.pki_dir = pki_dir
+        self.index_file = os.path.join(pki_dir, "index.txt")
+
+        self.cache_file = None
+
+        if cache_directory:
+            _id = hashlib.sha256(os.path.realpath(self.index_file).encode()).hexdigest()[:16]
+            self.cache_file = os.path.join(cache_directory, "index", f"{_id}.json")
+
+        # statistics of the last parse run
+        self.parse_stats = dict(cached=0, parsed=0)
+
+        self._entries = None
+        self._by_name = None
+        self._by_serial = None
+
+    def load(self):
+        """
+          parse the database once and build the lookup tables
+
+          by_name holds the current certificate of a common name: the last valid
+          one, or the last entry if every certificate of this name is revoked.
+        """
+        self._entries = self.entries()
+        self._by_name = {}
+        self._by_serial = {}
+
+        for entry in self._entries:
+            self._by_serial[entry.get("serial")] = entry
+
+            name = entry.get("name")
+            current = self._by_name.get(name)
+
+            if current is None or entry.get("status") == "V" or current.get("status") != "V":
+                self._by_name[name] = entry
+
+        return self
+
+    def lookup(self, names):
+        """
+          {name: entry or None} for a list of common names
+        """
+        if self._by_name is None:
+            self.load()
+
+        return dict((name, self._by_name.get(name)) for name in names)
+
+    def lookup_serial(self, serial):
+        """
+        """
+        if self._by_serial is None:
+            self.load()
+
+        return self._by_serial.get(serial.upper())
+
+    def valid(self, now=None):
+        """
+          all valid and not yet expired certificates
+        """
+        now = now or datetime.now(timezone.utc)
+
+        return [
+            e for e in self.__loaded()
+            if e.get("status") == "V" and parse_asn1_time(e.get("expires")) > now
+        ]
+
+    def revoked(self):
+        """
+        """
+        return [e for e in self.__loaded() if e.get("status") == "R"]
+
+    def expired(self, now=None):
+        """
+          entries marked as expired by 'openssl ca -updatedb' or valid entries beyond their end date
+        """
+        now = now or datetime.now(timezone.utc)
+
+        return [
+            e for e in self.__loaded()
+            if e.get("status") == "E" or (e.get("status") == "V" and parse_asn1_time(e.get("expires")) <= now)
+        ]
+
+    def expiring(self, days, now=None):
+        """
+          valid certificates, which expire within the next days
+        """
+        now = now or datetime.now(timezone.utc)
+        limit = now + timedelta(days=days)
+
+        return [
+            e for e in self.valid(now)
+            if parse_asn1_time(e.get("expires")) <= limit
+        ]
+
+    def __loaded(self):
+        """
+        """
+        if self._entries is None:
+            self.load()
+
+        return self._entries
+
+    def entries(self):
+        """
+          all entries of the database in file order
+        """
+        result = []
+
+        if not os.path.exists(self.index_file):
+            return result
+
+        if self.cache_file:
+            return self.__cached_entries()
+
+        with open(self.index_file, "r") as f:
+            for line in f:
+                entry = parse_index_line(line)
+                if entry:
+                    result.append(entry)
+
+        self.parse_stats = dict(cached=0, parsed=len(result))
+
+        return result
+
+    def __cached_entries(self):
+        """
+          parse only the lines appended since the last run
+
+          A full parse is done when the inode has changed (easyrsa / openssl replace
+          the file on revoke), the file is smaller than the cached offset, or the
+          data in front of the cached offset was modified.
+        """
+        cache = self.__read_cache()
+        stat = os.stat(self.index_file)
+
+        entries = []
+        offset = 0
+
+        with open(self.index_file, "rb") as f:
+            if self.__cache_valid(cache, stat, f):
+                entries = cache.get("entries", [])
+                offset = cache.get("offset", 0)
+
+            f.seek(offset)
+            data = f.read()
+
+            # ignore an incomplete last line, it is parsed in the next run
+            end = data.rfind(b"\n") + 1
+
+            parsed = 0
+            for line in data[:end].decode("utf-8", errors="replace").splitlines():
+                entry = parse_index_line(line)
+                if entry:
+                    entries.append(entry)
+                    parsed += 1
+
+            self.parse_stats = dict(cached=len(entries) - parsed, parsed=parsed)
+
+            if cache is None or end > 0 or offset == 0:
+                offset += end
+                self.__write_cache(dict(
+                    index_file = self.index_file,
+                    inode = stat.st_ino,
+                    device = stat.st_dev,
+                    offset = offset,
+                    tail = self.__tail_hash(f, offset),
+                    entries = entries,
+                ))
+
+        return entries
+
+    def __cache_valid(self, cache, stat, f):
+        """
+        """
+        if not cache:
+            return False
+
+        if cache.get("inode") != stat.st_ino or cache.get("device") != stat.st_dev:
+            return False
+
+        if cache.get("offset", 0) > stat.st_size:
+            return False
+
+        return cache.get("tail") == self.__tail_hash(f, cache.get("offset", 0))
+
+    def __tail_hash(self, f, offset):
+        """
+        """
+        start = max(0, offset - self.TAIL_SIZE)
+
+        f.seek(start)
+
+        return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+    def __read_cache(self):
+        """
+        """
+        try:
+            with open(self.cache_file, "r") as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def __write_cache(self, data):
+        """
+          atomically replace the cache file
+        """
+        directory = os.path.dirname(self.cache_file)
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory, mode=0o700)
+
+        tmp_file = f"{self.cache_file}.{os.getpid()}.tmp"
+
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+        os.replace(tmp_file, self.cache_file)
+
+    def serials(self):
+        """
+        """
+        return set(e.get("serial") for e in self.entries())
+
+    def write(self, entries):
+        """
+          replace the whole database, the previous version is kept as index.txt.old
+          (like 'openssl ca' does)
+        """
+        tmp_file = f"{self.index_file}.{os.getpid()}.tmp"
+
+        with open(tmp_file, "w") as f:
+            f.writelines(format_index_line(e) for e in entries)
+            f.flush()
+            os.fsync(f.fileno())
+
+        if os.path.exists(self.index_file):
+            shutil.copyfile(self.index_file, f"{self.index_file}.old")
+
+        os.replace(tmp_file, self.index_file)
+
+        self._entries = None
+        self._by_name = None
+        self._by_serial = None
+
+    def append(self, entry):
+        """
+          append one entry, the file is locked against concurrent writers
+        """
+        with open(self.index_file, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.write(format_index_line(entry))
+                f.flush()
+                os.fsync(f.fileno())
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+        self._entries = None
+        self._by_name = None
+        self._by_serial = None
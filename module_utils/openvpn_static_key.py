@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+import base64
+import binascii
+import hashlib
+import hmac
+import os
+import struct
+import time
+
+from ansible.module_utils.openvpn_pem import PemError, iter_pem_blocks
+
+try:
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+except ImportError:
+    HAS_CRYPTOGRAPHY = False
+else:
+    HAS_CRYPTOGRAPHY = True
+
+
+STATIC_KEY_SIZE = 256
+
+# struct key: 64 byte cipher key + 64 byte hmac key
+TLS_CRYPT_V2_SERVER_KEY_SIZE = 128
+# struct key2 with two struct key
+TLS_CRYPT_V2_CLIENT_KEY_SIZE = 256
+TLS_CRYPT_V2_TAG_SIZE = 32
+TLS_CRYPT_METADATA_TYPE_TIMESTAMP = 0x01
+
+TLS_CRYPT_V2_SERVER_PEM_NAME = "OpenVPN tls-crypt-v2 server key"
+TLS_CRYPT_V2_CLIENT_PEM_NAME = "OpenVPN tls-crypt-v2 client key"
+
+
+def static_key_v1():
+    """
+      a new key in the format of 'openvpn --genkey secret' (usable for tls-auth and tls-crypt)
+
+        #
+        # 2048 bit OpenVPN static key
+        #
+        -----BEGIN OpenVPN Static key V1-----
+        (16 lines with 32 hex digits)
+        -----END OpenVPN Static key V1-----
+    """
+    data = binascii.hexlify(os.urandom(STATIC_KEY_SIZE)).decode("ascii")
+    lines = [data[i:i + 32] for i in range(0, len(data), 32)]
+
+    return "\n".join(
+        [
+            "#",
+            f"# {STATIC_KEY_SIZE * 8} bit OpenVPN static key",
+            "#",
+            "-----BEGIN OpenVPN Static key V1-----",
+        ] + lines + [
+            "-----END OpenVPN Static key V1-----",
+        ]
+    ) + "\n"
+
+
+def tls_crypt_v2_server_key():
+    """
+      a new key in the format of 'openvpn --genkey tls-crypt-v2-server'
+    """
+    return pem_encode(TLS_CRYPT_V2_SERVER_PEM_NAME, os.urandom(TLS_CRYPT_V2_SERVER_KEY_SIZE))
+
+
+def load_tls_crypt_v2_server_key(filename):
+    """
+      the raw 128 bytes of a tls-crypt-v2 server key file
+
+      raises PemError on a missing or malformed key
+    """
+    blocks = list(iter_pem_blocks(filename, TLS_CRYPT_V2_SERVER_PEM_NAME))
+
+    if len(blocks) != 1:
+        raise PemError(filename, 0, f"expected exactly one '{TLS_CRYPT_V2_SERVER_PEM_NAME}' block")
+
+    try:
+        key = blocks[0].der()
+    except ValueError as e:
+        raise PemError(filename, blocks[0].line, f"invalid base64 data: {e}")
+
+    if len(key) != TLS_CRYPT_V2_SERVER_KEY_SIZE:
+        raise PemError(filename, blocks[0].line, f"a tls-crypt-v2 server key has {TLS_CRYPT_V2_SERVER_KEY_SIZE} bytes, not {len(key)}")
+
+    return key
+
+
+def tls_crypt_v2_client_key(server_key, timestamp=None):
+    """
+      a new client key in the format of 'openvpn --tls-crypt-v2 server.key --genkey tls-crypt-v2-client'
+      (requires cryptography)
+
+      The client key Kc (256 random bytes) is followed by the wrapped client key WKc,
+      which only the server can unwrap:
+
+        metadata = 0x01 (timestamp) || uint64 timestamp
+        net_len  = uint16(len(Kc) + len(metadata) + 32 + 2)
+        tag      = HMAC-SHA256(Ka, net_len || Kc || metadata)
+        WKc      = tag || AES-256-CTR(Ke, iv=tag[:16], Kc || metadata) || net_len
+
+      Ke and Ka are the first 32 bytes of the cipher and the hmac part of the server key.
+    """
+    client_key = os.urandom(TLS_CRYPT_V2_CLIENT_KEY_SIZE)
+
+    if timestamp is None:
+        timestamp = int(time.time())
+
+    metadata = struct.pack("!BQ", TLS_CRYPT_METADATA_TYPE_TIMESTAMP, timestamp)
+
+    return pem_encode(TLS_CRYPT_V2_CLIENT_PEM_NAME, client_key + wrap_client_key(server_key, client_key, metadata))
+
+
+def wrap_client_key(server_key, client_key, metadata):
+    """
+      WKc, see tls_crypt_v2_client_key()
+    """
+    cipher_key = server_key[0:32]
+    hmac_key = server_key[64:96]
+
+    net_len = struct.pack("!H", len(client_key) + len(metadata) + TLS_CRYPT_V2_TAG_SIZE + 2)
+
+    tag = hmac.new(hmac_key, net_len + client_key + metadata, hashlib.sha256).digest()
+
+    encryptor = Cipher(algorithms.AES(cipher_key), modes.CTR(tag[:16])).encryptor()
+    ciphertext = encryptor.update(client_key + metadata) + encryptor.finalize()
+
+    return tag + ciphertext + net_len
+
+
+def pem_encode(name, data):
+    """
+      a PEM block with 64 characters per line (like PEM_write_bio)
+    """
+    body = base64.b64encode(data).decode("ascii")
+    lines = [body[i:i + 64] for i in range(0, len(body), 64)]
+
+    return "\n".join([f"-----BEGIN {name}-----"] + lines + [f"-----END {name}-----"]) + "\n"
+
+
+def write_key_file(filename, data, mode=0o600):
+    """
+      write a key file atomically, it is never readable with other permissions
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    tmp_file = os.path.join(directory, f".{os.path.basename(filename)}.{os.getpid()}.tmp")
+
+    fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+
+    with os.fdopen(fd, "w") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.chmod(tmp_file, mode)
+    os.replace(tmp_file, filename)
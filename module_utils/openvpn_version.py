@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+import hashlib
+import json
+import os
+import re
+
+
+VERSION_PATTERN = re.compile(r"^OpenVPN (?P<version>[0-9]+\.[0-9]+\.[0-9]+)(?P<suffix>\S*) (?P<platform>\S+)(?P<flags>.*)$", re.MULTILINE)
+FLAG_PATTERN = re.compile(r"\[([^\]]+)\]")
+SSL_PATTERN = re.compile(r"^library versions: (?P<library>[A-Za-z]+) (?P<version>[0-9][^\s,]*)", re.MULTILINE)
+DCO_PATTERN = re.compile(r"^DCO version: (?P<version>.+)$", re.MULTILINE)
+DEFINES_PATTERN = re.compile(r"^Compile time defines: (?P<defines>.+)$", re.MULTILINE)
+CIPHER_PATTERN = re.compile(r"^(?P<name>[A-Z0-9][A-Za-z0-9-]+)\s+\((?P<key>\d+) bit key(?P<info>[^)]*)\)$", re.MULTILINE)
+# 'TLS client/server mode only' is printed for CFB and OFB too, only these modes are AEAD
+AEAD_PATTERN = re.compile(r"(-GCM|-CCM|^CHACHA20-POLY1305)$", re.IGNORECASE)
+
+# increased, when the cached data changes (e.g. the parsing of the output)
+CACHE_FORMAT = 2
+
+
+def parse_version_output(out):
+    """
+      the banner of 'openvpn --version' as dict
+
+        OpenVPN 2.6.3 x86_64-pc-linux-gnu [SSL (OpenSSL)] [LZO] [LZ4] [EPOLL] [PKCS11] [MH/PKTINFO] [AEAD] [DCO]
+        library versions: OpenSSL 3.0.9 30 May 2023, LZO 2.10
+        DCO version: 2.0.0
+        ...
+        Compile time defines: enable_async_push=no ... enable_dco=yes ...
+    """
+    found = VERSION_PATTERN.search(out)
+
+    if not found:
+        return None
+
+    flags = FLAG_PATTERN.findall(found.group("flags"))
+
+    ssl = dict(library=None, version=None)
+    found_ssl = SSL_PATTERN.search(out)
+
+    if found_ssl:
+        ssl = dict(library=found_ssl.group("library"), version=found_ssl.group("version"))
+
+    defines = dict()
+    found_defines = DEFINES_PATTERN.search(out)
+
+    if found_defines:
+        for define in found_defines.group("defines").split():
+            key, _, value = define.partition("=")
+            defines[key] = value
+
+    dco_version = None
+    found_dco = DCO_PATTERN.search(out)
+
+    if found_dco and found_dco.group("version").strip() not in ["N/A", "n/a"]:
+        dco_version = found_dco.group("version").strip()
+
+    return dict(
+        version = found.group("version"),
+        platform = found.group("platform"),
+        features = flags,
+        ssl = ssl,
+        lzo = "LZO" in flags,
+        lz4 = "LZ4" in flags,
+        aead = "AEAD" in flags,
+        dco = "DCO" in flags or defines.get("enable_dco") == "yes",
+        dco_version = dco_version,
+        defines = defines
+    )
+
+
+def parse_show_ciphers(out):
+    """
+      the ciphers of 'openvpn --show-ciphers'
+
+      returns a list of dicts (name, key_size, aead, deprecated).
+      aead ciphers (GCM, CCM and CHACHA20-POLY1305) can be used in 'data-ciphers',
+      the ciphers below the 'less than 128 bits' note are deprecated.
+    """
+    deprecated_at = out.find("less than 128 bits")
+    ciphers = []
+
+    for found in CIPHER_PATTERN.finditer(out):
+        ciphers.append(
+            dict(
+                name = found.group("name"),
+                key_size = int(found.group("key")),
+                aead = AEAD_PATTERN.search(found.group("name")) is not None,
+                deprecated = deprecated_at != -1 and found.start() > deprecated_at
+            )
+        )
+
+    return ciphers
+
+
+class OpenVPNVersion(object):
+    """
+      version and capabilities of the openvpn binary
+
+      The result is cached in ${cache_directory}/version/${id}.json together with
+      the path, inode, size and mtime of the binary.
+      As long as the binary is unchanged, openvpn is not executed again.
+    """
+    module = None
+
+    def __init__(self, module, openvpn, cache_directory=None):
+        """
+        """
+        self.module = module
+        self.openvpn = openvpn
+
+        self.cache_file = None
+
+        if cache_directory:
+            _id = hashlib.sha256(os.path.realpath(openvpn).encode()).hexdigest()[:16]
+            self.cache_file = os.path.join(cache_directory, "version", f"{_id}.json")
+
+    def info(self, force=False):
+        """
+          returns (info, cached)
+
+          info contains version, capabilities, ciphers and the output of 'openvpn --version'
+          or None, if the output could not be parsed.
+        """
+        binary = self.__stat()
+
+        if not force:
+            cached = self.__load_cache(binary)
+
+            if cached:
+                return cached, True
+
+        rc, out, err = self.module.run_command([self.openvpn, "--version"], check_rc=False)
+
+        capabilities = parse_version_output(out)
+
+        if capabilities is None:
+            self.module.log(msg=f"  rc : '{rc}'")
+            self.module.log(msg=f"  out: '{out}'")
+            self.module.log(msg=f"  err: '{err}'")
+
+            return dict(stdout=out.rstrip()), False
+
+        rc, out_ciphers, err = self.module.run_command([self.openvpn, "--show-ciphers"], check_rc=False)
+
+        ciphers = parse_show_ciphers(out_ciphers)
+
+        capabilities["ciphers"] = [c.get("name") for c in ciphers if not c.get("deprecated")]
+        capabilities["data_ciphers"] = [c.get("name") for c in ciphers if c.get("aead")]
+
+        info = dict(
+            version = capabilities.pop("version"),
+            capabilities = capabilities,
+            stdout = out.rstrip()
+        )
+
+        self.__save_cache(binary, info)
+
+        return info, False
+
+    def __stat(self):
+        """
+        """
+        path = os.path.realpath(self.openvpn)
+        st = os.stat(path)
+
+        return dict(
+            path = path,
+            inode = st.st_ino,
+            size = st.st_size,
+            mtime_ns = st.st_mtime_ns
+        )
+
+    def __load_cache(self, binary):
+        """
+        """
+        if not self.cache_file:
+            return None
+
+        try:
+            with open(self.cache_file, "r") as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+
+        if data.get("format") != CACHE_FORMAT or data.get("binary") != binary:
+            return None
+
+        return data.get("info")
+
+    def __save_cache(self, binary, info):
+        """
+          atomic replace, parallel runs never read a partial file
+        """
+        if not self.cache_file:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), mode=0o700, exist_ok=True)
+
+            tmp_file = f"{self.cache_file}.{os.getpid()}.tmp"
+
+            with open(tmp_file, "w") as f:
+                json.dump(dict(format=CACHE_FORMAT, binary=binary, info=info), f)
+
+            os.replace(tmp_file, self.cache_file)
+        except (IOError, OSError) as e:
+            self.module.log(msg=f"can not write {self.cache_file}: {e}")
@@ -185,3 +185,46 @@ def test_open_port(host, get_vars):
 
     service = host.socket("udp://{0}:{1}".format("0.0.0.0", port))
     assert service.is_listening
+
+
+def test_server_instances(host, get_vars):
+    """
+    """
+    distribution = host.system_info.distribution
+
+    instances = [
+        ("server", 1194, "10.8.3.0 255.255.255.128"),
+        ("server-1", 1195, "10.8.3.128 255.255.255.128"),
+    ]
+
+    for name, port, subnet in instances:
+        config = host.file(f"/etc/openvpn/server/{name}.conf")
+
+        assert config.is_file
+        assert config.contains(f"^port {{1,}}{port}$")
+        assert config.contains(f"^server {{1,}}{subnet}$")
+        assert config.contains("^data-ciphers {1,}[A-Z0-9:-]*GCM")
+
+        service = host.service(f"openvpn-server@{name}")
+
+        if distribution == 'artix':
+            service = host.service("openvpn" if name == "server" else f"openvpn.{name}")
+
+        assert service.is_enabled
+        assert host.socket(f"udp://0.0.0.0:{port}").is_listening
+
+
+def test_client_profiles(host, get_vars):
+    """
+    """
+    for name in ["roadrunner_one", "roadrunner_two", "roadrunner_three", "roadrunner_four"]:
+        assert host.file(f"/etc/easy-rsa/pki/issued/{name}.crt").is_file
+        assert host.file(f"/root/vpn-configs/{name}.ovpn").is_file
+
+    # pinned to the instance of its static ip
+    assert host.file("/root/vpn-configs/roadrunner_three.ovpn").contains("^remote .* 1195 udp$")
+    # all instances
+    assert host.file("/root/vpn-configs/roadrunner_four.ovpn").contains("^remote-random$")
+
+    assert not host.file("/etc/easy-rsa/pki/issued/roadrunner_revoked.crt").exists
+    assert not host.file("/root/vpn-configs/roadrunner_revoked.ovpn").exists
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+"""
+  the role ships its module_utils and filter plugins next to the tasks,
+  ansible loads them as ansible.module_utils.* and by file name.
+  make them importable the same way for the unit tests.
+"""
+
+from __future__ import absolute_import, division, print_function
+import importlib.util
+import os
+
+import ansible.module_utils
+import pytest
+
+ROLE_DIRECTORY = os.path.realpath(os.path.join(os.path.dirname(__file__), "..", ".."))
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+ansible.module_utils.__path__.append(os.path.join(ROLE_DIRECTORY, "module_utils"))
+
+
+def load_plugin(directory, name):
+    """
+      import library/<name>.py, filter_plugins/<name>.py, ... as python module
+    """
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROLE_DIRECTORY, directory, f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return module
+
+
+class FailJson(Exception):
+    """
+      raised by FakeModule.fail_json()
+    """
+
+
+class FakeModule(object):
+    """
+      the parts of AnsibleModule the role classes use
+
+      commands: callable for run_command(), gets the argument list and returns (rc, out, err)
+    """
+
+    def __init__(self, params=None, check_mode=False, commands=None):
+        self.params = params or {}
+        self.check_mode = check_mode
+        self.commands = commands
+        self.warnings = []
+
+    def get_bin_path(self, arg, required=False, opt_dirs=None):
+        return f"/usr/bin/{arg}"
+
+    def run_command(self, args, check_rc=False, **kwargs):
+        return self.commands(args)
+
+    def log(self, msg=""):
+        pass
+
+    def warn(self, msg):
+        self.warnings.append(msg)
+
+    def fail_json(self, msg, **kwargs):
+        raise FailJson(msg)
+
+
+@pytest.fixture
+def fixture():
+    """
+      content of a file in tests/unit/fixtures
+    """
+    def _read(name):
+        with open(os.path.join(FIXTURES, name), "r") as f:
+            return f.read()
+
+    return _read
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+import os
+
+import pytest
+
+from ansible.module_utils.openvpn_checksum_manifest import ChecksumManifest
+
+
+def test_unknown_file_is_recorded(tmp_path):
+    crt = tmp_path / "client.crt"
+    crt.write_text("certificate")
+
+    manifest = ChecksumManifest(str(tmp_path / "cache"), str(tmp_path)).load()
+
+    assert manifest.validate("client", "crt", str(crt)) is False
+    assert manifest.get("client", "crt").get("checksum") == ChecksumManifest.checksum_from_file(str(crt))
+    assert manifest.save() is True
+    assert manifest.save() is False
+
+
+def test_changed_and_missing_files(tmp_path):
+    crt = tmp_path / "client.crt"
+    crt.write_text("certificate")
+
+    manifest = ChecksumManifest(str(tmp_path / "cache"), str(tmp_path)).load()
+    manifest.set("client", "crt", str(crt))
+
+    crt.write_text("another certificate")
+    assert manifest.validate("client", "crt", str(crt)) is True
+
+    crt.unlink()
+    assert manifest.validate("client", "crt", str(crt)) is True
+
+
+def test_touched_file_refreshes_the_record(tmp_path):
+    crt = tmp_path / "client.crt"
+    crt.write_text("certificate")
+
+    manifest = ChecksumManifest(str(tmp_path / "cache"), str(tmp_path)).load()
+    manifest.set("client", "crt", str(crt))
+    manifest.save()
+
+    st = os.stat(crt)
+    os.utime(crt, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+
+    assert manifest.validate("client", "crt", str(crt)) is False
+    assert manifest.get("client", "crt").get("mtime_ns") == st.st_mtime_ns + 10 ** 9
+    assert manifest.save() is True
+
+
+def test_unchanged_stat_is_not_hashed(tmp_path, monkeypatch):
+    crt = tmp_path / "client.crt"
+    crt.write_text("certificate")
+
+    manifest = ChecksumManifest(str(tmp_path / "cache"), str(tmp_path)).load()
+    manifest.set("client", "crt", str(crt))
+
+    def fail(filename):
+        raise AssertionError(f"{filename} was hashed")
+
+    monkeypatch.setattr(ChecksumManifest, "checksum_from_file", staticmethod(fail))
+
+    assert manifest.validate("client", "crt", str(crt)) is False
+
+    paranoid = ChecksumManifest(str(tmp_path / "cache"), str(tmp_path), paranoid=True)
+    paranoid.entries = manifest.entries
+
+    with pytest.raises(AssertionError):
+        paranoid.validate("client", "crt", str(crt))
+
+
+def test_persistence_and_namespaces(tmp_path):
+    crt = tmp_path / "client.crt"
+    crt.write_text("certificate")
+    cache = str(tmp_path / "cache")
+
+    manifest = ChecksumManifest(cache, str(tmp_path)).load()
+    manifest.set("client", "crt", str(crt))
+    manifest.save()
+
+    assert ChecksumManifest(cache, str(tmp_path)).load().get("client", "crt") is not None
+    assert ChecksumManifest(cache, str(tmp_path), namespace="facts").load().get("client", "crt") is None
+
+    manifest.remove("client")
+    manifest.save()
+
+    assert ChecksumManifest(cache, str(tmp_path)).load().get("client", "crt") is None
+
+
+def test_migrate_the_former_checksum_files(tmp_path):
+    crt = tmp_path / "client.crt"
+    crt.write_text("certificate")
+    checksum = ChecksumManifest.checksum_from_file(str(crt))
+
+    cache = tmp_path / "cache"
+    (cache / "client").mkdir(parents=True)
+    (cache / "client" / "crt.sha256").write_text(checksum)
+    (cache / "client" / "key.sha256").write_text("no checksum")
+    (cache / "index").mkdir()
+    (cache / "index" / "0123.json").write_text("{}")
+
+    manifest = ChecksumManifest(str(cache), str(tmp_path)).load()
+
+    assert manifest.migrate(str(cache)) == ["client"]
+    assert manifest.get("client", "crt") == dict(checksum=checksum)
+    assert manifest.get("client", "key") is None
+    assert sorted(os.listdir(cache)) == ["index", "manifest"]
+
+    # the file is hashed once and compared with the former checksum
+    assert manifest.validate("client", "crt", str(crt)) is False
+    assert manifest.get("client", "crt").get("inode") == os.stat(crt).st_ino
+
+    manifest.save()
+    (cache / "other").mkdir()
+    (cache / "other" / "crt.sha256").write_text(checksum)
+
+    assert ChecksumManifest(str(cache), str(tmp_path)).load().migrate(str(cache)) == []
+    assert (cache / "other" / "crt.sha256").exists()
+
+
+def test_migrated_checksum_detects_a_changed_file(tmp_path):
+    crt = tmp_path / "client.crt"
+    crt.write_text("certificate")
+
+    cache = tmp_path / "cache"
+    (cache / "client").mkdir(parents=True)
+    (cache / "client" / "crt.sha256").write_text(ChecksumManifest.checksum_from_file(str(crt)) + "\n")
+
+    crt.write_text("another certificate")
+
+    manifest = ChecksumManifest(str(cache), str(tmp_path)).load()
+    manifest.migrate(str(cache))
+
+    assert manifest.validate("client", "crt", str(crt)) is True
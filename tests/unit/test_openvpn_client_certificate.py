@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+
+import pytest
+
+from conftest import FailJson, FakeModule, load_plugin
+
+client_certificate = load_plugin("library", "openvpn_client_certificate")
+
+
+class EasyRsa(object):
+    """
+      run_command() for easyrsa, creates the request, key and certificate files
+    """
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, args):
+        command = [a for a in args[1:] if not a.startswith("--") and a != "nopass"]
+        self.calls.append(" ".join(command))
+
+        created = dict([
+            ("build-client-full", ["reqs/{}.req", "private/{}.key", "issued/{}.crt"]),
+            ("gen-req", ["reqs/{}.req", "private/{}.key"]),
+            ("sign-req", ["issued/{}.crt"]),
+        ]).get(command[0], [])
+
+        for filename in created:
+            with open(f"pki/{filename.format(command[-1])}", "w") as f:
+                f.write(f"{command[0]} {command[-1]}")
+
+        return 0, "", ""
+
+
+@pytest.fixture
+def pki(tmp_path, monkeypatch):
+    """
+      an empty pki in the working directory, the checksums below tmp_path/home
+    """
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.chdir(tmp_path)
+
+    for directory in ["reqs", "private", "issued"]:
+        (tmp_path / "pki" / directory).mkdir(parents=True)
+
+    return tmp_path / "pki"
+
+
+def run(clients, **params):
+    easyrsa = EasyRsa()
+    params = dict(dict(state="present", clients=clients, workers=4, backend="easyrsa"), **params)
+
+    result = client_certificate.OpenVPNClientCertificate(FakeModule(params, commands=easyrsa)).run()
+
+    return result, easyrsa.calls
+
+
+def test_bulk_present_and_absent(pki):
+    result, _ = run([dict(name="alice"), dict(name="bob", state="present"), dict(name="nobody", state="absent")])
+    clients = result.get("clients")
+
+    assert result.get("failed") is False
+    assert result.get("changed") is True
+    assert sorted(clients) == ["alice", "bob", "nobody"]
+
+    for name in ["alice", "bob"]:
+        assert clients.get(name) == dict(
+            state = "present",
+            failed = False,
+            changed = True,
+            message = "The client certificate has been successfully created."
+        )
+        assert (pki / "issued" / f"{name}.crt").exists()
+
+    assert clients.get("nobody") == dict(
+        state = "absent",
+        failed = False,
+        changed = False,
+        message = "There is no certificate request for the user nobody."
+    )
+
+    result, calls = run([dict(name="alice"), dict(name="bob", state="absent")])
+    clients = result.get("clients")
+
+    assert result.get("changed") is True
+    assert clients.get("alice") == dict(state="present", failed=False, changed=False, message="All Files are valid.")
+    assert clients.get("bob").get("changed") is True
+    assert clients.get("bob").get("state") == "absent"
+    assert calls == ["revoke bob", "gen-crl"]
+    assert result.get("crl") == dict(regenerated=True, serials_added=1)
+
+
+def test_bulk_changed_certificate_fails(pki):
+    run([dict(name="alice")])
+    (pki / "issued" / "alice.crt").write_text("another certificate")
+
+    result, _ = run([dict(name="alice")])
+
+    assert result.get("failed") is True
+    assert result.get("clients").get("alice").get("failed") is True
+    assert result.get("clients").get("alice").get("changed") is False
+
+
+def test_former_checksum_files_are_migrated(pki, tmp_path):
+    run([dict(name="alice"), dict(name="bob")])
+
+    home = tmp_path / "home" / ".ansible" / "cache" / "openvpn"
+
+    for manifest in (home / "manifest").iterdir():
+        manifest.unlink()
+
+    for name in ["alice", "bob"]:
+        (home / name).mkdir()
+
+        for kind, filename in [("req", "reqs/{}.req"), ("key", "private/{}.key"), ("crt", "issued/{}.crt")]:
+            checksum = client_certificate.ChecksumManifest.checksum_from_file(str(pki / filename.format(name)))
+            (home / name / f"{kind}.sha256").write_text(checksum)
+
+    (pki / "issued" / "bob.crt").write_text("another certificate")
+
+    result, _ = run([dict(name="alice"), dict(name="bob")])
+
+    assert result.get("clients").get("alice").get("failed") is False
+    assert result.get("clients").get("bob").get("failed") is True
+    assert not (home / "alice").exists()
+    assert not (home / "bob").exists()
+
+
+def test_bulk_rejects_invalid_states(pki):
+    with pytest.raises(FailJson, match=r"invalid state for the clients bob \(revoked\)"):
+        run([dict(name="alice"), dict(name="bob", state="revoked")])
+
+    assert not (pki / "issued" / "alice.crt").exists()
+
+
+def test_bulk_rejects_clients_without_name(pki):
+    with pytest.raises(FailJson, match="the clients at the positions 1, 2 have no name."):
+        run([dict(name="alice"), dict(state="present"), dict(name="", state="absent")])
+
+    assert not (pki / "issued" / "alice.crt").exists()
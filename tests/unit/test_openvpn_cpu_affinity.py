@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+
+import pytest
+
+from conftest import load_plugin
+
+cpu_affinity = load_plugin("library", "openvpn_cpu_affinity")
+
+
+@pytest.mark.parametrize("value, expected", [("0-3,8", [0, 1, 2, 3, 8]), ("5\n", [5]), ("", []), ("0,2-3,", [0, 2, 3])])
+def test_parse_cpu_list(value, expected):
+    assert cpu_affinity.parse_cpu_list(value) == expected
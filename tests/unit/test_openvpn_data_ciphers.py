@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+
+from conftest import load_plugin
+
+data_ciphers = load_plugin("library", "openvpn_data_ciphers")
+
+
+def test_parse_cpuinfo():
+    x86 = "processor\t: 0\nflags\t\t: fpu vme sse2 aes pclmulqdq avx vaes\n"
+    arm = "processor\t: 0\nFeatures\t: fp asimd aes pmull sha1 sha2\n"
+
+    assert data_ciphers.parse_cpuinfo(x86) == ["aes", "pclmulqdq", "vaes"]
+    assert data_ciphers.parse_cpuinfo(arm) == ["aes", "pmull"]
+    assert data_ciphers.parse_cpuinfo("flags\t: fpu sse2\n") == []
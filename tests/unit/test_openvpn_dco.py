@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+
+import pytest
+
+from conftest import FakeModule, load_plugin
+
+dco = load_plugin("library", "openvpn_dco")
+
+
+class Version(object):
+    """
+      OpenVPN 2.6 with DCO support and the AEAD ciphers
+    """
+
+    def __init__(self, module, openvpn, cache_directory):
+        pass
+
+    def info(self):
+        return dict(
+            version = "2.6.3",
+            capabilities = dict(
+                dco = True,
+                ciphers = ["AES-256-GCM", "AES-128-GCM", "CHACHA20-POLY1305", "AES-256-CBC"]
+            )
+        ), False
+
+
+@pytest.fixture
+def run(monkeypatch):
+    monkeypatch.setattr(dco, "OpenVPNVersion", Version)
+    monkeypatch.setattr(dco.os.path, "isdir", lambda path: path == "/sys/module/ovpn_dco_v2")
+
+    def _run(**params):
+        params = dict(
+            dict(
+                enabled = True,
+                device = "tun",
+                topology = "subnet",
+                cipher = "AES-256-GCM",
+                data_ciphers = ["AES-256-GCM", "CHACHA20-POLY1305"],
+                compression = False,
+                fragment = False,
+                load_module = False
+            ),
+            **params
+        )
+
+        return dco.OpenVPNDco(FakeModule(params, commands=lambda args: (1, "", ""))).run()
+
+    return _run
+
+
+def test_enabled(run):
+    result = run()
+
+    assert result.get("enabled") is True
+    assert result.get("kernel_module") == "ovpn_dco_v2"
+    assert result.get("data_ciphers") == ["AES-256-GCM", "CHACHA20-POLY1305"]
+
+
+def test_disabled_by_configuration(run):
+    result = run(enabled=False)
+
+    assert result.get("enabled") is False
+    assert result.get("reasons") == ["disabled by configuration."]
+
+
+def test_non_aead_fallback_cipher(run):
+    result = run(cipher="AES-256-CBC")
+
+    assert result.get("enabled") is False
+    assert result.get("reasons") == ["the fallback cipher AES-256-CBC is not supported (AEAD only)."]
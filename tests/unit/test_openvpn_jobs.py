@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+import json
+import os
+import signal
+import time
+
+import pytest
+
+from ansible.module_utils.openvpn_jobs import DetachedJobs
+
+
+def wait(jobs, job_id, timeout=10):
+    deadline = time.time() + timeout
+
+    while time.time() < deadline:
+        status = jobs.status(job_id)
+
+        if status.get("finished"):
+            return status
+
+        time.sleep(0.05)
+
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def rewrite(jobs, job_id, **values):
+    job_file = os.path.join(jobs.job_directory, job_id, "job.json")
+
+    with open(job_file, "r") as f:
+        job = json.load(f)
+
+    job.update(values)
+
+    with open(job_file, "w") as f:
+        json.dump(job, f)
+
+
+def test_finished_job(tmp_path):
+    jobs = DetachedJobs(str(tmp_path / "jobs"))
+
+    job_id, started = jobs.start(["sh", "-c", "echo dh; exit 3"], cwd=str(tmp_path))
+    status = wait(jobs, job_id)
+
+    assert started is True
+    assert status.get("rc") == 3
+    assert status.get("output") == "dh\n"
+    assert status.get("commands") == ["sh", "-c", "echo dh; exit 3"]
+
+
+def test_running_job_is_not_started_twice(tmp_path):
+    jobs = DetachedJobs(str(tmp_path / "jobs"))
+
+    job_id, _ = jobs.start(["sleep", "5"], cwd=str(tmp_path))
+
+    try:
+        assert jobs.status(job_id).get("finished") is False
+        assert jobs.start(["sleep", "5"], cwd=str(tmp_path)) == (job_id, False)
+    finally:
+        with open(os.path.join(jobs.job_directory, job_id, "job.json")) as f:
+            os.killpg(json.load(f).get("pid"), signal.SIGTERM)
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/stat"), reason="no /proc")
+def test_reused_pid_is_not_running(tmp_path):
+    """
+      after a reboot or with a reused pid, the recorded pid belongs to another process
+    """
+    jobs = DetachedJobs(str(tmp_path / "jobs"))
+
+    job_id, _ = jobs.start(["sh", "-c", "exit 0"], cwd=str(tmp_path))
+    wait(jobs, job_id)
+
+    os.remove(os.path.join(jobs.job_directory, job_id, "rc"))
+    # the pid of this (running) test process, started by someone else
+    rewrite(jobs, job_id, pid=os.getpid())
+
+    status = jobs.status(job_id)
+
+    assert status.get("finished") is True
+    assert status.get("rc") == -int(signal.SIGKILL)
+
+
+def test_job_without_identity(tmp_path):
+    """
+      jobs of former versions only know their pid
+    """
+    jobs = DetachedJobs(str(tmp_path / "jobs"))
+
+    job_id, _ = jobs.start(["sh", "-c", "exit 0"], cwd=str(tmp_path))
+    wait(jobs, job_id)
+
+    os.remove(os.path.join(jobs.job_directory, job_id, "rc"))
+    rewrite(jobs, job_id, pid=os.getpid(), process=None)
+
+    assert jobs.status(job_id).get("finished") is False
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+import os
+
+import pytest
+
+from conftest import FakeModule, load_plugin
+
+ovpn = load_plugin("library", "openvpn_ovpn")
+
+TEMPLATE = "client\n# {{ name }}\n<cert>\n{{ cert }}\n</cert>\n<key>\n{{ key }}\n</key>\n"
+CERTIFICATE = "Certificate:\n    Data: ...\n-----BEGIN CERTIFICATE-----\nQUJD\n-----END CERTIFICATE-----\n"
+
+
+@pytest.fixture
+def pki(tmp_path, monkeypatch):
+    """
+      keys, certificates and the template of alice and bob, the profiles in tmp_path/vpn-configs
+    """
+    monkeypatch.chdir(tmp_path)
+
+    for directory in ["pki/private", "pki/issued", "vpn-configs"]:
+        (tmp_path / directory).mkdir(parents=True)
+
+    (tmp_path / "client.ovpn.template").write_text(TEMPLATE)
+
+    for name in ["alice", "bob"]:
+        (tmp_path / "pki" / "private" / f"{name}.key").write_text(f"key of {name}\n")
+        (tmp_path / "pki" / "issued" / f"{name}.crt").write_text(CERTIFICATE)
+
+    return tmp_path
+
+
+def run(pki, clients, **params):
+    params = dict(
+        dict(
+            state = "present",
+            clients = clients,
+            template = str(pki / "client.ovpn.template"),
+            destination_directory = str(pki / "vpn-configs")
+        ),
+        **params
+    )
+
+    return ovpn.OpenVPNOvpn(FakeModule(params)).run()
+
+
+def test_bulk_render(pki):
+    result = run(pki, [dict(name="alice"), dict(name="bob")])
+
+    assert result.get("changed") is True
+    assert result.get("message") == "2 clients processed, 2 ovpn files written."
+
+    profile = pki / "vpn-configs" / "alice.ovpn"
+
+    assert profile.read_text() == "client\n# alice\n<cert>\n-----BEGIN CERTIFICATE-----\nQUJD\n-----END CERTIFICATE-----\n</cert>\n<key>\nkey of alice\n</key>"
+    assert os.stat(profile).st_mode & 0o777 == 0o600
+
+    checksum = (pki / "vpn-configs" / ".alice.ovpn.sha256").read_text().splitlines()
+
+    assert len(checksum) == 3
+    assert checksum[1] == f"{os.stat(profile).st_size} {os.stat(profile).st_mtime_ns} {os.stat(profile).st_ino}"
+    assert sorted(os.listdir(pki / "vpn-configs")) == [".alice.ovpn.sha256", ".bob.ovpn.sha256", "alice.ovpn", "bob.ovpn"]
+
+
+def test_unchanged_inputs_are_not_rendered(pki, monkeypatch):
+    run(pki, [dict(name="alice")])
+
+    def fail(filename):
+        raise AssertionError(f"{filename} was read")
+
+    monkeypatch.setattr(ovpn, "extract_certs_as_strings", fail)
+
+    result = run(pki, [dict(name="alice")])
+
+    assert result.get("changed") is False
+    assert result.get("clients").get("alice").get("message").endswith("is up to date.")
+
+
+def test_changed_template(pki):
+    run(pki, [dict(name="alice"), dict(name="bob")])
+    profile = pki / "vpn-configs" / "alice.ovpn"
+    mtime = os.stat(profile).st_mtime_ns
+
+    # same profiles, only the recorded inputs are updated
+    (pki / "client.ovpn.template").write_text("{# comment #}" + TEMPLATE)
+
+    result = run(pki, [dict(name="alice"), dict(name="bob")])
+
+    assert result.get("changed") is False
+    assert os.stat(profile).st_mtime_ns == mtime
+    assert run(pki, [dict(name="alice")]).get("clients").get("alice").get("changed") is False
+
+    (pki / "client.ovpn.template").write_text(TEMPLATE.replace("client\n", "client\nnobind\n"))
+
+    result = run(pki, [dict(name="alice"), dict(name="bob")])
+
+    assert result.get("message") == "2 clients processed, 2 ovpn files written."
+    assert "nobind" in profile.read_text()
+
+
+def test_missing_certificate_and_absent_client(pki):
+    run(pki, [dict(name="alice"), dict(name="bob")])
+    (pki / "pki" / "issued" / "bob.crt").unlink()
+
+    result = run(pki, [dict(name="alice", state="absent"), dict(name="bob")])
+
+    assert result.get("failed") is True
+    assert result.get("clients").get("alice").get("state") == "absent"
+    assert result.get("clients").get("alice").get("changed") is True
+    assert result.get("clients").get("bob").get("message") == "can not find key or certfile for user bob."
+    assert sorted(os.listdir(pki / "vpn-configs")) == [".bob.ovpn.sha256", "bob.ovpn"]
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+
+import pytest
+
+from ansible.module_utils.openvpn_pem import PemError, extract_certs_as_strings, iter_pem_blocks
+
+
+def block(label, body="TUlJQg=="):
+    return f"-----BEGIN {label}-----\n{body}\n-----END {label}-----\n"
+
+
+def test_blocks_and_labels(tmp_path):
+    bundle = tmp_path / "bundle.pem"
+    bundle.write_text("".join([
+        "Certificate:\n    Data: ...\n",
+        block("CERTIFICATE"),
+        block("PRIVATE KEY"),
+        block("CERTIFICATE", "QUJD"),
+    ]))
+
+    blocks = list(iter_pem_blocks(str(bundle)))
+
+    assert [b.label for b in blocks] == ["CERTIFICATE", "PRIVATE KEY", "CERTIFICATE"]
+    assert [b.line for b in blocks] == [3, 6, 9]
+    assert blocks[2].der() == b"ABC"
+
+    certs = extract_certs_as_strings(str(bundle))
+
+    assert certs == [block("CERTIFICATE"), block("CERTIFICATE", "QUJD")]
+
+
+def test_empty_file(tmp_path):
+    empty = tmp_path / "empty.pem"
+    empty.write_text("")
+
+    assert list(iter_pem_blocks(str(empty))) == []
+
+
+@pytest.mark.parametrize("content, line, reason", [
+    (block("CERTIFICATE")[:-30], 1, "CERTIFICATE block is not terminated"),
+    ("-----END CERTIFICATE-----\n", 1, "END CERTIFICATE found without BEGIN"),
+    ("-----BEGIN CERTIFICATE-----\nQUJD\n-----END PRIVATE KEY-----\n", 3, "END PRIVATE KEY does not match BEGIN CERTIFICATE"),
+    ("-----BEGIN CERTIFICATE-----\n" + block("PRIVATE KEY"), 2, "BEGIN PRIVATE KEY found inside of CERTIFICATE block"),
+])
+def test_malformed_files(tmp_path, content, line, reason):
+    pem = tmp_path / "bad.pem"
+    pem.write_text(content)
+
+    with pytest.raises(PemError) as e:
+        list(iter_pem_blocks(str(pem)))
+
+    assert e.value.as_dict() == dict(filename=str(pem), line=line, reason=reason)
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+
+import pytest
+
+from ansible.errors import AnsibleFilterError
+
+from conftest import load_plugin
+
+SUBNET = dict(ip="10.8.3.0", netmask="255.255.255.0")
+LOGGING = dict(file="/var/log/openvpn/openvpn.log", status="/var/log/openvpn/status.log")
+
+
+@pytest.fixture
+def filters():
+    return load_plugin("filter_plugins", "openvpn_persistent_pool").FilterModule()
+
+
+def test_single_server(filters):
+    result = filters.server_instances(dict(port=1194), SUBNET, logging=LOGGING)
+
+    assert result == [
+        dict(
+            name = "server",
+            primary = True,
+            port = 1194,
+            proto = "udp",
+            subnet = SUBNET,
+            log = "/var/log/openvpn/openvpn.log",
+            status = "/var/log/openvpn/status.log",
+            ipp = "ipp.txt",
+            service = "openvpn-server@server"
+        )
+    ]
+
+
+def test_instances_are_ignored_when_disabled(filters):
+    server = dict(port=1194, instances=dict(enabled=False, count=4))
+
+    assert len(filters.server_instances(server, SUBNET, cpus=8)) == 1
+
+
+def test_instances(filters):
+    server = dict(port=1194, proto="udp", instances=dict(enabled=True, count=3))
+    result = filters.server_instances(server, SUBNET, logging=LOGGING)
+
+    assert [i.get("name") for i in result] == ["server", "server-1", "server-2"]
+    assert [i.get("port") for i in result] == [1194, 1195, 1196]
+    assert [i.get("service") for i in result] == ["openvpn-server@server", "openvpn-server@server-1", "openvpn-server@server-2"]
+    assert [i.get("subnet") for i in result] == [
+        dict(ip="10.8.3.0", netmask="255.255.255.192"),
+        dict(ip="10.8.3.64", netmask="255.255.255.192"),
+        dict(ip="10.8.3.128", netmask="255.255.255.192"),
+    ]
+    assert result[1].get("log") == "/var/log/openvpn/openvpn-server-1.log"
+    assert result[1].get("status") == "/var/log/openvpn/status-server-1.log"
+    assert result[1].get("ipp") == "ipp-server-1.txt"
+
+
+def test_instances_with_openrc(filters):
+    server = dict(instances=dict(enabled=True, count=2))
+    result = filters.server_instances(server, SUBNET, service_name="openvpn", service_manager="openrc")
+
+    assert [i.get("service") for i in result] == ["openvpn", "openvpn.server-1"]
+
+
+def test_instances_auto_count(filters):
+    server = dict(instances=dict(enabled=True, count="auto"))
+
+    assert len(filters.server_instances(server, SUBNET, cpus=4)) == 4
+
+
+@pytest.mark.parametrize("count", ["many", None, [2]])
+def test_invalid_instance_count(filters, count):
+    server = dict(instances=dict(enabled=True, count=count))
+
+    with pytest.raises(AnsibleFilterError):
+        filters.server_instances(server, SUBNET)
+
+
+def test_subnet_too_small(filters):
+    server = dict(instances=dict(enabled=True, count=3))
+    subnet = dict(ip="10.8.3.0", netmask="255.255.255.240")
+
+    with pytest.raises(AnsibleFilterError):
+        filters.server_instances(server, subnet)
+
+
+def test_persistent_pool(filters):
+    clients = [
+        dict(name="static", static_ip="10.8.3.10"),
+        dict(name="removed", static_ip="10.8.3.11", state="absent"),
+        dict(name="dynamic"),
+    ]
+
+    assert filters.persistent_pool(clients) == [
+        dict(name="static", state="present", static_ip="10.8.3.10"),
+        dict(name="removed", state="absent", static_ip="10.8.3.11"),
+    ]
+
+
+def test_persistent_pool_with_instances(filters):
+    server = dict(instances=dict(enabled=True, count=2))
+    instances = filters.server_instances(server, SUBNET)
+    clients = [
+        dict(name="first", static_ip="10.8.3.10"),
+        dict(name="second", static_ip="10.8.3.200"),
+        dict(name="outside", static_ip="10.9.0.1"),
+    ]
+
+    result = filters.persistent_pool(clients, instances)
+
+    assert [(c.get("name"), c.get("instance")) for c in result] == [("first", "server"), ("second", "server-1")]
+
+
+def test_clients_type(filters):
+    clients = [dict(name="office"), dict(name="laptop", roadrunner=True)]
+
+    assert filters.clients_type(clients) == [dict(name="office")]
+    assert filters.clients_type(clients, "roadrunner") == [dict(name="laptop", roadrunner=True)]
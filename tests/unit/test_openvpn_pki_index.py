@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+from datetime import datetime, timezone
+
+from ansible.module_utils.openvpn_pki_index import (
+    EasyRsaIndex, format_asn1_time, format_index_line, format_serial, parse_asn1_time, parse_index_line
+)
+
+
+VALID = "V\t330101000000Z\t\t0A1B2C\tunknown\t/CN=client\n"
+REVOKED = "R\t330101000000Z\t240101000000Z,keyCompromise\t0D0E0F\tunknown\t/CN=roadrunner\n"
+
+
+def index_line(status, serial, name, expires="330101000000Z", revoked=""):
+    return f"{status}\t{expires}\t{revoked}\t{serial}\tunknown\t/CN={name}\n"
+
+
+def test_parse_index_line():
+    entry = parse_index_line(VALID)
+
+    assert entry.get("status") == "V"
+    assert entry.get("serial") == "0A1B2C"
+    assert entry.get("name") == "client"
+    assert entry.get("revoked") is None
+
+    entry = parse_index_line(REVOKED)
+
+    assert entry.get("revoked") == "240101000000Z"
+    assert entry.get("reason") == "keyCompromise"
+    assert entry.get("name") == "roadrunner"
+
+
+def test_parse_index_line_invalid():
+    assert parse_index_line("") is None
+    assert parse_index_line("V\t330101000000Z\n") is None
+
+
+def test_index_line_roundtrip():
+    for line in [VALID, REVOKED]:
+        assert format_index_line(parse_index_line(line)) == line
+
+
+def test_serial_has_an_even_length():
+    assert format_serial(0xABC) == "0ABC"
+    assert format_serial(0xABCD) == "ABCD"
+
+
+def test_asn1_time():
+    assert parse_asn1_time("330101000000Z") == datetime(2033, 1, 1, tzinfo=timezone.utc)
+    assert parse_asn1_time("20510101000000Z") == datetime(2051, 1, 1, tzinfo=timezone.utc)
+    assert parse_asn1_time("240101000000Z,keyCompromise") == datetime(2024, 1, 1, tzinfo=timezone.utc)
+    assert parse_asn1_time("") is None
+
+    assert format_asn1_time(datetime(2033, 1, 1, tzinfo=timezone.utc)) == "330101000000Z"
+    assert format_asn1_time(datetime(2051, 1, 1, tzinfo=timezone.utc)) == "20510101000000Z"
+
+
+def test_lookup_prefers_the_valid_certificate(tmp_path):
+    (tmp_path / "index.txt").write_text("".join([
+        index_line("R", "01", "client", revoked="240101000000Z"),
+        index_line("V", "02", "client"),
+        index_line("R", "03", "gone", revoked="240101000000Z"),
+    ]))
+
+    index = EasyRsaIndex(str(tmp_path))
+
+    assert index.lookup(["client"]).get("client").get("serial") == "02"
+    assert index.lookup(["gone"]).get("gone").get("serial") == "03"
+    assert index.lookup(["missing"]).get("missing") is None
+    assert index.lookup_serial("02").get("name") == "client"
+
+
+def test_states(tmp_path):
+    now = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+    (tmp_path / "index.txt").write_text("".join([
+        index_line("V", "01", "valid"),
+        index_line("V", "02", "expiring", expires="300105000000Z"),
+        index_line("V", "03", "expired", expires="290101000000Z"),
+        index_line("E", "04", "marked", expires="290101000000Z"),
+        index_line("R", "05", "revoked", revoked="240101000000Z"),
+    ]))
+
+    index = EasyRsaIndex(str(tmp_path))
+
+    assert [e.get("name") for e in index.valid(now)] == ["valid", "expiring"]
+    assert [e.get("name") for e in index.expiring(10, now)] == ["expiring"]
+    assert [e.get("name") for e in index.expired(now)] == ["expired", "marked"]
+    assert [e.get("name") for e in index.revoked()] == ["revoked"]
+
+
+def test_cache_parses_only_appended_lines(tmp_path):
+    pki = tmp_path / "pki"
+    pki.mkdir()
+    cache = tmp_path / "cache"
+
+    index_file = pki / "index.txt"
+    index_file.write_text(index_line("V", "01", "one") + index_line("V", "02", "two"))
+
+    index = EasyRsaIndex(str(pki), str(cache))
+    assert len(index.entries()) == 2
+    assert index.parse_stats == dict(cached=0, parsed=2)
+
+    with open(index_file, "a") as f:
+        f.write(index_line("V", "03", "three"))
+
+    index = EasyRsaIndex(str(pki), str(cache))
+    assert [e.get("serial") for e in index.entries()] == ["01", "02", "03"]
+    assert index.parse_stats == dict(cached=2, parsed=1)
+
+
+def test_cache_is_dropped_after_a_rewrite(tmp_path):
+    pki = tmp_path / "pki"
+    pki.mkdir()
+    cache = tmp_path / "cache"
+
+    index_file = pki / "index.txt"
+    index_file.write_text(index_line("V", "01", "one") + index_line("V", "02", "two"))
+
+    EasyRsaIndex(str(pki), str(cache)).entries()
+
+    # revoke: the file is replaced, the data in front of the cached offset changes
+    index = EasyRsaIndex(str(pki), str(cache))
+    entries = index.entries()
+    entries[0].update(status="R", revoked="240101000000Z")
+    index.write(entries)
+
+    index = EasyRsaIndex(str(pki), str(cache))
+
+    assert [e.get("status") for e in index.entries()] == ["R", "V"]
+    assert index.parse_stats == dict(cached=0, parsed=2)
+    assert (pki / "index.txt.old").exists()
+
+
+def test_incomplete_last_line_is_parsed_later(tmp_path):
+    pki = tmp_path / "pki"
+    pki.mkdir()
+    cache = tmp_path / "cache"
+
+    index_file = pki / "index.txt"
+    line = index_line("V", "02", "two")
+    index_file.write_text(index_line("V", "01", "one") + line[:10])
+
+    assert len(EasyRsaIndex(str(pki), str(cache)).entries()) == 1
+
+    with open(index_file, "a") as f:
+        f.write(line[10:])
+
+    assert len(EasyRsaIndex(str(pki), str(cache)).entries()) == 2
+
+
+def test_append(tmp_path):
+    (tmp_path / "index.txt").write_text(VALID)
+
+    index = EasyRsaIndex(str(tmp_path))
+    index.lookup(["client"])
+    index.append(parse_index_line(REVOKED))
+
+    assert index.serials() == set(["0A1B2C", "0D0E0F"])
+    assert index.lookup(["roadrunner"]).get("roadrunner").get("status") == "R"
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+
+import pytest
+
+from conftest import FakeModule, load_plugin
+
+static_clients = load_plugin("library", "openvpn_static_clients")
+
+
+class Systemctl(object):
+    """
+      records the systemctl calls, the units in 'running' are active and enabled
+    """
+
+    def __init__(self, running=None):
+        self.running = set(running or [])
+        self.calls = []
+
+    def __call__(self, args):
+        self.calls.append(" ".join(args[1:]))
+
+        if args[1] in ["is-active", "is-enabled"]:
+            return (0 if args[-1] in self.running else 3), "", ""
+
+        if args[1] == "disable":
+            self.running.discard(args[-1])
+
+        return 0, "", ""
+
+
+@pytest.fixture
+def host(tmp_path):
+    """
+      an installed static client bob with override in tmp_path
+    """
+    for directory in ["openvpn/client", "openvpn/keys/bob", "systemd/openvpn-client@bob.service.d"]:
+        (tmp_path / directory).mkdir(parents=True)
+
+    (tmp_path / "openvpn" / "client" / "bob.conf").write_text("client\n")
+    (tmp_path / "openvpn" / "keys" / "bob" / "bob.crt").write_text("crt\n")
+    (tmp_path / "systemd" / "openvpn-client@bob.service.d" / "override.conf").write_text("[Service]\n")
+
+    return tmp_path
+
+
+def run(host, clients, systemctl, **params):
+    params = dict(
+        dict(
+            state = "present",
+            clients = clients,
+            configs = dict(),
+            openvpn_directory = str(host / "openvpn"),
+            systemd_directory = str(host / "systemd"),
+            service_manager = "systemd"
+        ),
+        **params
+    )
+
+    return static_clients.OpenVPNStaticClients(FakeModule(params, commands=systemctl)).run()
+
+
+def test_absent_client_is_stopped_and_removed(host):
+    systemctl = Systemctl(running=["openvpn-client@bob"])
+
+    result = run(
+        host,
+        [dict(name="alice"), dict(name="bob", state="absent")],
+        systemctl,
+        configs=dict(alice="client\n"),
+        overrides=dict(alice="[Service]\nCPUAffinity=2\n")
+    )
+
+    assert result.get("failed") is False
+    assert result.get("daemon_reload") is True
+    assert result.get("restart") == ["openvpn-client@alice"]
+    assert result.get("services") == ["openvpn-client@alice"]
+    assert result["clients"]["bob"] == dict(
+        failed = False,
+        changed = True,
+        state = "absent",
+        service = "openvpn-client@bob",
+        stopped = True,
+        disabled = True,
+        override = True
+    )
+    assert systemctl.calls == [
+        "is-active --quiet openvpn-client@bob",
+        "is-enabled --quiet openvpn-client@bob",
+        "disable --now openvpn-client@bob",
+    ]
+
+    assert not (host / "systemd" / "openvpn-client@bob.service.d").exists()
+    assert not (host / "openvpn" / "keys" / "bob").exists()
+    assert not (host / "openvpn" / "client" / "bob.conf").exists()
+    assert (host / "systemd" / "openvpn-client@alice.service.d" / "override.conf").read_text() == "[Service]\nCPUAffinity=2\n"
+
+
+def test_removed_client_is_unchanged(host):
+    run(host, [dict(name="bob", state="absent")], Systemctl(running=["openvpn-client@bob"]))
+
+    systemctl = Systemctl()
+    result = run(host, [dict(name="bob", state="absent")], systemctl)
+
+    assert result.get("changed") is False
+    assert result.get("daemon_reload") is False
+    assert result["clients"]["bob"].get("stopped") is False
+    assert "disable --now openvpn-client@bob" not in systemctl.calls
+
+
+def test_failed_stop(host):
+    def systemctl(args):
+        if args[1] == "disable":
+            return 1, "", "Access denied\n"
+
+        return 0, "", ""
+
+    result = run(host, [dict(name="bob", state="absent")], systemctl)
+
+    assert result.get("failed") is True
+    assert result["clients"]["bob"].get("msg") == "can not stop the service: '/usr/bin/systemctl disable --now openvpn-client@bob' failed: Access denied"
+    # nothing is removed, while the service is still running
+    assert (host / "openvpn" / "keys" / "bob").exists()
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+import base64
+import hashlib
+import hmac
+import os
+import re
+import struct
+
+import pytest
+
+from ansible.module_utils.openvpn_pem import PemError
+from ansible.module_utils.openvpn_static_key import (
+    HAS_CRYPTOGRAPHY, TLS_CRYPT_V2_CLIENT_PEM_NAME, load_tls_crypt_v2_server_key, pem_encode,
+    static_key_v1, tls_crypt_v2_client_key, tls_crypt_v2_server_key, write_key_file
+)
+
+if HAS_CRYPTOGRAPHY:
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+
+def test_static_key_format():
+    lines = static_key_v1().splitlines()
+
+    assert lines[:4] == ["#", "# 2048 bit OpenVPN static key", "#", "-----BEGIN OpenVPN Static key V1-----"]
+    assert lines[-1] == "-----END OpenVPN Static key V1-----"
+    assert len(lines[4:-1]) == 16
+    assert all(re.match(r"^[0-9a-f]{32}$", line) for line in lines[4:-1])
+    assert static_key_v1() != static_key_v1()
+
+
+def test_write_key_file(tmp_path):
+    key_file = tmp_path / "ta.key"
+    key_file.write_text("old key")
+    os.chmod(key_file, 0o644)
+
+    write_key_file(str(key_file), "new key")
+
+    assert key_file.read_text() == "new key"
+    assert os.stat(key_file).st_mode & 0o777 == 0o600
+    assert os.listdir(tmp_path) == ["ta.key"]
+
+
+def test_pem_encode_wraps_at_64_characters():
+    lines = pem_encode("TEST", bytes(100)).splitlines()
+
+    assert lines[0] == "-----BEGIN TEST-----"
+    assert [len(line) for line in lines[1:-1]] == [64, 64, 8]
+    assert lines[-1] == "-----END TEST-----"
+
+
+def test_server_key_roundtrip(tmp_path):
+    key_file = tmp_path / "tls-crypt-v2.key"
+    key_file.write_text(tls_crypt_v2_server_key())
+
+    assert len(load_tls_crypt_v2_server_key(str(key_file))) == 128
+
+
+def test_server_key_with_wrong_size(tmp_path):
+    key_file = tmp_path / "tls-crypt-v2.key"
+    key_file.write_text(pem_encode("OpenVPN tls-crypt-v2 server key", bytes(64)))
+
+    with pytest.raises(PemError):
+        load_tls_crypt_v2_server_key(str(key_file))
+
+
+@pytest.mark.skipif(not HAS_CRYPTOGRAPHY, reason="python cryptography is not installed")
+def test_client_key_unwraps_with_the_server_key(tmp_path):
+    """
+      unwrap WKc like the server does (tls_crypt_v2_unwrap_client_key)
+    """
+    key_file = tmp_path / "tls-crypt-v2.key"
+    key_file.write_text(tls_crypt_v2_server_key())
+    server_key = load_tls_crypt_v2_server_key(str(key_file))
+
+    pem = tls_crypt_v2_client_key(server_key, timestamp=1700000000)
+    body = "".join(pem.splitlines()[1:-1])
+    data = base64.b64decode(body)
+
+    assert pem.startswith(f"-----BEGIN {TLS_CRYPT_V2_CLIENT_PEM_NAME}-----")
+
+    client_key, wrapped = data[:256], data[256:]
+    tag, ciphertext, net_len = wrapped[:32], wrapped[32:-2], wrapped[-2:]
+
+    assert struct.unpack("!H", net_len)[0] == len(wrapped)
+
+    decryptor = Cipher(algorithms.AES(server_key[0:32]), modes.CTR(tag[:16])).decryptor()
+    plaintext = decryptor.update(ciphertext) + decryptor.finalize()
+
+    assert plaintext[:256] == client_key
+    assert plaintext[256:] == struct.pack("!BQ", 0x01, 1700000000)
+    assert hmac.compare_digest(tag, hmac.new(server_key[64:96], net_len + plaintext, hashlib.sha256).digest())
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+import os
+
+import pytest
+
+from conftest import FakeModule, load_plugin
+
+tuning = load_plugin("library", "openvpn_tuning")
+
+SNMP = """Udp: InDatagrams NoPorts InErrors OutDatagrams RcvbufErrors SndbufErrors InCsumErrors IgnoredMulti MemErrors
+Udp: 1000 2 5 900 4 1 0 0 0
+"""
+
+
+@pytest.fixture
+def proc(tmp_path, monkeypatch):
+    """
+      a /proc/sys and /proc/net/snmp in tmp_path
+    """
+    def _write(**sysctl):
+        for key, value in sysctl.items():
+            filename = tmp_path / "sys" / key.replace("__", "/")
+            filename.parent.mkdir(parents=True, exist_ok=True)
+            filename.write_text(f"{value}\n")
+
+        return tmp_path
+
+    (tmp_path / "snmp").write_text(SNMP)
+
+    monkeypatch.setattr(tuning, "PROC_SYS", str(tmp_path / "sys"))
+    monkeypatch.setattr(tuning, "PROC_SNMP", str(tmp_path / "snmp"))
+
+    return _write
+
+
+def run(bandwidth=1000, rtt=50, sockets=1, txqueuelen="auto"):
+    params = dict(bandwidth=bandwidth, rtt=rtt, sockets=sockets, txqueuelen=txqueuelen)
+    return tuning.OpenVPNTuning(FakeModule(params)).run()
+
+
+@pytest.mark.parametrize("value, step, expected", [(1, 4096, 4096), (4096, 4096, 4096), (4097.5, 4096, 8192)])
+def test_round_up(value, step, expected):
+    assert tuning.round_up(value, step) == expected
+
+
+@pytest.mark.parametrize("value, expected", [(0, 1), (1, 1), (3, 4), (178.5, 256), (1024, 1024)])
+def test_next_power_of_2(value, expected):
+    assert tuning.next_power_of_2(value) == expected
+
+
+@pytest.mark.parametrize("bandwidth, rtt, expected", [
+    (10, 10, tuning.MIN_BUFFER),
+    (1000, 50, 12500992),
+    (100000, 100, tuning.MAX_BUFFER),
+])
+def test_buffer_limits(proc, bandwidth, rtt, expected):
+    proc()
+    result = run(bandwidth, rtt)
+
+    assert result.get("buffers") == dict(sndbuf=expected, rcvbuf=expected)
+
+
+def test_txqueuelen(proc):
+    proc()
+
+    assert run(10).get("txqueuelen") == tuning.MIN_TXQUEUELEN
+    assert run(1000).get("txqueuelen") == tuning.MIN_TXQUEUELEN
+    assert run(10000).get("txqueuelen") == 2048
+    assert run(100000).get("txqueuelen") == tuning.MAX_TXQUEUELEN
+    assert run(txqueuelen="1000").get("txqueuelen") == 1000
+
+
+def test_sysctls_are_raised(proc):
+    proc(net__core__rmem_max=212992, net__core__wmem_max=212992, net__core__netdev_max_backlog=1000, net__ipv4__udp_mem="1000 2000 3000")
+    result = run(1000, 50)
+
+    assert result.get("sysctl").get("net.core.rmem_max") == "12500992"
+    assert result.get("sysctl").get("net.core.wmem_max") == "12500992"
+    assert result.get("sysctl").get("net.core.netdev_max_backlog") == "1024"
+    assert result.get("effective") == dict(sndbuf=212992, rcvbuf=212992)
+    assert result.get("verified") is False
+
+
+def test_sysctls_are_never_lowered(proc):
+    proc(net__core__rmem_max=2 ** 30, net__core__wmem_max=2 ** 30, net__core__netdev_max_backlog=2 ** 20, net__ipv4__udp_mem=f"1000 {2 ** 30} {2 ** 31}")
+    result = run(1000, 50)
+
+    assert result.get("sysctl") == {}
+    assert result.get("verified") is True
+    assert result.get("effective") == dict(sndbuf=12500992, rcvbuf=12500992)
+
+
+def test_udp_mem(proc):
+    proc(net__core__rmem_max=2 ** 30, net__core__wmem_max=2 ** 30, net__core__netdev_max_backlog=2 ** 20, net__ipv4__udp_mem="1000 2000 3000")
+    required = int(4 * 2 * 2 * 12500992 / os.sysconf("SC_PAGESIZE"))
+
+    result = run(1000, 50, sockets=4)
+
+    assert result.get("sysctl") == {"net.ipv4.udp_mem": f"1000 {required} {2 * required}"}
+
+
+def test_udp_counters(proc):
+    proc()
+    result = run()
+
+    assert result.get("udp").get("RcvbufErrors") == 4
+    assert result.get("udp").get("SndbufErrors") == 1
+    assert "dropped UDP packets" in result.get("message")
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+# (c) 2026, Bodo Schulz <bodo@boone-schulz.de>
+
+from __future__ import absolute_import, division, print_function
+
+from ansible.module_utils.openvpn_version import parse_show_ciphers, parse_version_output
+
+
+VERSION_OUTPUT = """OpenVPN 2.6.3 x86_64-pc-linux-gnu [SSL (OpenSSL)] [LZO] [LZ4] [EPOLL] [PKCS11] [MH/PKTINFO] [AEAD] [DCO]
+library versions: OpenSSL 3.0.9 30 May 2023, LZO 2.10
+DCO version: N/A
+Originally developed by James Yonan
+Copyright (C) 2002-2023 OpenVPN Inc <sales@openvpn.net>
+Compile time defines: enable_async_push=no enable_comp_stub=no enable_dco=yes enable_lz4=yes enable_lzo=yes
+"""
+
+
+def test_aead_ciphers(fixture):
+    ciphers = dict((c.get("name"), c) for c in parse_show_ciphers(fixture("show-ciphers-2.6.txt")))
+
+    aead = sorted(name for name, c in ciphers.items() if c.get("aead"))
+
+    assert aead == ["AES-128-GCM", "AES-192-GCM", "AES-256-GCM", "ARIA-128-GCM", "CHACHA20-POLY1305"]
+
+
+def test_cfb_and_ofb_are_not_aead(fixture):
+    ciphers = dict((c.get("name"), c) for c in parse_show_ciphers(fixture("show-ciphers-2.6.txt")))
+
+    for name in ["AES-256-CFB", "AES-256-CFB8", "AES-256-OFB", "SM4-OFB", "AES-256-CBC"]:
+        assert ciphers.get(name).get("aead") is False
+
+
+def test_deprecated_ciphers(fixture):
+    ciphers = parse_show_ciphers(fixture("show-ciphers-2.6.txt"))
+
+    deprecated = [c.get("name") for c in ciphers if c.get("deprecated")]
+
+    assert deprecated == ["BF-CBC", "BF-CFB", "BF-OFB", "DES-EDE3-CBC", "DES-EDE3-CFB", "DES-EDE3-OFB"]
+    assert dict((c.get("name"), c.get("key_size")) for c in ciphers).get("CHACHA20-POLY1305") == 256
+
+
+def test_version_output():
+    info = parse_version_output(VERSION_OUTPUT)
+
+    assert info.get("version") == "2.6.3"
+    assert info.get("ssl") == dict(library="OpenSSL", version="3.0.9")
+    assert info.get("dco") is True
+    assert info.get("dco_version") is None
+    assert info.get("lz4") is True
+
+
+def test_version_output_unknown():
+    assert parse_version_output("openvpn: command not found") is None